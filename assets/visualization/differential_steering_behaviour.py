@@ -1,47 +1,33 @@
-import pandas as pd
 import matplotlib.pyplot as plt
-import glob
 import os
+import sys
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+
+from src.log_analysis import load_log
+from src.run_index import update_index, latest_run
+from src.constants import LOG_DIR
 
 
 def plot_log():
-    # 1. Find the newest CSV file in data_logs/
-    list_of_files = glob.glob("data_logs/*.csv")
-    if not list_of_files:
-        print("Error: No CSV files found in 'data_logs/' folder.")
+    # 1. Find the newest log in data_logs/
+    index = update_index()
+    latest = latest_run(index)
+    if latest is None:
+        print("Error: No log files found in 'data_logs/' folder.")
         print("Current working directory:", os.getcwd())
         return
 
-    latest_log = max(list_of_files, key=os.path.getctime)
+    latest_log = os.path.join(LOG_DIR, index[latest]["file"])
     print(f"Plotting Real Data from: {latest_log}")
 
-    # 2. Load Data (Skip header row)
-    headers = ["Time", "Source", "Front", "Left", "Right", "Action", "Details"]
+    # 2. Load Data (speeds are parsed from the "L=0.60 R=0.50" notes, vectorized)
     try:
-        df = pd.read_csv(latest_log, names=headers, skiprows=1)
+        df = load_log(latest_log)
     except Exception as e:
-        print(f"Error reading CSV: {e}")
+        print(f"Error reading log: {e}")
         return
 
-    # 3. Clean Data (Parse "L=0.60 R=0.50" strings)
-    def extract_speeds(row):
-        details = str(row["Details"])
-        l, r = 0.0, 0.0
-        if "L=" in details:
-            parts = details.split(" ")
-            for p in parts:
-                if p.startswith("L="):
-                    l = float(p.split("=")[1])
-                if p.startswith("R="):
-                    r = float(p.split("=")[1])
-        return pd.Series([l, r])
-
-    df[["SpeedL", "SpeedR"]] = df.apply(extract_speeds, axis=1)
-
-    # Convert text to numbers, force errors to NaN
-    for col in ["Front", "Left", "Right"]:
-        df[col] = pd.to_numeric(df[col], errors="coerce")
-
     # Slice the data to see the "middle" of the run (e.g.:20k lines are too cluttered)
     df = df.iloc[1000:3000]
 
@@ -1,40 +1,37 @@
-import pandas as pd
 import matplotlib.pyplot as plt
-import glob
 import os
-import numpy as np
+import sys
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+
+from src.log_analysis import load_logs, loop_intervals_ms
+from src.run_index import update_index, index_frame
+from src.constants import LOG_DIR
 
 
 def plot_real_comparison():
-    # 1. Find CSV files
-    list_of_files = glob.glob("data_logs/*.csv")
-    if len(list_of_files) < 2:
+    # 1. Find log files
+    runs = index_frame(update_index())
+    runs = runs[runs["rows"] > 0] if len(runs) else runs
+    if len(runs) < 2:
         print("Error: Need at least 2 log files.")
         return
 
-    # Sort: Oldest (Index 0) vs Newest (Index -1)
-    list_of_files.sort(key=os.path.getctime)
-    oldest_file = list_of_files[0]
-    newest_file = list_of_files[-1]
+    # Sorted by run time: Oldest (Index 0) vs Newest (Index -1)
+    oldest_file = os.path.join(LOG_DIR, runs["file"].iloc[0])
+    newest_file = os.path.join(LOG_DIR, runs["file"].iloc[-1])
 
     print(f"Old: {os.path.basename(oldest_file)}")
     print(f"New: {os.path.basename(newest_file)}")
 
-    # Helper: Extract Latencies
-    def get_latencies(filename):
-        try:
-            df = pd.read_csv(
-                filename, names=["Time", "Src", "F", "L", "R", "Act", "Det"], skiprows=1
-            )
-            # Combine dummy date to parse time
-            df["Datetime"] = pd.to_datetime("2025-01-01 " + df["Time"], errors="coerce")
-            lat = df["Datetime"].diff().dt.total_seconds() * 1000  # to ms
-            return lat[(lat > 0) & (lat < 500)]  # Filter outliers
-        except:
-            return []
-
-    old_data = get_latencies(oldest_file)
-    new_data = get_latencies(newest_file)
+    # Extract Latencies of both runs in one pass
+    df = load_logs([oldest_file, newest_file])
+    lat = loop_intervals_ms(df)
+    lat = lat[(lat > 0) & (lat < 500)]  # Filter outliers
+    runs = df.loc[lat.index, "Run"]
+
+    old_data = lat[runs == runs.iloc[0]]
+    new_data = lat[runs == runs.iloc[-1]]
 
     # Stats
     old_avg = old_data.mean()
@@ -1,113 +1,279 @@
 import argparse
+import functools
 import time
-from src.motor_driver import MotorDriver
 from src.lidar_only.lidar_strategy import LidarStrategy
-from src.logger import ThesisLogger
+from src.camera_only.camera_strategy import CameraStrategy
+from src.camera_only.frame_source import open_source
+from src.fusion.fusion_strategy import FusionStrategy
+from src.logger import ThesisLogger, DeltaFilter
+from src.controller import RoverController
+from src.instrumentation import Profiler
+from src.odometry import Odometry
+from src.steering import SteeringSurface, steer
+from src.scheduler import AdaptiveRate
 from src.constants import *
 
 
-def get_strategy(mode):
+def get_lidar(ser=None, profiler=None, motion=None, isolate=False):
+    if isolate:
+        from src.isolation import IsolatedStrategy
+
+        # Built in the sensor process, the profiler stays here
+        return IsolatedStrategy(
+            functools.partial(LidarStrategy, ser=ser), motion, source="lidar"
+        )
+    return LidarStrategy(ser=ser, profiler=profiler, motion=motion)
+
+
+def get_camera(camera="pi", profiler=None, isolate=False):
+    if isolate:
+        from src.isolation import IsolatedStrategy
+
+        # The frame source is opened in the sensor process, the profiler stays here
+        return IsolatedStrategy(functools.partial(get_camera, camera), source="camera")
+    return CameraStrategy(open_source(camera), profiler=profiler)
+
+
+def get_strategy(mode, ser=None, profiler=None, motion=None, isolate=False, camera="pi"):
     if mode == "lidar":
-        return LidarStrategy()
+        return get_lidar(ser, profiler, motion, isolate)
+    elif mode == "camera":
+        return get_camera(camera, profiler, isolate)
+    elif mode == "fusion":
+        return FusionStrategy(
+            [get_lidar(ser, profiler, motion, isolate), get_camera(camera, profiler, isolate)]
+        )
     else:
         raise ValueError("Invalid Mode")
 
 
+def get_hardware(args, profiler=None, motion=None):
+    """Real motors and serial port, or the replay fakes with --replay"""
+    if args.replay:
+        from src.replay import ReplayStream, ReplaySerial, FakeMotorDriver
+
+        ser = ReplaySerial(ReplayStream.load(args.replay), speed=args.replay_speed)
+        return FakeMotorDriver(), get_strategy(
+            args.mode, ser, profiler, motion, args.isolate, args.camera
+        )
+
+    from src.motor_driver import MotorDriver  # gpiozero only exists on the Pi
+
+    return MotorDriver(), get_strategy(
+        args.mode, None, profiler, motion, args.isolate, args.camera
+    )
+
+
 def main():
     parser = argparse.ArgumentParser()
     parser.add_argument(
         "-m", "--mode", type=str, required=True, help="lidar, camera, fusion"
     )
+    parser.add_argument(
+        "--loop",
+        choices=["poll", "event", "adaptive"],
+        default="poll",
+        help="poll: fixed 60 Hz throttle, event: wake up on new sensor data, "
+        "adaptive: faster near obstacles and at speed, slower in open space, "
+        "never faster than the sensor delivers new data",
+    )
+    parser.add_argument(
+        "--min-period",
+        type=float,
+        default=EVENT_MIN_PERIOD_S,
+        help="event loop: minimum seconds between two ticks",
+    )
+    parser.add_argument(
+        "--min-rate",
+        type=float,
+        default=ADAPTIVE_MIN_RATE_HZ,
+        help="adaptive loop: lowest tick rate (Hz)",
+    )
+    parser.add_argument(
+        "--max-rate",
+        type=float,
+        default=ADAPTIVE_MAX_RATE_HZ,
+        help="adaptive loop: highest tick rate (Hz)",
+    )
+    parser.add_argument(
+        "--watchdog",
+        type=float,
+        default=SENSOR_WATCHDOG_S,
+        help="stop the motors if sensor data is older than this (s)",
+    )
+    parser.add_argument(
+        "--log-format",
+        choices=["csv", "bin"],
+        default="csv",
+        help="bin: compact binary log, convert with python -m src.logger FILE",
+    )
+    parser.add_argument(
+        "--log-delta",
+        type=float,
+        nargs="?",
+        const=LOG_DELTA_DEADBAND_CM,
+        metavar="CM",
+        help="only log rows that changed by more than CM (default "
+        f"{LOG_DELTA_DEADBAND_CM}), plus a keyframe every {LOG_KEYFRAME_S}s",
+    )
+    parser.add_argument(
+        "--replay",
+        metavar="FILE",
+        help="run without hardware on a ThesisLogger CSV or raw LiDAR capture",
+    )
+    parser.add_argument(
+        "--replay-speed",
+        type=float,
+        default=1.0,
+        help="replay time factor (2.0 = twice real time)",
+    )
+    parser.add_argument(
+        "--stats",
+        type=float,
+        default=0.0,
+        metavar="SECONDS",
+        help="print loop latency percentiles every SECONDS (0 = off)",
+    )
+    parser.add_argument(
+        "--stats-port",
+        type=int,
+        help="serve latency percentiles as JSON on localhost:PORT",
+    )
+    parser.add_argument(
+        "--map",
+        action="store_true",
+        help="build an occupancy grid from the LiDAR scans on a background thread (lidar or fusion mode)",
+    )
+    parser.add_argument(
+        "--no-deskew",
+        action="store_true",
+        help="treat all points of a revolution as measured at the same time",
+    )
+    parser.add_argument(
+        "--isolate",
+        action="store_true",
+        help="run the sensor strategy in its own process (no --map)",
+    )
+    parser.add_argument(
+        "--camera",
+        default="pi",
+        help="camera/fusion frame source: pi, synthetic, a directory of frames or a video file",
+    )
+    parser.add_argument(
+        "--steer-table",
+        action="store_true",
+        help="steer with a precomputed lookup table instead of evaluating the law every tick",
+    )
     args = parser.parse_args()
-    logger = ThesisLogger(args.mode)
+    if not 0 < args.min_rate <= args.max_rate:
+        parser.error("--min-rate must be positive and not above --max-rate")
+    if args.isolate and args.map:
+        parser.error("--map needs the scans in this process, it cannot be combined with --isolate")
+    if args.map and args.mode == "camera":
+        parser.error("--map needs LiDAR scans, use it with -m lidar or -m fusion")
+
+    profiler = None
+    if args.stats or args.stats_port:
+        profiler = Profiler(report_interval=args.stats)
+        if args.stats_port:
+            profiler.serve(args.stats_port)
+        check_probe = profiler.probe("check_path")
+
+    delta = DeltaFilter(args.log_delta) if args.log_delta is not None else False
+    logger = ThesisLogger(args.mode, args.log_format, delta=delta)
+
+    # Velocity for deskewing the scans, pose for the map
+    odometry = Odometry()
+    motion = None if args.no_deskew else lambda: (odometry.v, odometry.omega)
 
     try:
-        rover = MotorDriver()
-        brain = get_strategy(args.mode)
+        rover, brain = get_hardware(args, profiler, motion)
     except Exception as e:
         print(f"Hardware Error: {e}")
         return
 
+    if profiler is not None and hasattr(brain, "stats"):
+        profiler.add_counters("packets", brain.stats)
+
+    mapper = None
+    if args.map:
+        from src.mapping.mapper import Mapper
+
+        # In fusion mode the map follows the LiDAR inside the fusion
+        sources = getattr(brain, "strategies", [brain])
+        lidar = next(s for s in sources if hasattr(s, "get_scan"))
+        mapper = Mapper(lidar, pose=lambda: odometry.pose, profiler=profiler)
+
     print(f"--- ROVER {ACTION_INIT} ---")
 
+    steering = steer
+    if args.steer_table:
+        steering = SteeringSurface()
+
+    controller = RoverController(
+        rover, logger, args.mode, args.watchdog, profiler, odometry, steering
+    )
+    scheduler = AdaptiveRate(args.min_rate, args.max_rate)
+    if profiler is not None:
+        profiler.add_counters("loop", controller.stats)
+    last_tick = time.monotonic()
+
     try:
         while True:
-            front, left, right = brain.check_path()
-
-            if front > SLOWDOWN_DIST_CM:
-                base_speed = DEFAULT_SPEED
+            if args.loop == "event":
+                # Respect the minimum period even if scans pile up
+                pause = last_tick + args.min_period - time.monotonic()
+                if pause > 0:
+                    time.sleep(pause)
+                snapshot = brain.wait_for_update(
+                    controller.last_seq, controller.wait_timeout(args.watchdog)
+                )
+                last_tick = time.monotonic()
+            elif profiler is None:
+                snapshot = brain.check_path()
             else:
-                base_speed = MIN_APPROACH_SPEED
-
-            # GENTLE STEERING
-            turn_val = 0.0
-
-            if left < SIDE_CUSHION_DIST_CM:
-                turn_val += (
-                    SIDE_CUSHION_DIST_CM - left
-                ) * STEER_SENSITIVITY  # Nudge Right
-
-            if right < SIDE_CUSHION_DIST_CM:
-                turn_val -= (
-                    SIDE_CUSHION_DIST_CM - right
-                ) * STEER_SENSITIVITY  # Nudge Left
-
-            # Start steering away slightly before we hit the slowdown zone
-            if front < SLOWDOWN_DIST_CM:
-                if left < right:
-                    turn_val += OBSTACLE_AVOIDANCE_BIAS
-                else:
-                    turn_val -= OBSTACLE_AVOIDANCE_BIAS
-
-            # Max turn is 25% power difference
-            turn_val = max(-0.25, min(turn_val, 0.25))
-
-            # CRITICAL STOP & PRECISION TURN
-            if front < CRITICAL_DIST_CM:
-                print(f"CRITICAL ({front:.1f}cm) -> PRECISION TURN")
-                rover.stop(force_stop=True)
-                time.sleep(0.2)
-
-                # Back up slowly
-                escape_speed = STALL_THRESHOLD
-                rover.drive(-escape_speed, -escape_speed)
-                time.sleep(0.6)
-                rover.stop()
-                time.sleep(0.1)
-
-                # Precision Pivot
-                if left > right:
-                    rover.drive(-escape_speed, escape_speed)  # Turn Left
-                else:
-                    rover.drive(escape_speed, -escape_speed)  # Turn Right
-
-                time.sleep(0.5)
-                rover.stop()
-                time.sleep(0.2)
-                continue
-
-            # Drive
-            left_motor = base_speed + turn_val
-            right_motor = base_speed - turn_val
-
-            rover.drive(left_motor, right_motor)
-
-            logger.log(
-                args.mode,
-                front,
-                left,
-                right,
-                ACTION_DRIVE,
-                f"L={left_motor:.2f} R={right_motor:.2f}",
-            )
-            time.sleep(0.016)
+                t0 = time.perf_counter_ns()
+                snapshot = brain.check_path()
+                check_probe.record(time.perf_counter_ns() - t0)
+
+            controller.tick(snapshot, time.monotonic())
+
+            if profiler is not None:
+                profiler.maybe_report()
+
+            if args.replay and brain.exhausted:
+                print("Replay finished.")
+                break
+
+            if args.loop == "poll":
+                time.sleep(CONTROL_PERIOD_S)
+            elif args.loop == "adaptive":
+                period = scheduler.update(
+                    snapshot.front, odometry.v, controller.escape.active, controller.sensor_rate
+                )
+                # Sleep what is left of the period after this tick's work
+                pause = last_tick + period - time.monotonic()
+                if pause > 0:
+                    time.sleep(pause)
+                last_tick = time.monotonic()
 
     except KeyboardInterrupt:
         print(f"{ACTION_STOP} received.")
     finally:
         rover.cleanup()
+        if mapper is not None:
+            mapper.stop()
         brain.stop()
         logger.close()
+        if controller.ticks:
+            print(
+                f"[RoverController] {controller.ticks} ticks at {controller.rate:.1f} Hz, "
+                f"{controller.idle_ticks / controller.ticks:.0%} without new data "
+                f"(sensor {controller.sensor_rate:.1f} Hz)"
+            )
+        if profiler is not None:
+            print(f"[STATS]\n{profiler.format_summary()}")
+            profiler.close()
 
 
 if __name__ == "__main__":
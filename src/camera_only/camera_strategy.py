@@ -1,8 +1,218 @@
-from src.interfaces import ObstacleStrategy
+import math
+import threading
+import time
+
+import numpy as np
+
+from src.interfaces import ObstacleStrategy, SensorSnapshot
+from src.lidar_only.sector_table import SectorTable
+from src.constants import (
+    NO_READING_DIST_CM,
+    MAX_VALID_DIST_CM,
+    CAMERA_HFOV_DEG,
+    CAMERA_VFOV_DEG,
+    CAMERA_HEIGHT_CM,
+    CAMERA_TILT_DEG,
+    CAMERA_DOWNSAMPLE,
+    CAMERA_MAX_DOWNSAMPLE,
+    CAMERA_FRAME_BUDGET_S,
+    CAMERA_FLOOR_ROWS,
+    CAMERA_FLOOR_TOLERANCE,
+    CAMERA_MIN_FLOOR_STD,
+    CAMERA_CONFIDENCE,
+)
 
 
 class CameraStrategy(ObstacleStrategy):
+    """
+    Free space in front of the rover from a single camera.
+
+    Assumes a flat floor: the bottom rows of the image sample the floor's
+    brightness, and in every column the first pixel from the bottom that does
+    not look like floor is the foot of an obstacle. Its row gives the distance
+    (camera height and tilt), its column the angle (field of view).
+
+    A capture thread keeps only the newest frame, a processing thread turns
+    it into a SensorSnapshot. Frames are downsampled by striding before any
+    other work; if a frame takes longer than the budget the stride grows.
+    source: a FrameSource (see frame_source.py), None = the Pi camera.
+    """
+
+    def __init__(self, source=None, budget_s=CAMERA_FRAME_BUDGET_S, autostart=True, profiler=None):
+        if source is None:
+            from src.camera_only.frame_source import PiCameraSource
+
+            source = PiCameraSource()
+
+        self.source = source
+        self.budget_s = budget_s
+        self.step = CAMERA_DOWNSAMPLE
+        self.sectors = SectorTable()
+        self._tables = {}  # Per downsampled shape: row distances, column sectors
+
+        if profiler is not None:
+            self._process_probe = profiler.probe("camera")
+            self._age_probe = profiler.probe("frame_age")
+        else:
+            self._process_probe = self._age_probe = None
+
+        # Newest frame, replaced by the capture thread (older unprocessed ones are dropped)
+        self._frame = None
+        self._frame_cond = threading.Condition()
+        self.captured = 0
+        self.processed = 0
+        self.dropped = 0
+
+        self._updated = threading.Condition()
+        self.snapshot = SensorSnapshot.create(
+            0,
+            time.monotonic(),
+            {name: NO_READING_DIST_CM for name in self.sectors.names},
+            source="camera",
+        )
+
+        self.running = False
+        self.threads = [
+            threading.Thread(target=self._capture_loop, daemon=True),
+            threading.Thread(target=self._process_loop, daemon=True),
+        ]
+        if autostart:
+            self.start()
+
+    def start(self):
+        self.running = True
+        for thread in self.threads:
+            thread.start()
+        print("[CameraStrategy] Capture and processing threads started.")
+
+    def _capture_loop(self):
+        """CAPTURE THREAD. Only ever holds the newest frame."""
+        while self.running:
+            item = self.source.read()
+            if item is None:
+                break  # File source finished
+            with self._frame_cond:
+                if self._frame is not None:
+                    self.dropped += 1
+                self._frame = item
+                self.captured += 1
+                self._frame_cond.notify()
+
+    def _process_loop(self):
+        """PROCESSING THREAD. Works on the newest frame, skips what it cannot keep up with."""
+        while self.running:
+            with self._frame_cond:
+                self._frame_cond.wait_for(lambda: self._frame is not None or not self.running, 0.5)
+                item = self._frame
+                self._frame = None
+            if item is not None:
+                self.process(*item)
+
+    def process(self, frame, timestamp):
+        """Turns one frame into a published SensorSnapshot"""
+        start = time.perf_counter()
+
+        closest, confidence = self._free_space(frame)
+        snapshot = SensorSnapshot.create(
+            self.snapshot.seq + 1,
+            timestamp,
+            zip(self.sectors.names, closest.tolist()),
+            zip(self.sectors.names, confidence.tolist()),
+            source="camera",
+        )
+        with self._updated:
+            self.snapshot = snapshot
+            self._updated.notify_all()
+        self.processed += 1
+
+        # Bounded latency: coarser pixels when over budget, finer when well below
+        elapsed = time.perf_counter() - start
+        if elapsed > self.budget_s and self.step < CAMERA_MAX_DOWNSAMPLE:
+            self.step *= 2
+        elif elapsed < self.budget_s / 4 and self.step > CAMERA_DOWNSAMPLE:
+            self.step //= 2
+
+        if self._process_probe is not None:
+            self._process_probe.record(int(elapsed * 1e9))
+            self._age_probe.record(int((time.monotonic() - timestamp) * 1e9))
+
+    def _free_space(self, frame):
+        """Per sector: closest obstacle foot (cm) and the share of the sector in view"""
+        small = frame[:: self.step, :: self.step]
+        if small.ndim == 3:
+            # Integer luma on the small image only. Widen first: with NumPy 1.x
+            # casting uint8 * np.uint16 scalar stays uint8 and wraps
+            wide = small.astype(np.uint16)
+            small = (wide[:, :, 0] * 77 + wide[:, :, 1] * 150 + wide[:, :, 2] * 29) >> 8
+        gray = small.astype(np.float32)
+        h, w = gray.shape
+        row_dist, col_sector, coverage = self._geometry(h, w)
+
+        # Floor model from the bottom rows: median and MAD, so a close
+        # obstacle covering part of them does not become the floor
+        floor = gray[h - max(1, int(h * CAMERA_FLOOR_ROWS)) :]
+        level = np.median(floor)
+        std = max(1.4826 * np.median(np.abs(floor - level)), CAMERA_MIN_FLOOR_STD)
+        obstacle = np.abs(gray - level) > CAMERA_FLOOR_TOLERANCE * std
+        obstacle[:-1] &= obstacle[1:]  # Two pixels in a row, single noisy pixels do not count
+
+        # First obstacle row from the bottom of every column
+        from_bottom = obstacle[::-1]
+        found = from_bottom.any(axis=0)
+        rows = h - 1 - from_bottom.argmax(axis=0)
+        dist = np.where(found, row_dist[rows], NO_READING_DIST_CM)
+
+        closest = np.full(len(self.sectors), NO_READING_DIST_CM)
+        seen = col_sector >= 0
+        np.minimum.at(closest, col_sector[seen], dist[seen])
+        return closest, coverage
+
+    def _geometry(self, h, w):
+        """Distance of every row's floor point and sector of every column, cached per shape"""
+        if (h, w) not in self._tables:
+            # Pinhole model: focal lengths in (downsampled) pixels
+            fy = (h / 2) / math.tan(math.radians(CAMERA_VFOV_DEG / 2))
+            fx = (w / 2) / math.tan(math.radians(CAMERA_HFOV_DEG / 2))
+
+            below = np.radians(CAMERA_TILT_DEG) + np.arctan((np.arange(h) + 0.5 - h / 2) / fy)
+            row_dist = np.where(
+                below > 0, CAMERA_HEIGHT_CM / np.tan(np.maximum(below, 1e-6)), NO_READING_DIST_CM
+            )
+            row_dist[row_dist > MAX_VALID_DIST_CM] = NO_READING_DIST_CM
+
+            # Rover frame angles run clockwise, the right edge of the image is positive
+            col_angle = np.degrees(np.arctan((np.arange(w) + 0.5 - w / 2) / fx)) % 360
+            col_sector = self.sectors.lookup(col_angle)
+
+            # Share of every sector the camera sees, scaled to the trust in the method
+            seen_deg = np.bincount(col_sector[col_sector >= 0], minlength=len(self.sectors))
+            seen_deg = seen_deg * (CAMERA_HFOV_DEG / w)
+            coverage = np.minimum(seen_deg / (self.sectors.coverage * 360.0), 1.0) * CAMERA_CONFIDENCE
+
+            self._tables[(h, w)] = (row_dist, col_sector, coverage)
+        return self._tables[(h, w)]
+
     def check_path(self):
-        return True, 0.0, 0.0, 0.0 
+        return self.snapshot
+
+    def wait_for_update(self, last_seq, timeout):
+        """Sleeps until a new frame was processed (or timeout)"""
+        with self._updated:
+            self._updated.wait_for(lambda: self.snapshot.seq != last_seq, timeout)
+            return self.snapshot
+
+    @property
+    def exhausted(self):
+        return self.source.exhausted
+
     def stop(self):
-        pass
+        self.running = False
+        with self._frame_cond:
+            self._frame_cond.notify_all()
+        for thread in self.threads:
+            if thread.is_alive():
+                thread.join(timeout=1.0)
+        self.source.close()
+        print(
+            f"[CameraStrategy] {self.processed} frames processed, {self.dropped} dropped. Camera closed."
+        )
@@ -0,0 +1,170 @@
+import glob
+import os
+import time
+from abc import ABC, abstractmethod
+
+import numpy as np
+
+from src.constants import CAMERA_WIDTH, CAMERA_HEIGHT, CAMERA_FPS
+
+
+class FrameSource(ABC):
+    """
+    Where CameraStrategy gets its frames from.
+    read() blocks until the next frame and returns (frame, capture time as
+    time.monotonic()), or None once a file based source is exhausted.
+    Frames are HxWx3 RGB or HxW gray uint8 arrays.
+    """
+
+    exhausted = False
+
+    @abstractmethod
+    def read(self):
+        """Next (frame, capture time), or None when exhausted"""
+        pass
+
+    def close(self):
+        pass
+
+
+class _Pacer:
+    """Spaces out reads to fps (0 = as fast as possible)"""
+
+    def __init__(self, fps):
+        self.period = 1.0 / fps if fps else 0.0
+        self.next = None
+
+    def wait(self):
+        now = time.monotonic()
+        if self.next is None:
+            self.next = now
+        if self.next > now:
+            time.sleep(self.next - now)
+        self.next = max(self.next + self.period, time.monotonic() - self.period)
+        return time.monotonic()
+
+
+class PiCameraSource(FrameSource):
+    """The rover's camera through picamera2 (only installed on the Pi)"""
+
+    def __init__(self, width=CAMERA_WIDTH, height=CAMERA_HEIGHT, fps=CAMERA_FPS):
+        from picamera2 import Picamera2
+
+        self.camera = Picamera2()
+        config = self.camera.create_video_configuration(
+            main={"size": (width, height), "format": "RGB888"},
+            controls={"FrameRate": fps},
+        )
+        self.camera.configure(config)
+        self.camera.start()
+
+    def read(self):
+        frame = self.camera.capture_array()
+        return frame, time.monotonic()
+
+    def close(self):
+        self.camera.stop()
+        self.camera.close()
+
+
+class DirectorySource(FrameSource):
+    """
+    Image files of a directory in name order, played at fps.
+    .npy frames need nothing but NumPy, other formats are read with OpenCV.
+    """
+
+    def __init__(self, path, fps=CAMERA_FPS, loop=False):
+        self.files = sorted(
+            f for f in glob.glob(os.path.join(path, "*")) if os.path.isfile(f)
+        )
+        if not self.files:
+            raise ValueError(f"No frames in {path}")
+        self.loop = loop
+        self.pos = 0
+        self.pacer = _Pacer(fps)
+
+    def read(self):
+        if self.pos >= len(self.files):
+            if not self.loop:
+                self.exhausted = True
+                return None
+            self.pos = 0
+
+        filename = self.files[self.pos]
+        self.pos += 1
+        if filename.endswith(".npy"):
+            frame = np.load(filename)
+        else:
+            import cv2
+
+            frame = cv2.imread(filename)[:, :, ::-1]  # BGR -> RGB
+        return frame, self.pacer.wait()
+
+
+class VideoSource(FrameSource):
+    """A video file through OpenCV, played at fps (0 = as fast as it decodes)"""
+
+    def __init__(self, path, fps=CAMERA_FPS):
+        import cv2
+
+        self.capture = cv2.VideoCapture(path)
+        if not self.capture.isOpened():
+            raise ValueError(f"Cannot open video {path}")
+        self.pacer = _Pacer(fps)
+
+    def read(self):
+        ok, frame = self.capture.read()
+        if not ok:
+            self.exhausted = True
+            return None
+        return frame[:, :, ::-1], self.pacer.wait()
+
+    def close(self):
+        self.capture.release()
+
+
+class SyntheticSource(FrameSource):
+    """
+    Generated frames without any camera: a noisy gray floor and a dark box
+    that drives towards the camera and away again. For tests and benchmarks.
+    """
+
+    def __init__(self, width=CAMERA_WIDTH, height=CAMERA_HEIGHT, fps=CAMERA_FPS, frames=None, seed=0):
+        self.width = width
+        self.height = height
+        self.frames = frames
+        self.count = 0
+        self.pacer = _Pacer(fps)
+        self.rng = np.random.default_rng(seed)
+        self._floor = self.rng.normal(120, 4, size=(height, width)).clip(0, 255).astype(np.uint8)
+
+    def read(self):
+        if self.frames is not None and self.count >= self.frames:
+            self.exhausted = True
+            return None
+
+        frame = np.repeat(self._floor[:, :, None], 3, axis=2)
+        frame[: self.height // 3] = 200  # Wall / sky above the floor
+
+        # Box bottom edge moves between 40 % and 90 % of the image height
+        phase = (self.count % 120) / 120.0
+        bottom = int(self.height * (0.4 + 0.5 * (1 - abs(2 * phase - 1))))
+        left = self.width // 3
+        frame[self.height // 3 : bottom, left : left + self.width // 4] = 30
+
+        self.count += 1
+        return frame, self.pacer.wait()
+
+
+def open_source(spec, fps=CAMERA_FPS):
+    """
+    "pi" = the camera, "synthetic" = generated frames,
+    a directory = its images, anything else = a video file.
+    """
+    if spec == "pi":
+        return PiCameraSource(fps=fps)
+    if spec == "synthetic":
+        return SyntheticSource(fps=fps)
+    if os.path.isdir(spec):
+        return DirectorySource(spec, fps)
+    return VideoSource(spec, fps)
@@ -6,6 +6,8 @@ STALL_THRESHOLD = 0.25
 MAX_SPEED = 1.0
 MIN_SPEED = -1.0
 TURN_SPEED = 0.25  # Legacy: Used if motor.turn_left()/right() called manually
+RAMP_RATE_PER_S = 2.5  # Max PWM change per second (0.05 every 20 ms)
+RAMP_TICK_S = 0.02  # Update period of the ramp thread while a ramp is running
 #####################
 
 #####################
@@ -15,6 +17,8 @@ STEER_SENSITIVITY = 0.005  # Low value = Gentle curves. High value = Twitchy ste
 OBSTACLE_AVOIDANCE_BIAS = (
     0.10  # Fixed steering offset applied when an object is detected ahead
 )
+STEER_MAX_TURN = 0.25  # Max turn is 25% power difference
+STEER_TABLE_RESOLUTION_CM = 1.0  # Cell size of the precomputed steering surface
 #####################
 
 #####################
@@ -22,11 +26,13 @@ OBSTACLE_AVOIDANCE_BIAS = (
 ACTION_DRIVE = "DRIVE"
 ACTION_STOP = "STOP"
 ACTION_INIT = "INIT"
+ACTION_ESCAPE = "ESCAPE"
 #####################
 
 #####################
 ## DISTANCE CONSTANTS ##
 MAX_VALID_DIST_CM = 250.0
+NO_READING_DIST_CM = 999.0  # Reported for a sector without any valid point
 SLOWDOWN_DIST_CM = 55.0  # Below this, we slow to MIN_APPROACH_SPEED
 CRITICAL_DIST_CM = 15.0  # Below this, we stop and escape
 SIDE_CUSHION_DIST_CM = 35.0  # If wall is further than this, drive straight
@@ -44,18 +50,149 @@ POINTS_PER_PACKET = 12
 ANGLE_DIVISOR = 100.0
 MM_TO_CM = 10.0
 LIDAR_OFFSET_DEG = 90
+SCAN_BUFFER_CAPACITY = 1024  # Points per revolution slot (~450 at 10 Hz)
+SCAN_BUFFER_SLOTS = 3  # Writing, published, spare for slow readers
+LIDAR_CRC_POLY = 0x4D  # CRC-8 polynomial of the LD06/LD19 packet checksum
+LIDAR_MIN_INTENSITY = 30  # Weaker returns (0-255) are treated as no return
 #####################
 
 #####################
 ## SECTOR CONSTANTS ##
-SECTOR_BOUNDARIES = {
-    "FRONT_START": 340,
-    "FRONT_END": 20,
-    "LEFT_START": 270,
-    "LEFT_END": 340,
-    "RIGHT_START": 20,
-    "RIGHT_END": 90,
+# name: (start_deg, end_deg) in the rover frame, start inclusive, end exclusive.
+# A sector may wrap past 0 deg (e.g. FRONT). On overlap the earlier entry wins.
+# Add rear/diagonal sectors here, the scan loop does not need to change.
+SECTORS = {
+    "FRONT": (340, 20),
+    "LEFT": (270, 340),
+    "RIGHT": (20, 90),
+    "REAR": (160, 200),
 }
+SECTOR_RESOLUTION_DEG = 1 / ANGLE_DIVISOR  # Lookup table bin width (0.01 deg)
+# Sector distance = k-th closest valid point of the revolution, so single
+# spurious short returns do not count: k = max(TRIM, PERCENTILE of the points)
+SECTOR_TRIM_POINTS = 2  # Closest returns ignored per sector
+SECTOR_PERCENTILE = 0.0  # e.g. 5.0 = 5th percentile, 0 = trimmed minimum only
+SECTOR_MIN_POINTS = 3  # Fewer valid points than this = no reading
+#####################
+
+#####################
+## ESCAPE CONSTANTS ##
+ESCAPE_BRAKE_S = 0.2  # Hold still after the emergency stop
+ESCAPE_REVERSE_S = 0.6  # Back up slowly (cut short if REAR gets critical)
+ESCAPE_PAUSE_S = 0.1
+ESCAPE_PIVOT_S = 0.5  # Planned pivot, extended while the front is still blocked
+ESCAPE_PIVOT_MIN_S = 0.2  # Pivot may end this early if the front is wide open
+ESCAPE_PIVOT_MAX_S = 1.5  # Give up turning after this long
+ESCAPE_SETTLE_S = 0.2
+#####################
+
+#####################
+## LOOP CONSTANTS ##
+CONTROL_PERIOD_S = 0.016  # Poll mode: fixed ~60 Hz throttle
+EVENT_MIN_PERIOD_S = 0.005  # Event mode: never tick faster than 200 Hz
+ADAPTIVE_MIN_RATE_HZ = 15.0  # Adaptive mode: open space, standing still
+ADAPTIVE_MAX_RATE_HZ = 100.0  # Adaptive mode: at CRITICAL_DIST_CM or while escaping
+ADAPTIVE_STEP_CM = 1.0  # Adaptive mode: at most this much travel between two ticks
+ADAPTIVE_RELEASE_S = 0.5  # Rate rises at once, falls back with this time constant
+ADAPTIVE_TICKS_PER_SNAPSHOT = 8  # Adaptive mode: at most this many ticks per new snapshot
+RATE_SMOOTHING = 0.1  # Weight of the newest tick interval in the logged loop rate
+SENSOR_WATCHDOG_S = 0.3  # Stop the motors if no new scan arrives within this time
+#####################
+
+#####################
+## LOG CONSTANTS ##
+LOG_DIR = "data_logs"
+LOG_CACHE_DIR = "data_logs/.cache"  # Parsed logs for the analysis scripts
+LOG_INDEX_FILE = "data_logs/index.json"  # Per-run summaries, see src/run_index.py
+LOG_FLUSH_BYTES = 64 * 1024  # Write to the SD card once this much is pending...
+LOG_FLUSH_INTERVAL_S = 1.0  # ...or at the latest after this many seconds
+LOG_RING_CAPACITY = 4096  # Records buffered between control loop and writer (~68 s at 60 Hz)
+LOG_OVERFLOW_POLICY = "drop_oldest"  # or "drop_newest"
+LOG_POLL_INTERVAL_S = 0.05  # Writer thread sleep while the ring is empty
+LOG_DELTA_DEADBAND_CM = 1.0  # Delta logs: a distance must move more than this to be logged
+LOG_DELTA_MOTOR = 0.005  # Delta logs: smaller command changes do not show in a CSV (2 decimals)
+LOG_KEYFRAME_S = 1.0  # Delta logs: at least one row this often, even if nothing changed
+#####################
+
+#####################
+## STATS CONSTANTS ##
+STATS_WINDOW = 2048  # Samples per stage kept for the rolling percentiles
+STATS_REPORT_INTERVAL_S = 5.0
+#####################
+
+#####################
+## REPLAY CONSTANTS ##
+REPLAY_SCAN_RATE_HZ = 10  # LD19 default rotation speed
+REPLAY_PACKETS_PER_REV = 38  # ~4500 points/s at 10 Hz
+#####################
+
+#####################
+## CAMERA CONSTANTS ##
+CAMERA_WIDTH = 640
+CAMERA_HEIGHT = 480
+CAMERA_FPS = 30
+CAMERA_HFOV_DEG = 62.2  # Pi Camera Module v2
+CAMERA_VFOV_DEG = 48.8
+CAMERA_HEIGHT_CM = 10.0  # Lens above the floor
+CAMERA_TILT_DEG = 12.0  # Optical axis below the horizon
+CAMERA_DOWNSAMPLE = 8  # Keep every n-th pixel (640x480 -> 80x60)
+CAMERA_MAX_DOWNSAMPLE = 32  # Coarsest step when frames do not fit the budget
+CAMERA_FRAME_BUDGET_S = 0.015  # Max processing time per frame
+CAMERA_FLOOR_ROWS = 0.15  # Bottom share of the image that samples the floor
+CAMERA_FLOOR_TOLERANCE = 3.0  # Pixels further than this many std from the floor are obstacles
+CAMERA_MIN_FLOOR_STD = 6.0  # Gray levels, keeps a very uniform floor from flagging noise
+CAMERA_CONFIDENCE = 0.6  # Trust in a fully visible sector (flat floor guess, not a range)
+#####################
+
+#####################
+## FUSION CONSTANTS ##
+FUSION_MAX_SKEW_S = 0.25  # Sources older than this behind the newest one are left out
+FUSION_TRUST_CONFIDENCE = 0.5  # A source this confident can always pull a sector closer
+FUSION_WAIT_TIMEOUT_S = 0.5  # Source watcher wake-up to notice stop()
+#####################
+
+#####################
+## ISOLATION CONSTANTS ##
+ISOLATE_SUPERVISE_PERIOD_S = 0.05  # Child health check and velocity hand-over
+ISOLATE_HEARTBEAT_TIMEOUT_S = 2.0  # Child that stopped responding this long is restarted
+ISOLATE_RESTART_DELAY_S = 1.0  # Wait before starting a crashed child again
+ISOLATE_MAX_RESTARTS = 5  # Then give up (the controller watchdog keeps the rover stopped)
+ISOLATE_READ_RETRIES = 100  # Seqlock reads before check_path gives up on a stuck writer
+#####################
+
+#####################
+## ODOMETRY CONSTANTS ##
+# Measure on the floor: drive straight at full PWM for a few seconds (tests/motor_calibration.py)
+ODOM_WHEEL_SPEED_CM_S = 60.0  # Wheel surface speed at PWM 1.0
+ODOM_TRACK_WIDTH_CM = 14.0  # Distance between the left and right wheel contact points
+ODOM_LEFT_TRIM = 1.0  # Same meaning as LEFT_TRIM / RIGHT_TRIM in tests/motor_calibration.py
+ODOM_RIGHT_TRIM = 1.0
+ODOM_MAX_DT_S = 0.25  # Longer gaps between updates are not integrated as motion
+#####################
+
+#####################
+## MAPPING CONSTANTS ##
+MAP_SIZE_CM = 1000  # Side of the square occupancy grid around the rover
+MAP_RESOLUTION_CM = 5.0  # Cell size
+MAP_LOG_ODDS_HIT = 0.85  # Added to the cell a beam ends in
+MAP_LOG_ODDS_MISS = -0.4  # Added to every cell a beam passes through
+MAP_LOG_ODDS_MIN = -4.0  # Clamp, so cells can change their mind again
+MAP_LOG_ODDS_MAX = 4.0
+MAP_OCCUPIED_LOG_ODDS = 1.5  # Cells above count as obstacles (~2 hits)
+MAP_SCAN_BUDGET_S = 0.02  # Max mapping time per revolution, rest of the rays is skipped
+MAP_RAY_CHUNK = 64  # Rays cast per vectorized step (budget is checked in between)
+#####################
+
+#####################
+## SIMULATION CONSTANTS ##
+SIM_DURATION_S = 60.0  # Simulated time per episode
+SIM_ROVER_RADIUS_CM = 10.0  # Footprint around the LiDAR, touching a wall = collision
+SIM_SCAN_RATE_HZ = 10  # Revolutions per second of the emulated LiDAR
+SIM_SCAN_POINTS = 450  # Points per revolution (LD19 at 10 Hz)
+SIM_RANGE_NOISE_CM = 1.0  # Gaussian range noise of every point
+SIM_DROPOUT = 0.02  # Share of points without a return
+SIM_START_CLEARANCE_CM = 40.0  # Free space around a random start pose
+SIM_EPISODES = 8  # Per world and parameter set
 #####################
 
 #####################
@@ -0,0 +1,179 @@
+import time
+
+from src.escape_maneuver import EscapeManeuver
+from src.steering import steer
+from src.constants import (
+    CRITICAL_DIST_CM,
+    SENSOR_WATCHDOG_S,
+    CONTROL_PERIOD_S,
+    RATE_SMOOTHING,
+    ACTION_DRIVE,
+    ACTION_ESCAPE,
+)
+
+
+class RoverController:
+    """
+    The body of the control loop.
+    tick() never sleeps: the caller decides when to run it (fixed rate or
+    on new sensor data) and passes the newest snapshot and the current time.
+    steering: callable (front, left, right) -> (left_motor, right_motor),
+    e.g. a SteeringSurface. Defaults to src.steering.steer.
+    critical_dist: front distance (cm) that starts an escape.
+    """
+
+    def __init__(
+        self,
+        rover,
+        logger,
+        mode,
+        watchdog=SENSOR_WATCHDOG_S,
+        profiler=None,
+        odometry=None,
+        steering=steer,
+        critical_dist=CRITICAL_DIST_CM,
+    ):
+        self.rover = rover
+        self.logger = logger
+        self.mode = mode
+        self.watchdog = watchdog
+        self.odometry = odometry
+        self._steer = steering
+        self.critical_dist = critical_dist
+
+        self.profiler = profiler
+        if profiler is not None:
+            self._steer_probe = profiler.probe("steer")
+            self._drive_probe = profiler.probe("drive")
+            self._log_probe = profiler.probe("log")
+            self._age_probe = profiler.probe("scan_age")
+
+        self.escape = EscapeManeuver()
+        self.rate = 0.0  # Achieved tick rate (Hz), logged with every row
+        self._interval = CONTROL_PERIOD_S  # Smoothed time between ticks
+        self._last_tick = None
+        self.sensor_rate = 0.0  # New snapshots per second, 0 until two arrived
+        self._data_interval = None  # Smoothed time between snapshots, on their timestamps
+        self._last_data = None  # (seq, timestamp) of the newest snapshot
+        self.ticks = 0
+        self.idle_ticks = 0  # Ticks that found no new snapshot
+        self.last_seq = 0  # seq 0 means no scan yet, so wait for the first one
+        self.stalled = False
+
+    def wait_timeout(self, timeout):
+        """How long the loop may wait for new data before the next tick is due"""
+        if self.escape.active:
+            # The maneuver is timed, keep ticking even without new scans
+            return min(timeout, CONTROL_PERIOD_S)
+        return timeout
+
+    def tick(self, snapshot, now):
+        if self._last_tick is not None:
+            # Average the intervals, not their inverse: one short gap does not spike the rate
+            self._interval += (now - self._last_tick - self._interval) * RATE_SMOOTHING
+            self.rate = 1.0 / max(self._interval, 1e-6)
+        self._last_tick = now
+
+        if self.odometry is not None:
+            # PWM that drove the wheels since the last tick
+            self.odometry.update(now, *self.rover.wheel_pwm)
+
+        self.ticks += 1
+        new_data = snapshot.seq != self.last_seq
+        if new_data:
+            self._track_sensor_rate(snapshot)
+            self.last_seq = snapshot.seq
+            self.stalled = False
+        elif self.last_seq > 0:
+            self.idle_ticks += 1
+            if not self.stalled:
+                # WATCHDOG: sensor went quiet, do not drive blind
+                age = snapshot.age(now)
+                if age > self.watchdog:
+                    print(f"WATCHDOG ({age:.2f}s without data) -> STOP")
+                    self.escape.cancel()
+                    self.rover.stop(force_stop=True)
+                    self.stalled = True
+
+        if self.stalled:
+            return
+
+        front, left, right = snapshot.front, snapshot.left, snapshot.right
+
+        if self.escape.active:
+            command = self.escape.update(snapshot, now)
+            if command is not None:
+                self.rover.drive(*command)
+                if new_data:
+                    self._log(snapshot, now, ACTION_ESCAPE, command)
+                return
+
+        # Nothing new since the last tick: keep the current motor command
+        if not new_data:
+            return
+
+        # CRITICAL STOP & PRECISION TURN
+        if front < self.critical_dist:
+            print(f"CRITICAL ({front:.1f}cm) -> PRECISION TURN")
+            self.escape.start(now)
+            self.rover.stop(force_stop=True)
+            self._log(snapshot, now, ACTION_ESCAPE, (0.0, 0.0))
+            return
+
+        if self.profiler is None:
+            left_motor, right_motor = self._steer(front, left, right)
+            self.rover.drive(left_motor, right_motor)
+            self._log(snapshot, now, ACTION_DRIVE, (left_motor, right_motor))
+            return
+
+        t0 = time.perf_counter_ns()
+        left_motor, right_motor = self._steer(front, left, right)
+        t1 = time.perf_counter_ns()
+        self.rover.drive(left_motor, right_motor)
+        t2 = time.perf_counter_ns()
+        self._log(snapshot, now, ACTION_DRIVE, (left_motor, right_motor))
+        t3 = time.perf_counter_ns()
+
+        self._steer_probe.record(t1 - t0)
+        self._drive_probe.record(t2 - t1)
+        self._log_probe.record(t3 - t2)
+        # Sensor capture -> motor command, on the caller's clock
+        self._age_probe.record(int((now - snapshot.timestamp) * 1e9) + (t2 - t0))
+
+    def _track_sensor_rate(self, snapshot):
+        """Snapshot rate from the sensor's own timestamps, missed snapshots included"""
+        if self._last_data is not None:
+            seq, timestamp = self._last_data
+            gap = (snapshot.timestamp - timestamp) / max(snapshot.seq - seq, 1)
+            if gap > 0:
+                if self._data_interval is None:
+                    self._data_interval = gap
+                else:
+                    self._data_interval += (gap - self._data_interval) * RATE_SMOOTHING
+                self.sensor_rate = 1.0 / self._data_interval
+        self._last_data = (snapshot.seq, snapshot.timestamp)
+
+    def stats(self):
+        """Loop counters: ticks, ticks without new data, tick and snapshot rates (Hz)"""
+        return {
+            "ticks": self.ticks,
+            "idle_ticks": self.idle_ticks,
+            "rate_hz": round(self.rate, 1),
+            "sensor_hz": round(self.sensor_rate, 1),
+        }
+
+    def _log(self, snapshot, now, action, command):
+        left_motor, right_motor = command
+        self.logger.log(
+            self.mode,
+            snapshot.front,
+            snapshot.left,
+            snapshot.right,
+            action,
+            left_motor,
+            right_motor,
+            data_age=snapshot.age(now),
+            phase=self.escape.phase if action == ACTION_ESCAPE else "",
+            timestamp=now,
+            rate=self.rate,
+        )
@@ -0,0 +1,105 @@
+from src.constants import (
+    STALL_THRESHOLD,
+    CRITICAL_DIST_CM,
+    STOPPING_DIST_CM,
+    SLOWDOWN_DIST_CM,
+    ESCAPE_BRAKE_S,
+    ESCAPE_REVERSE_S,
+    ESCAPE_PAUSE_S,
+    ESCAPE_PIVOT_S,
+    ESCAPE_PIVOT_MIN_S,
+    ESCAPE_PIVOT_MAX_S,
+    ESCAPE_SETTLE_S,
+)
+
+IDLE = "IDLE"
+BRAKE = "BRAKE"
+REVERSE = "REVERSE"
+PAUSE = "PAUSE"
+PIVOT = "PIVOT"
+SETTLE = "SETTLE"
+PHASES = (IDLE, BRAKE, REVERSE, PAUSE, PIVOT, SETTLE)
+
+
+class EscapeManeuver:
+    """
+    Non-blocking STOP -> REVERSE -> PIVOT sequence for CRITICAL situations.
+    The control loop calls update() every tick with the newest snapshot,
+    so sensor data keeps flowing while the rover escapes:
+    - REVERSE is cut short when something shows up in the REAR sector
+    - PIVOT turns towards the side that is open *now*, ends early when
+      the front is wide open and is extended while the front is blocked
+    """
+
+    def __init__(self, speed=STALL_THRESHOLD):
+        self.speed = speed
+        self.phase = IDLE
+        self.count = 0  # Number of escapes started
+        self._phase_start = 0.0
+        self._turn_left = True
+
+    @property
+    def active(self):
+        return self.phase != IDLE
+
+    def start(self, now):
+        self.count += 1
+        self._enter(BRAKE, now)
+
+    def cancel(self):
+        self.phase = IDLE
+
+    def _enter(self, phase, now):
+        self.phase = phase
+        self._phase_start = now
+
+    def update(self, snapshot, now):
+        """
+        Advances the sequence.
+        Returns the (left, right) command for this tick, or None once finished.
+        """
+        elapsed = now - self._phase_start
+
+        if self.phase == BRAKE:
+            if elapsed >= ESCAPE_BRAKE_S:
+                self._enter(REVERSE, now)
+
+        elif self.phase == REVERSE:
+            rear = snapshot.distances.get("REAR")
+            if elapsed >= ESCAPE_REVERSE_S or (
+                rear is not None and rear < CRITICAL_DIST_CM
+            ):
+                self._enter(PAUSE, now)
+
+        elif self.phase == PAUSE:
+            if elapsed >= ESCAPE_PAUSE_S:
+                # Precision Pivot towards the more open side
+                self._turn_left = snapshot.left > snapshot.right
+                self._enter(PIVOT, now)
+
+        elif self.phase == PIVOT:
+            front = snapshot.front
+            if (
+                elapsed >= ESCAPE_PIVOT_MAX_S
+                or (elapsed >= ESCAPE_PIVOT_S and front > STOPPING_DIST_CM)
+                or (elapsed >= ESCAPE_PIVOT_MIN_S and front > SLOWDOWN_DIST_CM)
+            ):
+                self._enter(SETTLE, now)
+
+        elif self.phase == SETTLE:
+            if elapsed >= ESCAPE_SETTLE_S:
+                self.phase = IDLE
+
+        return self.command()
+
+    def command(self):
+        """(left, right) speed for the current phase, None when idle"""
+        if self.phase == IDLE:
+            return None
+        if self.phase == REVERSE:
+            return -self.speed, -self.speed
+        if self.phase == PIVOT:
+            if self._turn_left:
+                return -self.speed, self.speed
+            return self.speed, -self.speed
+        return 0.0, 0.0
@@ -1,11 +1,132 @@
-from src.interfaces import ObstacleStrategy
+import threading
+import time
+
+import numpy as np
+
+from src.interfaces import ObstacleStrategy, SensorSnapshot
+from src.constants import (
+    SECTORS,
+    NO_READING_DIST_CM,
+    FUSION_MAX_SKEW_S,
+    FUSION_TRUST_CONFIDENCE,
+    FUSION_WAIT_TIMEOUT_S,
+)
 
 
 class FusionStrategy(ObstacleStrategy):
+    """
+    Merges the snapshots of several ObstacleStrategies into one.
+
+    Every source gets a watcher thread that sleeps in its wait_for_update()
+    and fuses as soon as that source publishes. check_path() only returns
+    the last fused snapshot, the control loop never waits for the merge.
+
+    Per sector: the confidence weighted mean of the sources with a reading,
+    never further than the closest source that is at least
+    FUSION_TRUST_CONFIDENCE sure. Sources lagging more than max_skew behind
+    the newest snapshot are left out.
+    """
+
+    def __init__(self, strategies, names=None, max_skew=FUSION_MAX_SKEW_S):
+        self.strategies = list(strategies)
+        self.names = tuple(names if names is not None else SECTORS)
+        self.max_skew = max_skew
+
+        # Newest snapshot of every source, written by its watcher
+        self.latest = [s.check_path() for s in self.strategies]
+
+        self._fuse_lock = threading.Lock()
+        self._updated = threading.Condition()
+        self.snapshot = SensorSnapshot.create(
+            0,
+            time.monotonic(),
+            {name: NO_READING_DIST_CM for name in self.names},
+            source="fusion",
+        )
+
+        self.running = True
+        self.threads = [
+            threading.Thread(target=self._watch, args=(i,), daemon=True)
+            for i in range(len(self.strategies))
+        ]
+        for thread in self.threads:
+            thread.start()
+        print(f"[FusionStrategy] Fusing {len(self.strategies)} sources.")
+
+    def _watch(self, i):
+        """WATCHER THREAD of source i"""
+        source = self.strategies[i]
+        last_seq = self.latest[i].seq
+        while self.running:
+            snapshot = source.wait_for_update(last_seq, FUSION_WAIT_TIMEOUT_S)
+            if snapshot.seq == last_seq:
+                continue
+            last_seq = snapshot.seq
+            with self._fuse_lock:
+                self.latest[i] = snapshot
+                self._fuse()
+
+    def _fuse(self):
+        snapshots = [s for s in self.latest if s.seq > 0]
+        if not snapshots:
+            return
+
+        newest = max(s.timestamp for s in snapshots)
+        snapshots = [s for s in snapshots if newest - s.timestamp <= self.max_skew]
+
+        # (sources, sectors): distance and how much to trust it
+        dist = np.array(
+            [[s.distances.get(n, NO_READING_DIST_CM) for n in self.names] for s in snapshots]
+        )
+        conf = np.array(
+            [[s.confidence.get(n, 1.0) for n in self.names] for s in snapshots]
+        )
+        counts = np.array([[s.counts.get(n, 0) for n in self.names] for s in snapshots])
+
+        seen = dist < NO_READING_DIST_CM
+        weight = np.where(seen, conf, 0.0)
+        total = weight.sum(axis=0)
+        mean = np.divide(
+            (weight * np.where(seen, dist, 0.0)).sum(axis=0),
+            total,
+            out=np.full(len(self.names), NO_READING_DIST_CM),
+            where=total > 0,
+        )
+
+        # A confident close reading is never averaged away by a far one
+        trusted = np.where(seen & (conf >= FUSION_TRUST_CONFIDENCE), dist, NO_READING_DIST_CM)
+        fused = np.minimum(mean, trusted.min(axis=0))
+        confidence = 1.0 - np.prod(1.0 - np.where(seen, conf, 0.0), axis=0)
+
+        snapshot = SensorSnapshot.create(
+            self.snapshot.seq + 1,
+            min(s.timestamp for s in snapshots),  # Age of the oldest data used
+            zip(self.names, fused.tolist()),
+            zip(self.names, confidence.tolist()),
+            zip(self.names, counts.sum(axis=0).tolist()),
+            source="fusion",
+        )
+        with self._updated:
+            self.snapshot = snapshot
+            self._updated.notify_all()
+
     def check_path(self):
-        # Combine strategies
-        is_safe, front_dist, left_dist, right_dist = super().check_path()
-        return is_safe, front_dist, left_dist, right_dist
+        return self.snapshot
+
+    def wait_for_update(self, last_seq, timeout):
+        """Sleeps until a source update produced a new fused snapshot (or timeout)"""
+        with self._updated:
+            self._updated.wait_for(lambda: self.snapshot.seq != last_seq, timeout)
+            return self.snapshot
+
+    @property
+    def exhausted(self):
+        return any(getattr(s, "exhausted", False) for s in self.strategies)
 
     def stop(self):
-        super().stop()  
\ No newline at end of file
+        self.running = False
+        for thread in self.threads:
+            thread.join(timeout=FUSION_WAIT_TIMEOUT_S + 1.0)
+        for strategy in self.strategies:
+            strategy.stop()
+        print("[FusionStrategy] All sources stopped.")
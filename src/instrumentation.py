@@ -0,0 +1,119 @@
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import numpy as np
+
+from src.constants import STATS_WINDOW, STATS_REPORT_INTERVAL_S
+
+
+class LatencyProbe:
+    """
+    Rolling window of the last `window` durations (ns) of one pipeline stage.
+    record() is a single array store, percentiles are only computed on summary().
+    """
+
+    def __init__(self, name, window=STATS_WINDOW):
+        self.name = name
+        self.samples = np.zeros(window, dtype=np.int64)
+        self.count = 0
+
+    def record(self, duration_ns):
+        self.samples[self.count % self.samples.size] = duration_ns
+        self.count += 1
+
+    def summary(self):
+        n = min(self.count, self.samples.size)
+        if n == 0:
+            return None
+
+        p50, p99 = np.percentile(self.samples[:n], [50, 99])
+        return {
+            "count": self.count,
+            "p50_ms": p50 / 1e6,
+            "p99_ms": p99 / 1e6,
+            "max_ms": int(self.samples[:n].max()) / 1e6,
+        }
+
+
+class Profiler:
+    """
+    Collects LatencyProbes of the whole pipeline:
+    decode, check_path, steer, drive, log and scan-to-actuation age.
+    Time stages with time.perf_counter_ns() and call probe.record(end - start).
+    Counter sources (callables returning a dict) are reported next to the stages.
+    """
+
+    def __init__(self, window=STATS_WINDOW, report_interval=STATS_REPORT_INTERVAL_S):
+        self.window = window
+        self.report_interval = report_interval
+        self.probes = {}
+        self.counters = {}
+        self._last_report = time.monotonic()
+        self._server = None
+
+    def probe(self, name):
+        if name not in self.probes:
+            self.probes[name] = LatencyProbe(name, self.window)
+        return self.probes[name]
+
+    def add_counters(self, name, source):
+        """Reports source() (a dict of counters) under name, e.g. LidarStrategy.stats"""
+        self.counters[name] = source
+
+    def counter_summary(self):
+        return {name: source() for name, source in self.counters.items()}
+
+    def summary(self):
+        return {
+            name: stats
+            for name, stats in ((n, p.summary()) for n, p in self.probes.items())
+            if stats is not None
+        }
+
+    def format_summary(self):
+        lines = [f"{'stage':<12} {'count':>8} {'p50 ms':>8} {'p99 ms':>8} {'max ms':>8}"]
+        for name, s in self.summary().items():
+            lines.append(
+                f"{name:<12} {s['count']:>8} {s['p50_ms']:>8.3f} {s['p99_ms']:>8.3f} {s['max_ms']:>8.3f}"
+            )
+        for name, counters in self.counter_summary().items():
+            lines.append(f"{name:<12} " + " ".join(f"{k}={v}" for k, v in counters.items()))
+        return "\n".join(lines)
+
+    def maybe_report(self, now=None):
+        """Prints the summary once every report_interval seconds (0 = never)"""
+        if not self.report_interval:
+            return
+        if now is None:
+            now = time.monotonic()
+        if now - self._last_report >= self.report_interval:
+            self._last_report = now
+            print(f"[STATS]\n{self.format_summary()}")
+
+    def serve(self, port, host="127.0.0.1"):
+        """Serves the summary as JSON on http://host:port/ from a daemon thread"""
+        profiler = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                stats = {**profiler.summary(), **profiler.counter_summary()}
+                body = json.dumps(stats, indent=2).encode()
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass  # Keep the console for the rover output
+
+        self._server = ThreadingHTTPServer((host, port), Handler)
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+        print(f"[STATS] Serving on http://{host}:{port}/")
+
+    def close(self):
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
@@ -1,4 +1,62 @@
+import time
 from abc import ABC, abstractmethod
+from collections import namedtuple
+from types import MappingProxyType
+
+from src.constants import NO_READING_DIST_CM
+
+
+_NONE = MappingProxyType({})
+
+
+class SensorSnapshot(
+    namedtuple(
+        "SensorSnapshot",
+        ["seq", "timestamp", "distances", "confidence", "counts", "source"],
+        defaults=(_NONE, _NONE, ""),
+    )
+):
+    """
+    Immutable result of one sensor update, handed over by a single reference swap.
+    Every ObstacleStrategy returns this from check_path().
+    seq:        Increases with every update. 0 means nothing was received yet.
+    timestamp:  time.monotonic() when the underlying data was captured.
+    distances:  Read-only mapping {sector name: distance in cm}.
+    confidence: Read-only mapping {sector name: 0.0-1.0}, empty if unknown.
+    counts:     Read-only mapping {sector name: points behind the distance}.
+    source:     Which strategy produced it ("lidar", "camera", "fusion", ...).
+    """
+
+    __slots__ = ()
+
+    @classmethod
+    def create(cls, seq, timestamp, distances, confidence=(), counts=(), source=""):
+        return cls(
+            seq,
+            timestamp,
+            MappingProxyType(dict(distances)),
+            MappingProxyType(dict(confidence)),
+            MappingProxyType(dict(counts)),
+            source,
+        )
+
+    @property
+    def front(self):
+        return self.distances.get("FRONT", NO_READING_DIST_CM)
+
+    @property
+    def left(self):
+        return self.distances.get("LEFT", NO_READING_DIST_CM)
+
+    @property
+    def right(self):
+        return self.distances.get("RIGHT", NO_READING_DIST_CM)
+
+    def age(self, now=None):
+        """Seconds since the data was captured"""
+        if now is None:
+            now = time.monotonic()
+        return now - self.timestamp
 
 
 class ObstacleStrategy(ABC):
@@ -6,10 +64,24 @@ class ObstacleStrategy(ABC):
     def check_path(self):
         """
         Analyze the environment.
-        Returns tuple: (is_safe, front_dist, left_dist, right_dist)
+        Returns the latest SensorSnapshot. Compare its seq with the previous
+        call to find out whether anything new arrived.
         """
         pass
 
+    def wait_for_update(self, last_seq, timeout):
+        """
+        Blocks until check_path() returns a snapshot with a seq other than
+        last_seq, or until timeout (s) expires. Returns the latest snapshot.
+        Strategies that can signal new data should override this polling default.
+        """
+        deadline = time.monotonic() + timeout
+        snapshot = self.check_path()
+        while snapshot.seq == last_seq and time.monotonic() < deadline:
+            time.sleep(0.002)
+            snapshot = self.check_path()
+        return snapshot
+
     @abstractmethod
     def stop(self):
         """Release resources (close serial ports, cameras, etc.)"""
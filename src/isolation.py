@@ -0,0 +1,227 @@
+import multiprocessing as mp
+import threading
+import time
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from src.interfaces import ObstacleStrategy, SensorSnapshot
+from src.constants import (
+    SECTORS,
+    NO_READING_DIST_CM,
+    ISOLATE_SUPERVISE_PERIOD_S,
+    ISOLATE_HEARTBEAT_TIMEOUT_S,
+    ISOLATE_RESTART_DELAY_S,
+    ISOLATE_MAX_RESTARTS,
+    ISOLATE_READ_RETRIES,
+)
+
+
+def _layout(sectors):
+    """Shared memory record: seqlock, snapshot, child health, rover velocity"""
+    return np.dtype(
+        [
+            ("lock", "<u8"),  # Odd while the child writes the snapshot
+            ("seq", "<u8"),
+            ("timestamp", "<f8"),
+            ("distances", "<f8", (sectors,)),
+            ("confidence", "<f8", (sectors,)),
+            ("counts", "<i8", (sectors,)),
+            ("heartbeat", "<f8"),  # time.monotonic() of the child's last loop
+            ("exhausted", "<u8"),  # Replay source has no more data
+            ("v", "<f8"),  # Written by the parent for deskewing
+            ("omega", "<f8"),
+        ]
+    )
+
+
+def _record(shm, names):
+    return np.ndarray((), dtype=_layout(len(names)), buffer=shm.buf)
+
+
+def _child_main(factory, shm_name, names, use_motion, stop_event):
+    """
+    SENSOR PROCESS.
+    Runs the strategy and copies every new snapshot into shared memory.
+    """
+    shm = shared_memory.SharedMemory(name=shm_name)  # Owned (and unlinked) by the parent
+    rec = _record(shm, names)
+
+    kwargs = {}
+    if use_motion:
+        kwargs["motion"] = lambda: (float(rec["v"]), float(rec["omega"]))
+
+    strategy = factory(**kwargs)
+    last_seq = 0
+    try:
+        while not stop_event.is_set():
+            snapshot = strategy.wait_for_update(last_seq, 0.1)
+            rec["heartbeat"] = time.monotonic()
+            if getattr(strategy, "exhausted", False):
+                rec["exhausted"] = 1
+            if snapshot.seq == last_seq:
+                continue
+            last_seq = snapshot.seq
+
+            # Seqlock write: readers retry while lock is odd or has changed
+            rec["lock"] += 1
+            rec["seq"] = snapshot.seq
+            rec["timestamp"] = snapshot.timestamp
+            rec["distances"] = [snapshot.distances.get(n, NO_READING_DIST_CM) for n in names]
+            rec["confidence"] = [snapshot.confidence.get(n, 0.0) for n in names]
+            rec["counts"] = [snapshot.counts.get(n, 0) for n in names]
+            rec["lock"] += 1
+    except KeyboardInterrupt:
+        pass  # Ctrl+C reaches the whole process group, the parent shuts us down
+    finally:
+        strategy.stop()
+        del rec
+        shm.close()
+
+
+class IsolatedStrategy(ObstacleStrategy):
+    """
+    Runs a sensor strategy in its own process, away from the control loop's GIL.
+
+    factory: picklable callable building the strategy in the child
+             (e.g. functools.partial(LidarStrategy, port=...)). Called with
+             motion= only if motion is given, otherwise with no arguments.
+    motion:  optional callable returning (v, omega) in this process, handed
+             to the child for deskewing.
+    source:  source name put into the snapshots.
+
+    Snapshots come through shared memory guarded by a sequence lock, nothing
+    is pickled per update. A supervisor thread restarts a child that crashed
+    or stopped sending heartbeats; stop() shuts everything down.
+    """
+
+    def __init__(self, factory, motion=None, names=None, source=""):
+        self.factory = factory
+        self.source = source
+        self.motion = motion
+        self.names = tuple(names if names is not None else SECTORS)
+
+        self._ctx = mp.get_context("spawn")  # No forked copies of our threads
+        self._shm = shared_memory.SharedMemory(
+            create=True, size=_layout(len(self.names)).itemsize
+        )
+        self._rec = _record(self._shm, self.names)  # New shared memory is zeroed
+
+        # The child's seq restarts at 0 after a restart, ours keeps counting
+        self._child_seq = 0
+        self.snapshot = SensorSnapshot.create(
+            0,
+            time.monotonic(),
+            {name: NO_READING_DIST_CM for name in self.names},
+            source=source,
+        )
+
+        self.restarts = 0
+        self.running = True
+        self._stop_event = self._ctx.Event()
+        self._process = None
+        self._start_child()
+
+        self._supervisor = threading.Thread(target=self._supervise, daemon=True)
+        self._supervisor.start()
+
+    def _start_child(self):
+        self._stop_event.clear()
+        self._rec["heartbeat"] = time.monotonic()
+        self._rec["lock"] = 0  # A killed child may have died mid-write
+        self._rec["seq"] = 0
+        self._child_seq = 0
+        self._process = self._ctx.Process(
+            target=_child_main,
+            args=(
+                self.factory,
+                self._shm.name,
+                self.names,
+                self.motion is not None,
+                self._stop_event,
+            ),
+            daemon=True,
+        )
+        self._process.start()
+        print(f"[IsolatedStrategy] Sensor process started (pid {self._process.pid}).")
+
+    def _supervise(self):
+        """SUPERVISOR THREAD. Hands over the velocity and restarts a failed child."""
+        while self.running:
+            time.sleep(ISOLATE_SUPERVISE_PERIOD_S)
+            if self.motion is not None:
+                self._rec["v"], self._rec["omega"] = self.motion()
+
+            silent = time.monotonic() - float(self._rec["heartbeat"])
+            if self._process.is_alive() and silent < ISOLATE_HEARTBEAT_TIMEOUT_S:
+                continue
+            if not self.running:
+                break
+
+            if self.restarts >= ISOLATE_MAX_RESTARTS:
+                print("[IsolatedStrategy] Sensor process keeps failing, giving up.")
+                self._kill_child()
+                break
+
+            reason = "exited" if not self._process.is_alive() else f"silent for {silent:.1f}s"
+            print(f"[IsolatedStrategy] Sensor process {reason}, restarting.")
+            self._kill_child()
+            time.sleep(ISOLATE_RESTART_DELAY_S)
+            self.restarts += 1
+            if self.running:
+                self._start_child()
+
+    def _kill_child(self):
+        self._stop_event.set()
+        self._process.join(timeout=1.0)
+        if self._process.is_alive():
+            self._process.kill()
+            self._process.join()
+
+    def check_path(self):
+        rec = self._rec
+        for _ in range(ISOLATE_READ_RETRIES):
+            lock = int(rec["lock"])
+            if lock & 1:
+                time.sleep(0)  # Child is writing, a few microseconds
+                continue
+
+            child_seq = int(rec["seq"])
+            if child_seq == self._child_seq or child_seq == 0:
+                return self.snapshot  # Nothing new (or a restarted child without data)
+
+            timestamp = float(rec["timestamp"])
+            distances = rec["distances"].tolist()
+            confidence = rec["confidence"].tolist()
+            counts = rec["counts"].tolist()
+            if int(rec["lock"]) == lock:
+                break
+        else:
+            # Child hung or died mid-write: keep the last good snapshot, its
+            # timestamp ages and the controller's watchdog stops the rover
+            return self.snapshot
+
+        self._child_seq = child_seq
+        self.snapshot = SensorSnapshot.create(
+            self.snapshot.seq + 1,
+            timestamp,
+            zip(self.names, distances),
+            zip(self.names, confidence),
+            zip(self.names, counts),
+            source=self.source,
+        )
+        return self.snapshot
+
+    @property
+    def exhausted(self):
+        return bool(self._rec["exhausted"])
+
+    def stop(self):
+        self.running = False
+        self._supervisor.join(timeout=ISOLATE_RESTART_DELAY_S + 2.0)
+        self._kill_child()
+
+        del self._rec
+        self._shm.close()
+        self._shm.unlink()
+        print("[IsolatedStrategy] Sensor process stopped.")
@@ -0,0 +1,48 @@
+import numpy as np
+
+from src.lidar_only.scan_buffer import ScanSnapshot
+
+# Below these the rover counts as standing still and the scan is left as is
+_MIN_SPEED_CM_S = 0.5
+_MIN_TURN_RAD_S = 0.01
+
+
+def deskew(scan, v, omega):
+    """
+    Moves every point of a revolution into the rover frame at the time of its
+    newest point, assuming constant velocity during the revolution.
+    v: forward speed (cm/s), omega: turn rate (rad/s, counter-clockwise).
+    Returns a new ScanSnapshot (angles rover frame deg clockwise, distances cm),
+    the input scan itself if the rover did not move.
+    """
+    if abs(v) < _MIN_SPEED_CM_S and abs(omega) < _MIN_TURN_RAD_S:
+        return scan
+    if scan.timestamps.size == 0:
+        return scan
+
+    # Pose of the rover at every point's time, seen from the newest pose
+    dt = scan.timestamps - scan.timestamps[-1]  # <= 0
+    turn = omega * dt
+    half = turn * 0.5
+    px = v * dt * np.cos(half)
+    py = v * dt * np.sin(half)
+
+    # Point in its own frame (x forward, y left; sensor angles run clockwise)
+    theta = np.radians(scan.angles)
+    x = scan.distances * np.cos(theta)
+    y = -scan.distances * np.sin(theta)
+
+    cos = np.cos(turn)
+    sin = np.sin(turn)
+    xr = px + cos * x - sin * y
+    yr = py + sin * x + cos * y
+
+    angles = np.degrees(-np.arctan2(yr, xr)) % 360
+    distances = np.hypot(xr, yr)
+
+    # No return stays no return
+    missing = scan.distances <= 0
+    angles[missing] = scan.angles[missing]
+    distances[missing] = 0.0
+
+    return ScanSnapshot(scan.revolution, angles, distances, scan.timestamps)
@@ -1,119 +1,143 @@
-# --- LIDAR IMPLEMENTATION ---
 import threading
-from src.interfaces import ObstacleStrategy
+import time
+from src.interfaces import ObstacleStrategy, SensorSnapshot
 import serial
-import struct
+import numpy as np
 
+from src.lidar_only.packet_decoder import PacketDecoder
+from src.lidar_only.sector_table import SectorTable
+from src.lidar_only.scan_buffer import ScanBuffer
+from src.lidar_only.deskew import deskew
 from src.constants import (
     BAUD_RATE,
-    HEADER_BYTE_1,
-    HEADER_BYTE_2,
-    PACKET_SIZE,
-    PAYLOAD_SIZE,
-    POINTS_PER_PACKET,
-    ANGLE_DIVISOR,
-    MM_TO_CM,
-    LIDAR_OFFSET_DEG,
-    MAX_VALID_DIST_CM,
-    STOPPING_DIST_CM,
-    SECTOR_BOUNDARIES,
+    NO_READING_DIST_CM,
+    LIDAR_MIN_INTENSITY,
     DEFAULT_PORT,
+    PACKET_SIZE,
 )
 
 
 class LidarStrategy(ObstacleStrategy):
-    def __init__(self, port=None):
-        if port is None:
-            port = DEFAULT_PORT
-
-        self.ser = serial.Serial(port, BAUD_RATE, timeout=1)
-        self.front_dist = 999.0
-        self.left_dist = 999.0
-        self.right_dist = 999.0
+    """
+    motion: optional callable returning the rover velocity (v cm/s, omega rad/s),
+    e.g. from Odometry. With it every revolution is deskewed before use.
+    """
+
+    def __init__(self, port=None, ser=None, autostart=True, profiler=None, motion=None):
+        if ser is None:
+            if port is None:
+                port = DEFAULT_PORT
+            ser = serial.Serial(port, BAUD_RATE, timeout=1)
+
+        self.ser = ser
+        self._decode_probe = profiler.probe("decode") if profiler else None
+        self.decoder = PacketDecoder()
+        self.scan = ScanBuffer()
+        self.sectors = SectorTable()
+        self.motion = motion
+        self.latest_scan = None  # Newest revolution, deskewed if motion is known
+
+        # Replaced as a whole once per revolution, never modified in place
+        self._updated = threading.Condition()
+        self.snapshot = SensorSnapshot.create(
+            0,
+            time.monotonic(),
+            {name: NO_READING_DIST_CM for name in self.sectors.names},
+            source="lidar",
+        )
 
         self.running = False
         self.thread = threading.Thread(target=self._scan_loop, daemon=True)
-        self.start()
+        if autostart:
+            self.start()
 
     def start(self):
         self.running = True
         self.thread.start()
         print("[LidarStrategy] Background thread started.")
 
-    def _get_sector(self, angle):
-        """Returns 'FRONT', 'LEFT', 'RIGHT', or None"""
-        if (
-            angle >= SECTOR_BOUNDARIES["FRONT_START"]
-            or angle < SECTOR_BOUNDARIES["FRONT_END"]
-        ):
-            return "FRONT"
-        elif SECTOR_BOUNDARIES["LEFT_START"] <= angle < SECTOR_BOUNDARIES["LEFT_END"]:
-            return "LEFT"
-        elif SECTOR_BOUNDARIES["RIGHT_START"] <= angle < SECTOR_BOUNDARIES["RIGHT_END"]:
-            return "RIGHT"
-        return None
-
     def _scan_loop(self):
         """
         THE BACKGROUND WORKER.
         This runs forever in a separate thread.
-        It constantly updates self.front_dist, self.left_dist, etc.
+        It reads everything the serial port has buffered in one call
+        and hands it to the bulk decoder. Sector distances are refreshed
+        each time a revolution completes.
         """
         # 1. Flush Buffer
         self.ser.reset_input_buffer()
 
         while self.running:
-            if self.ser.in_waiting > PACKET_SIZE:
-                if (
-                    self.ser.read() == HEADER_BYTE_1
-                    and self.ser.read() == HEADER_BYTE_2
-                ):
-                    data = self.ser.read(PAYLOAD_SIZE)
-                    if len(data) != PAYLOAD_SIZE:
-                        continue
-
-                    # Decode Angles
-                    start_angle = struct.unpack("<H", data[2:4])[0] / ANGLE_DIVISOR
-                    end_angle = struct.unpack("<H", data[40:42])[0] / ANGLE_DIVISOR
-                    if end_angle < start_angle:
-                        end_angle += 360
-                    step = (end_angle - start_angle) / (POINTS_PER_PACKET - 1)
-
-                    # Process Points
-                    for i in range(POINTS_PER_PACKET):
-                        raw_dist_pos = 4 + (i * 3)
-                        dist_mm = struct.unpack(
-                            "<H", data[raw_dist_pos : raw_dist_pos + 2]
-                        )[0]
-                        dist_cm = dist_mm / MM_TO_CM
-
-                        raw_angle = start_angle + (i * step)
-                        corrected_angle = (raw_angle + LIDAR_OFFSET_DEG) % 360
-
-                        sector = self._get_sector(corrected_angle)
-
-                        if 0 < dist_cm < MAX_VALID_DIST_CM:
-                            if sector == "FRONT":
-                                if dist_cm < self.front_dist:
-                                    self.front_dist = dist_cm
-                                else:
-                                    self.front_dist += 1  # if I don't see the obstacle anymore, it might be gone and stop halucinating?
-                            elif sector == "LEFT":
-                                if dist_cm < self.left_dist:
-                                    self.left_dist = dist_cm
-                                else:
-                                    self.left_dist += 1
-                            elif sector == "RIGHT":
-                                if dist_cm < self.right_dist:
-                                    self.right_dist = dist_cm
-                                else:
-                                    self.right_dist += 1
+            # Blocks (up to the port timeout) until at least a full packet
+            # arrived, so a read never returns just a byte or two
+            data = self.ser.read(max(PACKET_SIZE, self.ser.in_waiting))
+            if data:
+                self.feed(data)
+
+    def feed(self, data, now=None):
+        """
+        Decodes a chunk of raw serial bytes into the scan buffer and publishes
+        a snapshot for every completed revolution. The scan thread calls this,
+        replays and benchmarks without a serial port call it directly
+        (autostart=False). now: arrival time, defaults to time.monotonic().
+        Returns the number of points decoded.
+        """
+        if now is None:
+            now = time.monotonic()
+        start_ns = time.perf_counter_ns()
+
+        points = self.decoder.feed(data)
+        # Weak returns are unreliable (dark or glancing surfaces): no return
+        distances = np.where(points.intensities >= LIDAR_MIN_INTENSITY, points.distances, 0.0)
+        scan = self.scan.push(points.angles, distances, now - points.delays)
+        if scan is not None:
+            if self.motion is not None:
+                scan = deskew(scan, *self.motion())
+            self.latest_scan = scan
+            closest, confidence, counts = self.sectors.reduce(scan.angles, scan.distances)
+            names = self.sectors.names
+            snapshot = SensorSnapshot.create(
+                self.snapshot.seq + 1,
+                float(scan.timestamps[-1]) if scan.timestamps.size else now,
+                zip(names, closest.tolist()),
+                zip(names, confidence.tolist()),
+                zip(names, counts.tolist()),
+                source="lidar",
+            )
+            with self._updated:
+                self.snapshot = snapshot
+                self._updated.notify_all()
+
+        if self._decode_probe is not None:
+            self._decode_probe.record(time.perf_counter_ns() - start_ns)
+        return points.angles.size
 
     def check_path(self):
-        return self.front_dist, self.left_dist, self.right_dist
+        return self.snapshot
+
+    def wait_for_update(self, last_seq, timeout):
+        """Sleeps until the scan thread publishes a new revolution (or timeout)"""
+        with self._updated:
+            self._updated.wait_for(lambda: self.snapshot.seq != last_seq, timeout)
+            return self.snapshot
+
+    @property
+    def exhausted(self):
+        """True once a replay source has delivered everything (never for a real port)"""
+        return getattr(self.ser, "exhausted", False)
+
+    def stats(self):
+        """Packet integrity counters of the decoder (good, bad, dropped, skipped bytes)"""
+        return self.decoder.stats()
+
+    def get_scan(self):
+        """Latest full revolution as a ScanSnapshot (None until the first), do not modify"""
+        return self.latest_scan
 
     def stop(self):
         self.running = False
-        self.thread.join(timeout=1.0)
+        if self.thread.is_alive():
+            self.thread.join(timeout=1.0)
         self.ser.close()
         print("[LidarStrategy] Thread stopped and port closed.")
+        print(f"[LidarStrategy] Packets: {self.stats()}")
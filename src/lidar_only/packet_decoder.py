@@ -0,0 +1,243 @@
+from collections import namedtuple
+
+import numpy as np
+
+from src.constants import (
+    HEADER_BYTE_1,
+    HEADER_BYTE_2,
+    PACKET_SIZE,
+    POINTS_PER_PACKET,
+    ANGLE_DIVISOR,
+    MM_TO_CM,
+    LIDAR_OFFSET_DEG,
+    LIDAR_CRC_POLY,
+)
+
+# LD06/LD19 packet layout (little endian, 47 bytes incl. header):
+# header(1) ver_len(1) speed(2) start_angle(2) 12 x [dist(2) intensity(1)]
+# end_angle(2) timestamp(2) crc(1)
+PACKET_DTYPE = np.dtype(
+    [
+        ("header", "u1"),
+        ("ver_len", "u1"),
+        ("speed", "<u2"),
+        ("start_angle", "<u2"),
+        ("points", [("dist", "<u2"), ("intensity", "u1")], (POINTS_PER_PACKET,)),
+        ("end_angle", "<u2"),
+        ("timestamp", "<u2"),
+        ("crc", "u1"),
+    ]
+)
+assert PACKET_DTYPE.itemsize == PACKET_SIZE
+
+def _crc_table(poly):
+    table = np.zeros(256, dtype=np.uint8)
+    for i in range(256):
+        crc = i
+        for _ in range(8):
+            crc = ((crc << 1) ^ poly) & 0xFF if crc & 0x80 else (crc << 1) & 0xFF
+        table[i] = crc
+    return table
+
+
+# CRC-8 of the LD06/LD19 (poly 0x4D, init 0) over all bytes but the last
+CRC_TABLE = _crc_table(LIDAR_CRC_POLY)
+
+
+def _position_table(length):
+    """
+    With init 0 the CRC is linear: the CRC of a message is the XOR of the
+    CRCs of each of its bytes alone at its position. Row k holds those for
+    every value of byte k of a `length` byte message.
+    """
+    table = np.empty((length, 256), dtype=np.uint8)
+    crc = CRC_TABLE.copy()  # Byte value alone as the last byte
+    for k in range(length - 1, -1, -1):
+        table[k] = crc
+        crc = CRC_TABLE[crc]  # One more zero byte after it
+    return table
+
+
+# Flat, so a packet's bytes index it directly: byte + 256 * position
+_CRC_POSITIONS = _position_table(PACKET_SIZE - 1).ravel()
+_CRC_OFFSETS = (np.arange(PACKET_SIZE - 1) * 256).astype(np.uint16)
+
+_HEADER_1 = HEADER_BYTE_1[0]
+_HEADER_2 = HEADER_BYTE_2[0]
+_PACKET_INDEX = np.arange(PACKET_SIZE)
+_POINT_INDEX = np.arange(POINTS_PER_PACKET)
+
+# delays: seconds each point was measured before the last point of the batch
+# intensities: return strength 0-255 as reported by the sensor
+PointBatch = namedtuple("PointBatch", ["angles", "distances", "delays", "intensities"])
+
+_EMPTY = PointBatch(np.empty(0), np.empty(0), np.empty(0), np.empty(0, dtype=np.uint8))
+
+
+class PacketDecoder:
+    """
+    Bulk decoder for the LD06/LD19 serial stream.
+    feed() takes whatever bytes were buffered, finds every 0x54 0x2C frame
+    in the chunk and decodes all complete packets at once.
+    Bytes of a packet that is not complete yet are kept for the next call.
+
+    Every candidate is CRC checked, a failed one resyncs at the next header
+    inside the same chunk. Counters for monitoring:
+    good:    packets decoded
+    bad:     corrupted packets (CRC mismatch)
+    dropped: packets cut short, the next packet started inside them
+    skipped: bytes that were not part of a good packet
+    """
+
+    def __init__(self, check_crc=True):
+        self.check_crc = check_crc
+        self._pending = b""
+        self.good = 0
+        self.bad = 0
+        self.dropped = 0
+        self.skipped = 0
+
+    def stats(self):
+        return {"good": self.good, "bad": self.bad, "dropped": self.dropped, "skipped_bytes": self.skipped}
+
+    def feed(self, data):
+        """
+        Returns a PointBatch of corrected angles (deg), distances (cm),
+        delays (s before the newest point) and intensities, one entry per
+        point, in the order they were measured.
+        """
+        buf = self._pending + data if self._pending else data
+        raw = np.frombuffer(buf, dtype=np.uint8)
+
+        starts, frames, next_free = self._find_packets(raw)
+
+        # Keep only the tail that could still hold the start of a packet
+        keep = max(next_free, len(buf) - PACKET_SIZE + 1, 0)
+        self._pending = bytes(buf[keep:])
+        self.good += len(starts)
+        self.skipped += keep - len(starts) * PACKET_SIZE
+
+        if len(starts) == 0:
+            return _EMPTY
+        return decode_packets(frames.view(PACKET_DTYPE).reshape(-1))
+
+    def _find_packets(self, raw):
+        """Returns (start offsets of good packets, their bytes, first unconsumed byte)"""
+        if raw.size < PACKET_SIZE:
+            return np.empty(0, dtype=np.intp), None, 0
+
+        # Header byte 1 first, then byte 2 only at those few positions
+        candidates = (raw[: raw.size - PACKET_SIZE + 1] == _HEADER_1).nonzero()[0]
+        candidates = candidates[raw[candidates + 1] == _HEADER_2]
+        if candidates.size == 0:
+            return candidates, None, 0
+        frames = raw[candidates[:, None] + _PACKET_INDEX]
+
+        if self.check_crc:
+            ok = crc8(frames[:, :-1]) == frames[:, -1]
+        else:
+            ok = np.ones(len(candidates), dtype=bool)
+
+        # Clean stream: every candidate is a good packet right after the last
+        if ok.all() and (candidates.size == 1 or (candidates[1:] - candidates[:-1]).min() >= PACKET_SIZE):
+            return candidates, frames, int(candidates[-1]) + PACKET_SIZE
+
+        # A header pattern inside a payload must not start a second packet:
+        # good packets are taken in order, one starting inside another is not
+        good = candidates[ok]
+        if np.all(np.diff(good) >= PACKET_SIZE):
+            accepted = good
+        else:
+            # Rare (a payload pattern that passes the CRC): resolve greedily
+            kept = []
+            next_free = 0
+            for pos in good.tolist():
+                if pos >= next_free:
+                    kept.append(pos)
+                    next_free = pos + PACKET_SIZE
+            accepted = np.array(kept, dtype=candidates.dtype)
+
+        # Candidates inside an accepted packet are payload, not packets
+        if accepted.size:
+            owner = accepted[np.maximum(np.searchsorted(accepted, candidates, side="right") - 1, 0)]
+            inside = (candidates >= owner) & (candidates < owner + PACKET_SIZE)
+            is_accepted = candidates == owner
+        else:
+            inside = is_accepted = np.zeros(len(candidates), dtype=bool)
+
+        # A failed candidate resyncs at the next header. It was cut short if
+        # a good packet starts inside it, otherwise it is corrupted.
+        failed = ~ok & ~inside
+        next_good = np.zeros(len(candidates), dtype=bool)
+        next_good[:-1] = (candidates[1:] < candidates[:-1] + PACKET_SIZE) & ok[1:]
+        self.dropped += int(np.count_nonzero(failed & next_good))
+        self.bad += int(np.count_nonzero(failed & ~next_good))
+
+        next_free = int(accepted[-1]) + PACKET_SIZE if accepted.size else 0
+        return accepted, frames[is_accepted], next_free
+
+
+def crc8(data):
+    """CRC-8 of every row of a (N, M) uint8 array, all rows at once"""
+    if data.shape[1] == len(_CRC_OFFSETS):
+        # Packet sized rows: one gather of the per-position table, XOR across
+        return np.bitwise_xor.reduce(_CRC_POSITIONS[data + _CRC_OFFSETS], axis=1)
+
+    crc = np.zeros(len(data), dtype=np.uint8)
+    for col in range(data.shape[1]):
+        crc = CRC_TABLE[crc ^ data[:, col]]
+    return crc
+
+
+def decode_packets(packets):
+    """
+    Vectorized decode of a PACKET_DTYPE array into a PointBatch.
+    Angles are interpolated between start and end angle of every packet
+    and rotated by LIDAR_OFFSET_DEG into the rover frame.
+    Delays follow from the angle still to sweep until the newest point
+    and the rotation speed (deg/s) each packet reports.
+    """
+    start_angle = packets["start_angle"] / ANGLE_DIVISOR
+    span = (packets["end_angle"] / ANGLE_DIVISOR - start_angle) % 360
+
+    # Unwrap the packet starts across the 360 -> 0 wrap (per packet, not per
+    # point), so the sweep only grows and needs no modulo
+    for wrap in (start_angle[1:] < start_angle[:-1]).nonzero()[0].tolist():
+        start_angle[wrap + 1 :] += 360
+    sweep = start_angle[:, None] + (span / (POINTS_PER_PACKET - 1))[:, None] * _POINT_INDEX
+
+    angles = (sweep + LIDAR_OFFSET_DEG) % 360
+    distances = packets["points"]["dist"] / MM_TO_CM
+
+    speed = packets["speed"]
+    if speed.all():
+        per_deg = 1.0 / speed
+    else:
+        # A stalled motor reports 0 deg/s, no delay estimate then
+        per_deg = np.divide(1.0, speed, out=np.zeros(len(speed)), where=speed > 0)
+    delays = (sweep[-1, -1] - sweep) * per_deg[:, None]
+
+    return PointBatch(angles.ravel(), distances.ravel(), delays.ravel(), packets["points"]["intensity"].ravel())
+
+
+def encode_packets(start_angles, end_angles, distances_mm, speed=3600, intensities=200):
+    """
+    Builds a raw byte stream from per-packet values (inverse of feed()).
+    start_angles/end_angles: raw sensor degrees, shape (N,)
+    distances_mm: shape (N, POINTS_PER_PACKET)
+    intensities: scalar or shape (N, POINTS_PER_PACKET)
+    Used for benchmarks and replays when no recorded stream is available.
+    """
+    distances_mm = np.asarray(distances_mm)
+    packets = np.zeros(len(distances_mm), dtype=PACKET_DTYPE)
+    packets["header"] = _HEADER_1
+    packets["ver_len"] = _HEADER_2
+    packets["speed"] = speed
+    packets["start_angle"] = np.round(np.asarray(start_angles) * ANGLE_DIVISOR) % 36000
+    packets["end_angle"] = np.round(np.asarray(end_angles) * ANGLE_DIVISOR) % 36000
+    packets["points"]["dist"] = np.clip(distances_mm, 0, 0xFFFF)
+    packets["points"]["intensity"] = intensities
+
+    raw = packets.view(np.uint8).reshape(-1, PACKET_SIZE)
+    packets["crc"] = crc8(raw[:, :-1])
+    return packets.tobytes()
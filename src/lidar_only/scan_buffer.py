@@ -0,0 +1,99 @@
+from collections import namedtuple
+
+import numpy as np
+
+from src.constants import LIDAR_OFFSET_DEG, SCAN_BUFFER_CAPACITY, SCAN_BUFFER_SLOTS
+
+ScanSnapshot = namedtuple(
+    "ScanSnapshot", ["revolution", "angles", "distances", "timestamps"]
+)
+
+
+class ScanBuffer:
+    """
+    Collects decoded points into preallocated per-revolution slots.
+
+    When the sensor wraps around, the filled slot is published as a read-only
+    ScanSnapshot (a single reference swap) and writing moves on to the next
+    slot. Readers never block the decoder and never see a half written scan.
+    A snapshot stays valid until its slot comes around again, i.e. for
+    slots - 1 further revolutions; copy it if you need to keep it longer.
+    """
+
+    def __init__(
+        self,
+        capacity=SCAN_BUFFER_CAPACITY,
+        slots=SCAN_BUFFER_SLOTS,
+        split_deg=LIDAR_OFFSET_DEG,
+    ):
+        self.capacity = capacity
+        self.split_deg = split_deg
+
+        self._angles = np.zeros((slots, capacity))
+        self._distances = np.zeros((slots, capacity))
+        self._timestamps = np.zeros((slots, capacity))
+
+        self._slot = 0
+        self._count = 0
+        self._last_rel = None  # Sensor angle of the previous point
+        self._synced = False  # Drop the partial revolution at startup
+        self.revolutions = 0
+        self.latest = None
+
+    def push(self, angles, distances, timestamp):
+        """
+        Appends a batch of points measured at `timestamp` (scalar or per point).
+        Returns the newest completed ScanSnapshot, or None.
+        """
+        if angles.size == 0:
+            return None
+
+        # Angle relative to the sensor's own zero, it wraps once per revolution
+        rel = (angles - self.split_deg) % 360
+        prev = rel[0] if self._last_rel is None else self._last_rel
+        steps = np.empty_like(rel)
+        steps[0] = rel[0] - prev
+        np.subtract(rel[1:], rel[:-1], out=steps[1:])
+        wraps = (steps < -180).nonzero()[0]
+        self._last_rel = rel[-1]
+
+        timestamps = np.broadcast_to(timestamp, angles.shape) if np.ndim(timestamp) == 0 else timestamp
+        published = None
+        start = 0
+        for end in wraps.tolist() + [angles.size]:
+            if end > start and self._synced:
+                self._append(angles[start:end], distances[start:end], timestamps[start:end])
+            if end < angles.size:
+                if self._synced:
+                    published = self._publish()
+                self._synced = True
+            start = end
+
+        return published
+
+    def _append(self, angles, distances, timestamps):
+        n = angles.size
+        if self._count + n > self.capacity:
+            # Sensor slowed down or lost sync, do not overrun the slot
+            n = self.capacity - self._count
+
+        end = self._count + n
+        self._angles[self._slot, self._count : end] = angles[:n]
+        self._distances[self._slot, self._count : end] = distances[:n]
+        self._timestamps[self._slot, self._count : end] = timestamps[:n]
+        self._count = end
+
+    def _publish(self):
+        n = self._count
+        views = []
+        for arr in (self._angles, self._distances, self._timestamps):
+            view = arr[self._slot, :n]
+            view.flags.writeable = False
+            views.append(view)
+
+        self.revolutions += 1
+        self.latest = ScanSnapshot(self.revolutions, *views)
+
+        self._slot = (self._slot + 1) % len(self._angles)
+        self._count = 0
+        return self.latest
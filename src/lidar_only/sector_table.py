@@ -0,0 +1,91 @@
+import numpy as np
+
+from src.constants import (
+    SECTORS,
+    SECTOR_RESOLUTION_DEG,
+    SECTOR_TRIM_POINTS,
+    SECTOR_PERCENTILE,
+    SECTOR_MIN_POINTS,
+    MAX_VALID_DIST_CM,
+    NO_READING_DIST_CM,
+)
+
+NO_SECTOR = -1
+
+
+class SectorTable:
+    """
+    Compiles the SECTORS definition into a dense angle -> sector index table.
+    Looking up the sectors of a whole packet is then one indexed gather,
+    no matter how many sectors are defined.
+    """
+
+    def __init__(self, sectors=None, resolution=SECTOR_RESOLUTION_DEG):
+        if sectors is None:
+            sectors = SECTORS
+
+        self.names = tuple(sectors)
+        self.index = {name: i for i, name in enumerate(self.names)}
+        self.resolution = resolution
+        self._scale = 1.0 / resolution
+
+        bins = int(round(360 / resolution))
+        self.lut = np.full(bins, NO_SECTOR, dtype=np.int16)
+
+        # Paint in reverse so that earlier sectors win where they overlap
+        for i in reversed(range(len(self.names))):
+            start, end = sectors[self.names[i]]
+            start_bin = int(round((start % 360) * self._scale))
+            end_bin = int(round((end % 360) * self._scale))
+            if start_bin < end_bin:
+                self.lut[start_bin:end_bin] = i
+            else:
+                # Wraps past 0 deg
+                self.lut[start_bin:] = i
+                self.lut[:end_bin] = i
+
+        self.lut.flags.writeable = False
+
+        # Share of the full circle covered by every sector
+        self.coverage = np.bincount(self.lut[self.lut >= 0], minlength=len(self.names)) / bins
+
+    def __len__(self):
+        return len(self.names)
+
+    def lookup(self, angles):
+        """Sector index for every angle (deg, 0 <= a < 360), NO_SECTOR if none"""
+        bins = (angles * self._scale).astype(np.intp)
+        np.minimum(bins, self.lut.size - 1, out=bins)
+        return self.lut[bins]
+
+    def reduce(self, angles, distances):
+        """
+        Robust closest distance of every sector over one full revolution:
+        the k-th closest valid point (see SECTOR_TRIM_POINTS / SECTOR_PERCENTILE).
+        Returns (distances, confidence, point counts), one entry per sector.
+        Confidence is the share of the points expected in the sector that returned.
+        """
+        valid = (distances > 0) & (distances < MAX_VALID_DIST_CM)
+        idx = self.lookup(angles[valid])
+        dists = distances[valid]
+
+        hit = idx >= 0
+        idx = idx[hit]
+        dists = dists[hit]
+
+        # Sort by sector, then by distance: every sector is one ascending run
+        order = np.lexsort((dists, idx))
+        dists = dists[order]
+        counts = np.bincount(idx, minlength=len(self))
+        first = np.cumsum(counts) - counts
+
+        rank = np.ceil(counts * (SECTOR_PERCENTILE / 100.0)).astype(np.intp) - 1
+        rank = np.minimum(np.maximum(rank, SECTOR_TRIM_POINTS), counts - 1)
+
+        enough = counts >= max(SECTOR_MIN_POINTS, 1)
+        closest = np.full(len(self), NO_READING_DIST_CM)
+        closest[enough] = dists[(first + rank)[enough]]
+
+        expected = self.coverage * distances.size
+        confidence = np.minimum(counts / np.maximum(expected, 1.0), 1.0)
+        return closest, confidence, counts
@@ -0,0 +1,288 @@
+import glob
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+from src.constants import (
+    LOG_DIR,
+    CRITICAL_DIST_CM,
+    ACTION_ESCAPE,
+    LOG_CACHE_DIR,
+    LOG_KEYFRAME_S,
+    CONTROL_PERIOD_S,
+)
+
+# Column names of the raw CSV layout written by ThesisLogger
+CSV_COLUMNS = ["Time", "Mode", "Front", "Left", "Right", "Action", "Notes"]
+
+# Older logs used other names for the avoidance maneuver
+ESCAPE_ACTIONS = [ACTION_ESCAPE, "AVOIDING", "TURNED"]
+
+_NUMERIC = ["Time_s", "Front", "Left", "Right", "SpeedL", "SpeedR", "Age_ms", "Loop_Hz"]
+
+# Bump when the parsed columns change, older cache files are then ignored
+_CACHE_VERSION = 2
+
+
+def list_logs(log_dir=LOG_DIR):
+    """All .csv and .bin logs, oldest first (by the timestamp in the name)"""
+    files = glob.glob(os.path.join(log_dir, "rover_log_*.csv"))
+    files += glob.glob(os.path.join(log_dir, "rover_log_*.bin"))
+    # A converted .bin has a .csv twin, keep only the binary original
+    stems = {os.path.splitext(f)[0] for f in files if f.endswith(".bin")}
+    files = [f for f in files if f.endswith(".bin") or os.path.splitext(f)[0] not in stems]
+    return sorted(files, key=lambda f: os.path.basename(f)[-19:])
+
+
+def run_name(filename):
+    return os.path.splitext(os.path.basename(filename))[0]
+
+
+def run_mode(filename):
+    # rover_log_<mode>_<YYYYmmdd>_<HHMMSS>
+    return run_name(filename).split("_")[2]
+
+
+def _parse_csv_frames(frames):
+    """
+    One vectorized pass over the raw CSV rows of several runs:
+    timestamps, distances and the motor speeds hidden in the Notes column.
+    """
+    raw = pd.concat(frames, ignore_index=True)
+    df = pd.DataFrame({"Run": raw["Run"], "Mode": raw["Mode"], "Action": raw["Action"]})
+
+    hms = raw["Time"].astype(str).str.extract(r"(\d+):(\d+):([\d.]+)").astype(float)
+    df["Time_s"] = hms[0] * 3600 + hms[1] * 60 + hms[2]
+
+    for col in ["Front", "Left", "Right"]:
+        df[col] = pd.to_numeric(raw[col], errors="coerce")
+
+    notes = raw["Notes"].astype(str)
+    speeds = notes.str.extract(r"L=(-?[\d.]+) R=(-?[\d.]+)").astype(float)
+    legacy = notes.str.extract(r"Speed=(-?[\d.]+)")[0].astype(float)  # Pre-differential logs
+    df["SpeedL"] = speeds[0].fillna(legacy)
+    df["SpeedR"] = speeds[1].fillna(legacy)
+    df["Age_ms"] = notes.str.extract(r"Age=([\d.]+)ms")[0].astype(float)
+    df["Loop_Hz"] = notes.str.extract(r"Hz=([\d.]+)")[0].astype(float)  # NaN before it was logged
+    return df
+
+
+def _load_binary(filename):
+    from src.logger import read_binary_log, ACTIONS
+
+    mode, wall_offset, records = read_binary_log(filename)
+    t = records["t"].astype(float)
+
+    # Local time of day like the CSV timestamps, anchored at the first record
+    t0 = t[0] if t.size else 0.0
+    start = time.localtime(wall_offset + t0)
+    start_s = start.tm_hour * 3600 + start.tm_min * 60 + start.tm_sec
+    start_s += (wall_offset + t0) % 1
+
+    return pd.DataFrame(
+        {
+            "Run": run_name(filename),
+            "Mode": mode,
+            "Action": np.array(ACTIONS, dtype=object)[records["action"]],
+            "Time_s": start_s + (t - t0),
+            "Front": records["front"].astype(float),
+            "Left": records["left"].astype(float),
+            "Right": records["right"].astype(float),
+            "SpeedL": records["left_motor"].astype(float),
+            "SpeedR": records["right_motor"].astype(float),
+            "Age_ms": records["data_age"] * 1000.0,
+            "Loop_Hz": np.where(records["rate"] > 0, records["rate"], np.nan),
+        }
+    )
+
+
+def _finish(df):
+    """Time relative to the run start (handles runs past midnight)"""
+    start = df.groupby("Run", sort=False)["Time_s"].transform("first")
+    rel = df["Time_s"] - start
+    df["t"] = rel.where(rel >= -43200, rel + 86400)
+    return df
+
+
+def _cache_path(filename, cache_dir):
+    st = os.stat(filename)
+    return os.path.join(cache_dir, f"{run_name(filename)}_{st.st_size}_{int(st.st_mtime)}_v{_CACHE_VERSION}.npz")
+
+
+def _save_cache(df, path):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    np.savez(
+        path,
+        Action=df["Action"].to_numpy(dtype=str),
+        Mode=df["Mode"].iloc[0] if len(df) else "",
+        **{col: df[col].to_numpy(dtype=float) for col in _NUMERIC + ["t"]},
+    )
+
+
+def _read_cache(path, filename):
+    with np.load(path) as data:
+        df = pd.DataFrame({col: data[col] for col in _NUMERIC + ["t"]})
+        df.insert(0, "Action", data["Action"].astype(object))
+        df.insert(0, "Mode", str(data["Mode"]))
+    df.insert(0, "Run", run_name(filename))
+    return df
+
+
+def load_logs(files=None, log_dir=LOG_DIR, cache_dir=LOG_CACHE_DIR):
+    """
+    Loads every run into one DataFrame with the columns
+    Run, Mode, Action, Time_s, Front, Left, Right, SpeedL, SpeedR, Age_ms, Loop_Hz, t.
+    Loop_Hz is the control loop rate the rover logged (NaN in older logs).
+    Parsed runs are cached as columnar .npz files in cache_dir (None = no cache),
+    only new or changed logs are parsed again, all of them in one pass.
+    """
+    if files is None:
+        files = list_logs(log_dir)
+
+    parsed = {}
+    todo = []
+    for f in files:
+        path = _cache_path(f, cache_dir) if cache_dir else None
+        if path and os.path.exists(path):
+            parsed[f] = _read_cache(path, f)
+        elif f.endswith(".bin"):
+            parsed[f] = _finish(_load_binary(f))
+        else:
+            todo.append(f)
+
+    if todo:
+        frames = []
+        for f in todo:
+            raw = pd.read_csv(f, names=CSV_COLUMNS, skiprows=1, dtype=str)
+            raw["Run"] = run_name(f)
+            raw["Mode"] = run_mode(f)
+            frames.append(raw)
+        df = _finish(_parse_csv_frames(frames))
+        groups = dict(tuple(df.groupby("Run", sort=False)))
+        for f in todo:
+            parsed[f] = groups.get(run_name(f), df.iloc[:0]).reset_index(drop=True)
+
+    if cache_dir:
+        for f in files:
+            path = _cache_path(f, cache_dir)
+            if not os.path.exists(path):
+                _save_cache(parsed[f], path)
+
+    if not parsed:
+        return pd.DataFrame(columns=["Run", "Mode", "Action"] + _NUMERIC + ["t"])
+    return pd.concat([parsed[f] for f in files], ignore_index=True)
+
+
+def load_log(filename, cache_dir=LOG_CACHE_DIR):
+    return load_logs([filename], cache_dir=cache_dir)
+
+
+def expand(df, rate_hz=1.0 / CONTROL_PERIOD_S, max_hold_s=1.5 * LOG_KEYFRAME_S):
+    """
+    Fixed rate series from (delta) logs: every run sampled every 1 / rate_hz
+    seconds of t, each sample holding the newest row logged at or before it.
+    Samples more than max_hold_s after their row are left out: a delta log
+    writes a keyframe at least every LOG_KEYFRAME_S, so a longer gap means
+    the logger stopped or dropped rows, not that nothing changed.
+    """
+    frames = []
+    for _, run in df.groupby("Run", sort=False):
+        t = run["t"].to_numpy(dtype=float)
+        if not t.size:
+            continue
+        grid = np.arange(0.0, t[-1] + 1e-9, 1.0 / rate_hz)
+        rows = np.searchsorted(t, grid, side="right") - 1
+        keep = rows >= 0
+        keep[keep] = grid[keep] - t[rows[keep]] <= max_hold_s
+
+        out = run.iloc[rows[keep]].reset_index(drop=True)
+        out["Time_s"] = out["Time_s"] + (grid[keep] - out["t"].to_numpy())
+        out["t"] = grid[keep]
+        frames.append(out)
+
+    if not frames:
+        return df.iloc[:0]
+    return pd.concat(frames, ignore_index=True)
+
+
+def loop_intervals_ms(df):
+    """Time between consecutive rows of the same run (ms)"""
+    return df.groupby("Run", sort=False)["t"].diff() * 1000.0
+
+
+def loop_rate_stats(df):
+    """
+    Per run: rows, duration, average row rate and interval percentiles, and
+    the mean / minimum control loop rate the rover logged (NaN in older logs)
+    """
+    dt = loop_intervals_ms(df)
+    valid = dt.where((dt > 0) & (dt < 500))  # Same filter as the latency plot
+    grouped = valid.groupby(df["Run"], sort=False)
+    runs = df.groupby("Run", sort=False)
+
+    stats = pd.DataFrame(
+        {
+            "Rows": runs.size(),
+            "Duration_s": runs["t"].max(),
+            "Interval_p50_ms": grouped.median(),
+            "Interval_p99_ms": grouped.quantile(0.99),
+        }
+    )
+    stats["Rate_Hz"] = stats["Rows"] / stats["Duration_s"].where(stats["Duration_s"] > 0)
+    stats["Loop_Hz_mean"] = runs["Loop_Hz"].mean()
+    stats["Loop_Hz_min"] = runs["Loop_Hz"].min()
+    return stats
+
+
+def escape_starts(df):
+    """Boolean mask of the rows where an escape maneuver begins"""
+    escaping = df["Action"].isin(ESCAPE_ACTIONS)
+    critical = (df["Front"] < CRITICAL_DIST_CM) | escaping
+    prev = critical.groupby(df["Run"], sort=False).shift(1, fill_value=False)
+    return critical & ~prev.astype(bool)
+
+
+def stop_event_stats(df):
+    """Per run: escape maneuvers and the closest front distance"""
+    starts = escape_starts(df)
+    runs = df.groupby("Run", sort=False)
+    return pd.DataFrame(
+        {
+            "Escapes": starts.groupby(df["Run"], sort=False).sum(),
+            "Min_Front_cm": runs["Front"].min(),
+            "Min_Side_cm": runs[["Left", "Right"]].min().min(axis=1),
+        }
+    )
+
+
+def steering_stats(df):
+    """Per run: mean speed and how much / how often the rover steered"""
+    turn = (df["SpeedL"] - df["SpeedR"]) / 2.0
+    speed = (df["SpeedL"] + df["SpeedR"]) / 2.0
+    run = df["Run"]
+    return pd.DataFrame(
+        {
+            "Mean_Speed": speed.groupby(run, sort=False).mean(),
+            "Mean_Abs_Turn": turn.abs().groupby(run, sort=False).mean(),
+            "Max_Abs_Turn": turn.abs().groupby(run, sort=False).max(),
+            "Turning_Share": (turn.abs() > 0.01).groupby(run, sort=False).mean(),
+        }
+    )
+
+
+def run_summary(df):
+    """All per-run statistics side by side"""
+    modes = df.groupby("Run", sort=False)["Mode"].first()
+    return pd.concat(
+        [modes, loop_rate_stats(df), stop_event_stats(df), steering_stats(df)], axis=1
+    )
+
+
+if __name__ == "__main__":
+    # python -m src.log_analysis [log files...]
+    files = sys.argv[1:] or None
+    with pd.option_context("display.width", 200, "display.max_columns", None):
+        print(run_summary(load_logs(files)).round(2))
@@ -0,0 +1,112 @@
+import numpy as np
+
+from src.constants import LOG_RING_CAPACITY, LOG_OVERFLOW_POLICY
+
+# One log record, byte-identical to a record of the binary log file
+LOG_DTYPE = np.dtype(
+    [
+        ("t", "<f8"),  # time.monotonic()
+        ("front", "<f4"),
+        ("left", "<f4"),
+        ("right", "<f4"),
+        ("left_motor", "<f4"),
+        ("right_motor", "<f4"),
+        ("data_age", "<f4"),
+        ("action", "u1"),
+        ("phase", "u1"),
+        ("rate", "<u2"),  # Achieved control loop rate (Hz), 0 = not recorded
+    ]
+)
+
+DROP_OLDEST = "drop_oldest"
+DROP_NEWEST = "drop_newest"
+
+
+class LogRing:
+    """
+    Preallocated single-producer / single-consumer ring of log records.
+
+    The control loop (producer) only ever writes `head`, the writer thread
+    (consumer) only ever writes `tail`, so no lock is needed and push() never
+    waits. When the ring is full:
+    - drop_oldest: push() overwrites the oldest record, the consumer skips
+      what was overwritten and counts it
+    - drop_newest: push() discards the new record and counts it
+    """
+
+    def __init__(self, capacity=LOG_RING_CAPACITY, overflow=LOG_OVERFLOW_POLICY):
+        if overflow not in (DROP_OLDEST, DROP_NEWEST):
+            raise ValueError(f"Invalid overflow policy: {overflow}")
+
+        self.capacity = capacity
+        self.overflow = overflow
+        self.records = np.zeros(capacity, dtype=LOG_DTYPE)
+
+        # Field views, so push() writes straight into the preallocated columns
+        self._t = self.records["t"]
+        self._front = self.records["front"]
+        self._left = self.records["left"]
+        self._right = self.records["right"]
+        self._left_motor = self.records["left_motor"]
+        self._right_motor = self.records["right_motor"]
+        self._data_age = self.records["data_age"]
+        self._action = self.records["action"]
+        self._phase = self.records["phase"]
+        self._rate = self.records["rate"]
+
+        self.head = 0  # Records pushed so far (producer)
+        self.tail = 0  # Records consumed so far (consumer)
+        self.rejected = 0  # drop_newest losses (producer)
+        self.overwritten = 0  # drop_oldest losses (consumer)
+
+    @property
+    def dropped(self):
+        return self.rejected + self.overwritten
+
+    @property
+    def pending(self):
+        return min(self.head - self.tail, self.capacity)
+
+    def push(self, t, front, left, right, left_motor, right_motor, data_age, action, phase, rate=0):
+        """Producer side. Returns False if the record was discarded."""
+        head = self.head
+        if head - self.tail >= self.capacity and self.overflow == DROP_NEWEST:
+            self.rejected += 1
+            return False
+
+        i = head % self.capacity
+        self._t[i] = t
+        self._front[i] = front
+        self._left[i] = left
+        self._right[i] = right
+        self._left_motor[i] = left_motor
+        self._right_motor[i] = right_motor
+        self._data_age[i] = data_age
+        self._action[i] = action
+        self._phase[i] = phase
+        self._rate[i] = rate
+
+        # Publish only after the record is complete
+        self.head = head + 1
+        return True
+
+    def pop(self):
+        """Consumer side. Returns a copy of all records pushed since the last pop()."""
+        head = self.head
+        tail = self.tail
+        if head - tail > self.capacity:
+            self.overwritten += head - self.capacity - tail
+            tail = head - self.capacity
+
+        batch = self.records.take(np.arange(tail, head) % self.capacity)
+
+        if self.overflow == DROP_OLDEST:
+            # The producer may have lapped us while copying, drop what it overwrote,
+            # including the slot of the record it may be writing right now
+            lapped = min(self.head - self.capacity - tail + 1, len(batch))
+            if lapped > 0:
+                self.overwritten += lapped
+                batch = batch[lapped:]
+
+        self.tail = head
+        return batch
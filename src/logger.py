@@ -1,70 +1,328 @@
 import csv
 import os
+import sys
 import time
-import queue
+import struct
 import threading
 
+import numpy as np
+
+from src.escape_maneuver import PHASES
+from src.log_ring import LogRing, LOG_DTYPE
+from src.constants import (
+    ACTION_DRIVE,
+    ACTION_STOP,
+    ACTION_INIT,
+    ACTION_ESCAPE,
+    LOG_DIR,
+    LOG_FLUSH_BYTES,
+    LOG_FLUSH_INTERVAL_S,
+    LOG_POLL_INTERVAL_S,
+    LOG_DELTA_DEADBAND_CM,
+    LOG_DELTA_MOTOR,
+    LOG_KEYFRAME_S,
+)
+
+CSV_HEADER = [
+    "Timestamp",
+    "Mode",
+    "Front_Dist_cm",
+    "Left_Dist_cm",
+    "Right_Dist_cm",
+    "Action",
+    "Notes",
+]
+
+# --- BINARY FORMAT ---
+# File header: magic, version, record size, wall clock at monotonic 0, mode
+# Records: LOG_DTYPE (see src/log_ring.py), written as-is from the ring
+# Version 2 stores the loop rate in what were padding bytes (zero) in version 1
+BIN_MAGIC = b"RVLG"
+BIN_VERSION = 2
+BIN_HEADER = struct.Struct("<4sHHd16s")
+
+ACTIONS = ("", ACTION_DRIVE, ACTION_STOP, ACTION_INIT, ACTION_ESCAPE)
+_ACTION_CODES = {name: i for i, name in enumerate(ACTIONS)}
+_PHASE_CODES = {name: i for i, name in enumerate(PHASES)}
+
+
+class DeltaFilter:
+    """
+    Decides which rows a change-only log keeps: a row is written when a
+    distance moved more than `deadband` cm since the last written row, when
+    the motor command (by more than LOG_DELTA_MOTOR), action or escape phase
+    changed, or when `keyframe_s` passed without a row, so gaps stay bounded
+    and timing can be rebuilt (see log_analysis.expand()).
+    """
+
+    __slots__ = ("deadband", "keyframe_s", "last", "kept", "skipped")
+
+    def __init__(self, deadband=LOG_DELTA_DEADBAND_CM, keyframe_s=LOG_KEYFRAME_S):
+        self.deadband = deadband
+        self.keyframe_s = keyframe_s
+        self.last = None  # (t, front, left, right, left_motor, right_motor, action, phase) written last
+        self.kept = 0
+        self.skipped = 0
+
+    def keep(self, t, front, left, right, left_motor, right_motor, action, phase):
+        last = self.last
+        if (
+            last is None
+            or t - last[0] >= self.keyframe_s
+            or action != last[6]
+            or phase != last[7]
+            or abs(left_motor - last[4]) > LOG_DELTA_MOTOR
+            or abs(right_motor - last[5]) > LOG_DELTA_MOTOR
+            or abs(front - last[1]) > self.deadband
+            or abs(left - last[2]) > self.deadband
+            or abs(right - last[3]) > self.deadband
+        ):
+            self.last = (t, front, left, right, left_motor, right_motor, action, phase)
+            self.kept += 1
+            return True
+        self.skipped += 1
+        return False
+
 
 class ThesisLogger:
-    def __init__(self, mode):
-        if not os.path.exists("data_logs"):
-            os.makedirs("data_logs")
+    """
+    delta: only log rows that changed (a DeltaFilter, or True for the
+    default deadband and keyframe interval). False logs every row.
+    """
+
+    def __init__(self, mode, fmt="csv", ring=None, delta=False):
+        if not os.path.exists(LOG_DIR):
+            os.makedirs(LOG_DIR)
+
+        if fmt not in ("csv", "bin"):
+            raise ValueError(f"Invalid log format: {fmt}")
 
         timestamp = time.strftime("%Y%m%d_%H%M%S")
-        self.filename = f"data_logs/rover_log_{mode}_{timestamp}.csv"
+        self.mode = mode
+        self.fmt = fmt
+        self.filename = f"{LOG_DIR}/rover_log_{mode}_{timestamp}.{fmt}"
+
+        # time.time() at time.monotonic() == 0, turns record times into wall clock
+        self.wall_offset = time.time() - time.monotonic()
 
-        self.log_queue = queue.Queue()
+        self.ring = ring if ring is not None else LogRing()
+        if delta is True:
+            delta = DeltaFilter()
+        self.delta = delta or None
         self.running = True
         self.thread = threading.Thread(target=self._writer_loop, daemon=True)
         self.thread.start()
 
         print(f"[LOG] Logging to: {self.filename}")
 
-    def log(self, source, front, left, right, action, notes=""):
+    def log(
+        self,
+        source,
+        front,
+        left,
+        right,
+        action,
+        left_motor=0.0,
+        right_motor=0.0,
+        data_age=0.0,
+        phase="",
+        timestamp=None,
+        rate=0.0,
+    ):
         """
-        Non-blocking log. Puts data in the queue and returns immediately.
+        Non-blocking log. Writes the raw numbers into the preallocated ring
+        and returns immediately, it never waits for the writer thread.
+        Formatting happens on the writer thread.
+        source is kept for compatibility, the mode is stored once per file.
+        rate: achieved control loop rate (Hz), 0 = unknown.
         """
-        timestamp = time.strftime("%H:%M:%S") + f".{int(time.time() * 1000) % 1000:03d}"
+        if timestamp is None:
+            timestamp = time.monotonic()
 
-        row = [
-            timestamp,
-            source,
-            f"{front:.1f}",
-            f"{left:.1f}",
-            f"{right:.1f}",
-            action,
-            notes,
-        ]
+        if self.delta is not None and not self.delta.keep(
+            timestamp, front, left, right, left_motor, right_motor, action, phase
+        ):
+            return
 
-        self.log_queue.put(row)
+        self.ring.push(
+            timestamp,
+            front,
+            left,
+            right,
+            left_motor,
+            right_motor,
+            data_age,
+            _ACTION_CODES.get(action, 0),
+            _PHASE_CODES.get(phase, 0),
+            min(int(rate + 0.5), 65535),
+        )
 
     def _writer_loop(self):
-        with open(self.filename, mode="w", newline="") as file:
-            writer = csv.writer(file)
-            writer.writerow(
-                [
-                    "Timestamp",
-                    "Mode",
-                    "Front_Dist_cm",
-                    "Left_Dist_cm",
-                    "Right_Dist_cm",
-                    "Action",
-                    "Notes",
-                ]
-            )
+        if self.fmt == "bin":
+            sink = _BinarySink(self.filename, self.mode, self.wall_offset)
+        else:
+            sink = _CsvSink(self.filename, self.mode, self.wall_offset)
 
-            while self.running or not self.log_queue.empty():
+        last_flush = time.monotonic()
+        with sink:
+            while self.running or self.ring.pending:
                 try:
-                    row = self.log_queue.get(timeout=1.0)
-                    writer.writerow(row)
-                    file.flush()
-                    self.log_queue.task_done()
-                except queue.Empty:
-                    continue
+                    batch = self.ring.pop()
+                    if batch.size:
+                        sink.add(batch)
+                    else:
+                        time.sleep(LOG_POLL_INTERVAL_S)
                 except Exception as e:
                     print(f"[LOG ERROR]: {e}")
 
+                # Batch writes: one flush per LOG_FLUSH_BYTES or per interval
+                now = time.monotonic()
+                if sink.pending >= LOG_FLUSH_BYTES or now - last_flush >= LOG_FLUSH_INTERVAL_S:
+                    sink.flush()
+                    last_flush = now
+
     def close(self):
         self.running = False
         self.thread.join()
+        if self.ring.dropped:
+            print(f"[LOG] {self.ring.dropped} rows dropped ({self.ring.overflow})")
+        if self.delta is not None:
+            total = self.delta.kept + self.delta.skipped
+            print(f"[LOG] Delta log: {self.delta.kept} of {total} rows written")
         print(f"[LOG] Log file closed: {self.filename}")
+        self._update_index()
+
+    def _update_index(self):
+        """Adds this run to the run index, a failure here never loses the log"""
+        try:
+            from src.run_index import update_index  # pandas is only needed now
+
+            update_index([self.filename])
+        except Exception as e:
+            print(f"[LOG] Run index not updated: {e}")
+
+
+class _BinarySink:
+    """Collects raw ring batches and writes them in one go on flush()"""
+
+    def __init__(self, filename, mode, wall_offset):
+        self.file = open(filename, "wb")
+        self.file.write(
+            BIN_HEADER.pack(
+                BIN_MAGIC, BIN_VERSION, LOG_DTYPE.itemsize, wall_offset, mode.encode()[:16]
+            )
+        )
+        self.buffer = bytearray()
+
+    @property
+    def pending(self):
+        return len(self.buffer)
+
+    def add(self, batch):
+        self.buffer += batch.tobytes()
+
+    def flush(self):
+        if self.buffer:
+            self.file.write(self.buffer)
+            self.file.flush()
+            self.buffer.clear()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.flush()
+        self.file.close()
+
+
+class _CsvSink:
+    """Formats records into the CSV layout used by the plotting scripts"""
+
+    def __init__(self, filename, mode, wall_offset):
+        self.file = open(filename, mode="w", newline="")
+        self.writer = csv.writer(self.file)
+        self.writer.writerow(CSV_HEADER)
+        self.mode = mode
+        self.wall_offset = wall_offset
+        self.rows = []
+
+    @property
+    def pending(self):
+        # Rough size estimate, a formatted row is ~60 bytes
+        return len(self.rows) * 60
+
+    def add(self, batch):
+        for record in batch.tolist():
+            self.rows.append(format_csv_row(record, self.mode, self.wall_offset))
+
+    def flush(self):
+        if self.rows:
+            self.writer.writerows(self.rows)
+            self.file.flush()
+            self.rows.clear()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.flush()
+        self.file.close()
+
+
+def format_csv_row(record, mode, wall_offset):
+    """Turns one LOG_DTYPE record (as tuple) into a CSV row"""
+    t, front, left, right, left_motor, right_motor, age, action, phase, rate = record[:10]
+    wall = wall_offset + t
+    timestamp = time.strftime("%H:%M:%S", time.localtime(wall)) + f".{int(wall * 1000) % 1000:03d}"
+
+    notes = f"L={left_motor:.2f} R={right_motor:.2f} Age={age * 1000:.0f}ms"
+    if rate:
+        notes += f" Hz={rate}"
+    if phase:
+        notes += f" Phase={PHASES[phase]}"
+
+    return [
+        timestamp,
+        mode,
+        f"{front:.1f}",
+        f"{left:.1f}",
+        f"{right:.1f}",
+        ACTIONS[action],
+        notes,
+    ]
+
+
+def read_binary_log(filename):
+    """Returns (mode, wall_offset, LOG_DTYPE record array) of a .bin log"""
+    with open(filename, "rb") as f:
+        data = f.read()
+
+    magic, version, record_size, wall_offset, mode = BIN_HEADER.unpack_from(data)
+    if magic != BIN_MAGIC or version > BIN_VERSION or record_size != LOG_DTYPE.itemsize:
+        raise ValueError(f"{filename} is not a version 1-{BIN_VERSION} rover log")
+
+    body = data[BIN_HEADER.size :]
+    body = body[: len(body) - len(body) % record_size]  # Cut a torn last record
+    records = np.frombuffer(body, dtype=LOG_DTYPE)
+    return mode.rstrip(b"\0").decode(), wall_offset, records
+
+
+def convert_to_csv(bin_filename, csv_filename=None):
+    """Writes the CSV layout of the plotting scripts next to a .bin log"""
+    if csv_filename is None:
+        csv_filename = os.path.splitext(bin_filename)[0] + ".csv"
+
+    mode, wall_offset, records = read_binary_log(bin_filename)
+    with open(csv_filename, mode="w", newline="") as file:
+        writer = csv.writer(file)
+        writer.writerow(CSV_HEADER)
+        writer.writerows(format_csv_row(r, mode, wall_offset) for r in records.tolist())
+
+    print(f"[LOG] {len(records)} records -> {csv_filename}")
+    return csv_filename
+
+
+if __name__ == "__main__":
+    # python -m src.logger data_logs/rover_log_lidar_XXXX.bin [...]
+    for path in sys.argv[1:]:
+        convert_to_csv(path)
@@ -0,0 +1,118 @@
+import threading
+import time
+import traceback
+
+import numpy as np
+
+from src.mapping.occupancy_grid import OccupancyGrid
+from src.constants import MAP_SCAN_BUDGET_S, MAX_VALID_DIST_CM
+
+
+def _standing_still():
+    return (0.0, 0.0, 0.0)
+
+
+class Mapper:
+    """
+    Feeds every LiDAR revolution into an OccupancyGrid on its own thread.
+    lidar: LidarStrategy to follow (anything with get_scan()), or None to call
+    update() yourself (replay).
+    pose: callable returning the rover pose (x_cm, y_cm, heading_rad) for the
+    scan that is being integrated, defaults to a rover that does not move.
+    """
+
+    def __init__(
+        self,
+        lidar=None,
+        grid=None,
+        pose=None,
+        budget_s=MAP_SCAN_BUDGET_S,
+        autostart=True,
+        profiler=None,
+    ):
+        if lidar is not None and not hasattr(lidar, "get_scan"):
+            raise TypeError(f"Mapper needs a LiDAR source with get_scan(), got {type(lidar).__name__}")
+
+        self.lidar = lidar
+        self.grid = grid if grid is not None else OccupancyGrid()
+        self.pose = pose if pose is not None else _standing_still
+        self.budget_s = budget_s
+        self._probe = profiler.probe("mapping") if profiler else None
+
+        self.scans = 0
+        self.skipped = 0  # Revolutions that arrived while the previous one was mapped
+        self.truncated = 0  # Revolutions cut short by the time budget
+        self._last_revolution = 0
+        self.error = None  # Exception that stopped the mapping thread
+
+        self.running = False
+        self.thread = threading.Thread(target=self._map_loop, daemon=True)
+        if autostart and lidar is not None:
+            self.start()
+
+    def start(self):
+        self.running = True
+        self.thread.start()
+        print("[Mapper] Background thread started.")
+
+    def _map_loop(self):
+        """
+        MAPPING THREAD.
+        Sleeps until the LiDAR thread publishes a revolution and maps the newest one.
+        If mapping falls behind, older revolutions are skipped instead of queued.
+        """
+        last_seq = 0
+        try:
+            while self.running:
+                snapshot = self.lidar.wait_for_update(last_seq, 0.5)
+                if snapshot.seq == last_seq:
+                    continue
+                last_seq = snapshot.seq
+
+                scan = self.lidar.get_scan()
+                if scan is not None:
+                    self.update(scan)
+        except Exception as e:
+            # The rover keeps driving on the sectors, but nobody may miss that the map froze
+            self.error = e
+            self.running = False
+            print(f"[Mapper ERROR]: mapping thread stopped after {self.scans} scans: {e!r}")
+            traceback.print_exc()
+
+    def update(self, scan):
+        """Integrates one ScanSnapshot (newer than the last one) into the grid"""
+        if scan.revolution <= self._last_revolution:
+            return
+        if self._last_revolution:
+            self.skipped += scan.revolution - self._last_revolution - 1
+        self._last_revolution = scan.revolution
+
+        start = time.perf_counter()
+        # Copy: the scan buffer slot is reused a few revolutions later
+        angles = np.array(scan.angles)
+        distances = np.array(scan.distances)
+
+        cast = self.grid.integrate(
+            angles, distances, self.pose(), deadline=start + self.budget_s
+        )
+        if cast < np.count_nonzero(distances):
+            self.truncated += 1
+        self.scans += 1
+
+        if self._probe is not None:
+            self._probe.record(int((time.perf_counter() - start) * 1e9))
+
+    def nearest_obstacle(self, direction_deg=0.0, half_width_deg=20.0, max_range_cm=MAX_VALID_DIST_CM):
+        """Closest mapped obstacle in a rover frame cone, see OccupancyGrid"""
+        return self.grid.nearest_obstacle(direction_deg, half_width_deg, max_range_cm, self.pose())
+
+    def stop(self):
+        self.running = False
+        if self.thread.is_alive():
+            self.thread.join(timeout=1.0)
+        if self.error is not None:
+            print(f"[Mapper] Stopped early by {self.error!r}, the map is incomplete.")
+        print(
+            f"[Mapper] {self.scans} scans mapped, {self.skipped} skipped, "
+            f"{self.truncated} cut short by the time budget."
+        )
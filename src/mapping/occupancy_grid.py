@@ -0,0 +1,171 @@
+import math
+import time
+
+import numpy as np
+
+from src.constants import (
+    MAP_SIZE_CM,
+    MAP_RESOLUTION_CM,
+    MAP_LOG_ODDS_HIT,
+    MAP_LOG_ODDS_MISS,
+    MAP_LOG_ODDS_MIN,
+    MAP_LOG_ODDS_MAX,
+    MAP_OCCUPIED_LOG_ODDS,
+    MAP_RAY_CHUNK,
+    MAX_VALID_DIST_CM,
+    NO_READING_DIST_CM,
+)
+
+
+class OccupancyGrid:
+    """
+    Log-odds occupancy grid around the rover, world frame in cm.
+
+    Pose: (x_cm, y_cm, heading_rad), heading counter-clockwise from the world x axis.
+    Scan angles are rover frame degrees like the sectors: 0 = front, clockwise.
+    The grid follows the rover: once it is a quarter of the map away from the
+    center, the cells are shifted so that it is in the middle again.
+    """
+
+    def __init__(self, size_cm=MAP_SIZE_CM, resolution_cm=MAP_RESOLUTION_CM):
+        self.resolution = resolution_cm
+        self.cells = int(round(size_cm / resolution_cm))
+        self.size = self.cells * resolution_cm
+
+        self.log_odds = np.zeros((self.cells, self.cells), dtype=np.float32)
+        self.origin = np.array([-self.size / 2, -self.size / 2])  # World cm of cell (0, 0)
+
+        # Beam sample distances, two per cell so no cell is skipped
+        self._steps = np.arange(0.0, MAX_VALID_DIST_CM, resolution_cm / 2)
+        # Scratch masks, one flag per cell, reused every chunk
+        self._free = np.zeros(self.cells * self.cells, dtype=bool)
+        self._occupied = np.zeros(self.cells * self.cells, dtype=bool)
+
+        # (pose, (N, 2) world xy of occupied cells): replaced as a whole after every
+        # update, so queries from other threads never see a half updated map
+        self._view = ((0.0, 0.0, 0.0), np.empty((0, 2)))
+        self.updates = 0
+
+    @property
+    def pose(self):
+        return self._view[0]
+
+    @property
+    def obstacles(self):
+        return self._view[1]
+
+    def integrate(self, angles, distances, pose=(0.0, 0.0, 0.0), deadline=None):
+        """
+        Casts one revolution into the grid.
+        Rays are processed in chunks that each cover the whole circle; once
+        time.perf_counter() passes `deadline` the remaining chunks are skipped.
+        Returns the number of rays that were cast.
+        """
+        x, y, heading = pose
+        self._follow(x, y)
+
+        # 0 = no return: could be too close or too far, says nothing about free space
+        valid = distances > 0
+        angles = angles[valid]
+        distances = distances[valid]
+
+        n = distances.size
+        chunks = max(1, math.ceil(n / MAP_RAY_CHUNK))
+        cast = 0
+        for k in range(chunks):
+            if deadline is not None and k and time.perf_counter() > deadline:
+                break
+            rays = slice(k, None, chunks)  # Interleaved: every chunk spans 360 deg
+            self._cast(angles[rays], distances[rays], x, y, heading)
+            cast += distances[rays].size
+
+        self._publish(pose)
+        return cast
+
+    def _cast(self, angles, distances, x, y, heading):
+        theta = heading - np.radians(angles)
+        cos = np.cos(theta)
+        sin = np.sin(theta)
+
+        # Free space up to one cell before the return (or the max range)
+        reach = np.minimum(distances, MAX_VALID_DIST_CM) - self.resolution
+        along = self._steps[None, :]
+        inside = along < reach[:, None]
+        free = self._cell_index((x + cos[:, None] * along)[inside], (y + sin[:, None] * along)[inside])
+
+        hit = distances < MAX_VALID_DIST_CM
+        ends = self._cell_index(x + cos[hit] * distances[hit], y + sin[hit] * distances[hit])
+
+        free_mask = self._free
+        occ_mask = self._occupied
+        free_mask[:] = False
+        occ_mask[:] = False
+        free_mask[free] = True
+        occ_mask[ends] = True
+        free_mask &= ~occ_mask  # A cell with a return in this scan is not cleared
+
+        # Every cell is updated once per chunk, however many beams touched it
+        cells = self.log_odds.reshape(-1)
+        cells[free_mask] += MAP_LOG_ODDS_MISS
+        cells[occ_mask] += MAP_LOG_ODDS_HIT
+        np.clip(cells, MAP_LOG_ODDS_MIN, MAP_LOG_ODDS_MAX, out=cells)
+
+    def _cell_index(self, xs, ys):
+        """Flat cell index of world points, points outside the grid are dropped"""
+        ix = np.floor((xs - self.origin[0]) / self.resolution).astype(np.intp)
+        iy = np.floor((ys - self.origin[1]) / self.resolution).astype(np.intp)
+        keep = (ix >= 0) & (ix < self.cells) & (iy >= 0) & (iy < self.cells)
+        return ix[keep] * self.cells + iy[keep]
+
+    def _follow(self, x, y):
+        center = self.origin + self.size / 2
+        if max(abs(x - center[0]), abs(y - center[1])) < self.size / 4:
+            return
+
+        shift = np.round((np.array([x, y]) - center) / self.resolution).astype(int)
+        shifted = np.zeros_like(self.log_odds)
+        n = self.cells
+        (sx, sy) = shift.tolist()
+        # new[i] = old[i + shift], cells that come into view start unknown
+        dst_x = slice(max(0, -sx), min(n, n - sx))
+        src_x = slice(max(0, sx), min(n, n + sx))
+        dst_y = slice(max(0, -sy), min(n, n - sy))
+        src_y = slice(max(0, sy), min(n, n + sy))
+        shifted[dst_x, dst_y] = self.log_odds[src_x, src_y]
+
+        self.log_odds = shifted
+        self.origin = self.origin + shift * self.resolution
+
+    def _publish(self, pose):
+        occupied = np.flatnonzero(self.log_odds.reshape(-1) > MAP_OCCUPIED_LOG_ODDS)
+        ix, iy = np.divmod(occupied, self.cells)
+        xy = np.column_stack([ix, iy]) * self.resolution + self.origin + self.resolution / 2
+        xy.flags.writeable = False
+        self._view = (tuple(pose), xy)
+        self.updates += 1
+
+    def nearest_obstacle(self, direction_deg=0.0, half_width_deg=20.0, max_range_cm=MAX_VALID_DIST_CM, pose=None):
+        """
+        Distance (cm) to the closest occupied cell inside a cone around
+        direction_deg (rover frame, 0 = front, clockwise), NO_READING_DIST_CM if none.
+        Uses the pose of the last update unless a newer one is given.
+        """
+        map_pose, obstacles = self._view
+        if obstacles.size == 0:
+            return NO_READING_DIST_CM
+
+        x, y, heading = map_pose if pose is None else pose
+        dx = obstacles[:, 0] - x
+        dy = obstacles[:, 1] - y
+        dist = np.hypot(dx, dy)
+        bearing = np.degrees(heading - np.arctan2(dy, dx))  # Clockwise from the rover's front
+        off = (bearing - direction_deg + 180.0) % 360.0 - 180.0
+
+        inside = (np.abs(off) <= half_width_deg) & (dist <= max_range_cm)
+        if not inside.any():
+            return NO_READING_DIST_CM
+        return float(dist[inside].min())
+
+    def probabilities(self):
+        """Occupancy probability of every cell (0.5 = unknown), e.g. for plotting"""
+        return 1.0 / (1.0 + np.exp(-self.log_odds))
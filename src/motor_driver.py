@@ -1,10 +1,22 @@
+import threading
+import time
 from gpiozero import OutputDevice, PWMOutputDevice
-from time import sleep
-from src.constants import MAX_SPEED, MIN_SPEED, STALL_THRESHOLD, TURN_SPEED
+from src.motor_model import clamp_speed, remap_speed
+from src.constants import (
+    MAX_SPEED,
+    MIN_SPEED,
+    STALL_THRESHOLD,
+    TURN_SPEED,
+    RAMP_RATE_PER_S,
+    RAMP_TICK_S,
+)
+
+LEFT = 0
+RIGHT = 1
 
 
 class MotorDriver:
-    def __init__(self):
+    def __init__(self, ramp_rate=RAMP_RATE_PER_S):
         self.STBY = OutputDevice(26)
 
         # Left Motor (Group A)
@@ -18,7 +30,15 @@ class MotorDriver:
         self.BIN2 = OutputDevice(23)
 
         self.STBY.on()  # Activate the motor driver immediately
-        self.current_speed_val = 0.0  # Track actual speed (0.0 to 1.0)
+
+        # Per wheel PWM (-1.0 to 1.0): what is applied now and where the ramp goes
+        self.ramp_rate = ramp_rate
+        self._current = [0.0, 0.0]
+        self._target = [0.0, 0.0]
+        self._ramp_cond = threading.Condition()
+        self._running = True
+        self._ramp_thread = threading.Thread(target=self._ramp_loop, daemon=True)
+        self._ramp_thread.start()
 
     def _set_motor(self, pwm, in1, in2, speed):
         if speed > 0:
@@ -37,9 +57,67 @@ class MotorDriver:
             in2.off()
             pwm.value = 0
 
-    def set_speed(self, target_speed):
+    def _apply_wheels(self, left, right):
+        self._set_motor(self.PWMA, self.AIN1, self.AIN2, left)
+        self._set_motor(self.PWMB, self.BIN1, self.BIN2, right)
+
+    def _ramp_loop(self):
+        """
+        ACTUATOR THREAD.
+        Moves every wheel towards its target by at most ramp_rate per second.
+        Sleeps on the condition while there is nothing to ramp.
         """
-        Smoothly ramps the motor speed up or down.
+        last = time.monotonic()
+        while self._running:
+            with self._ramp_cond:
+                while self._running and self._current == self._target:
+                    self._ramp_cond.wait()
+                    last = time.monotonic()
+
+            time.sleep(RAMP_TICK_S)
+
+            with self._ramp_cond:
+                now = time.monotonic()
+                max_step = self.ramp_rate * (now - last)
+                last = now
+
+                # Targets may have changed while sleeping, always ramp to the newest
+                for wheel in (LEFT, RIGHT):
+                    diff = self._target[wheel] - self._current[wheel]
+                    if abs(diff) <= max_step:
+                        self._current[wheel] = self._target[wheel]
+                    else:
+                        self._current[wheel] += max_step if diff > 0 else -max_step
+
+                self._apply_wheels(self._current[LEFT], self._current[RIGHT])
+                if self._current == self._target:
+                    self._ramp_cond.notify_all()
+
+    def _post(self, left_pwm, right_pwm, ramp=True):
+        """Hands new wheel targets to the ramp thread and returns immediately"""
+        with self._ramp_cond:
+            self._target = [left_pwm, right_pwm]
+            if not ramp:
+                self._current = [left_pwm, right_pwm]
+                self._apply_wheels(left_pwm, right_pwm)
+            self._ramp_cond.notify_all()
+
+    def wait_idle(self, timeout=None):
+        """Blocks until all ramps reached their target. Returns False on timeout."""
+        with self._ramp_cond:
+            return self._ramp_cond.wait_for(
+                lambda: self._current == self._target, timeout
+            )
+
+    @property
+    def wheel_pwm(self):
+        """(left, right) PWM currently applied to the motors"""
+        return tuple(self._current)
+
+    def set_speed(self, target_speed, ramp=True):
+        """
+        Smoothly ramps both motors up or down. Does not block,
+        a newer target replaces a ramp that is still running.
         target_speed: Float between -1.0 (Full Back) and 1.0 (Full Forward)
         """
         target_speed = max(
@@ -63,79 +141,47 @@ class MotorDriver:
             if target_speed < 0:
                 final_pwm = -final_pwm
 
-        step = 0.05  # Smaller step = smoother throttle ramp
-        while abs(self.current_speed_val - final_pwm) > step:
-            if self.current_speed_val < final_pwm:
-                self.current_speed_val += step
-            else:
-                self.current_speed_val -= step
-            # Apply the new intermediate speed to motors
-            self._apply_speed(self.current_speed_val)
-
-            # Small delay to make the ramp perceptible (e.g. 0.02s * 20 steps = 0.4s ramp)
-            sleep(0.02)
-
-        # Ensure we hit the exact target
-        self.current_speed_val = final_pwm
-        self._apply_speed(self.current_speed_val)
-
-    def _apply_speed(self, speed):
-        self._set_motor(self.PWMA, self.AIN1, self.AIN2, speed)
-        self._set_motor(self.PWMB, self.BIN1, self.BIN2, speed)
+        self._post(final_pwm, final_pwm, ramp)
 
     def move(self, speed):
         self.set_speed(speed)
 
     def turn_left(self):
         # "Tank Turn" (Left Back, Right Forward)
-        self._set_motor(self.PWMA, self.AIN1, self.AIN2, -TURN_SPEED)
-        self._set_motor(self.PWMB, self.BIN1, self.BIN2, TURN_SPEED)
-        self.current_speed_val = 0  # Reset speed tracker since we broke flow
+        self._post(-TURN_SPEED, TURN_SPEED, ramp=False)
 
     def turn_right(self):
-        self._set_motor(self.PWMA, self.AIN1, self.AIN2, TURN_SPEED)
-        self._set_motor(self.PWMB, self.BIN1, self.BIN2, -TURN_SPEED)
-        self.current_speed_val = 0
+        self._post(TURN_SPEED, -TURN_SPEED, ramp=False)
 
     def stop(self, force_stop=False):
         """
         force_stop=True:  Stops INSTANTLY (Emergency).
-        force_stop=False: Stops smoothly (Normal).
+        force_stop=False: Stops smoothly (Normal), returns immediately.
         """
-        if force_stop:
-            self.current_speed_val = 0.0
-            self._apply_speed(0.0)
-        else:
-            self.set_speed(0.0)
+        self._post(0.0, 0.0, ramp=not force_stop)
 
-    def drive(self, left_speed, right_speed):
+    def drive(self, left_speed, right_speed, ramp=True):
         """
-        Manual differential drive control
+        Manual differential drive control.
+        Each wheel ramps towards its own target unless ramp=False.
         """
-        left_speed = max(
-            MIN_SPEED, min(left_speed, MAX_SPEED)
-        )  # clamp to respect -1.0 <-> 1.0 speed for motor safety
-        right_speed = max(MIN_SPEED, min(right_speed, MAX_SPEED))
-
-        # if speed is too low to move, boost it to STALL_TRESHOLD to prevent stalling
-        def remap(s):
-            if abs(s) < 0.05:
-                return 0.0  # stop if close to 0
-
-            val = STALL_THRESHOLD + (abs(s) * (1 - STALL_THRESHOLD))
-            return val if s > 0 else -val
-
-        final_left = remap(left_speed)
-        final_right = remap(right_speed)
-
-        self._set_motor(self.PWMA, self.AIN1, self.AIN2, final_left)
-        self._set_motor(self.PWMB, self.BIN1, self.BIN2, final_right)
+        left_speed = clamp_speed(left_speed)
+        right_speed = clamp_speed(right_speed)
+        self._post(remap_speed(left_speed), remap_speed(right_speed), ramp)
 
     def cleanup(self):
         """
         Complete Shutdown: Stop motors and disable the driver chip.
         """
         self.set_speed(0.0)
+        if not self.wait_idle(timeout=1.0):
+            self.stop(force_stop=True)
+
+        self._running = False
+        with self._ramp_cond:
+            self._ramp_cond.notify_all()
+        self._ramp_thread.join(timeout=1.0)
+
         self.STBY.off()
         self.STBY.close()
         print("[MotorDriver] Driver disabled.")
@@ -0,0 +1,31 @@
+from src.constants import MAX_SPEED, MIN_SPEED, STALL_THRESHOLD
+
+
+def clamp_speed(speed):
+    """Respect the -1.0 <-> 1.0 speed range for motor safety"""
+    return max(MIN_SPEED, min(speed, MAX_SPEED))
+
+
+def remap_speed(speed):
+    """
+    Dead zone model of MotorDriver.drive().
+    If speed is too low to move, boost it to STALL_THRESHOLD to prevent stalling:
+    the 0.0-1.0 range is compressed into STALL_THRESHOLD-1.0 PWM.
+    """
+    if abs(speed) < 0.05:
+        return 0.0  # stop if close to 0
+
+    val = STALL_THRESHOLD + (abs(speed) * (1 - STALL_THRESHOLD))
+    return val if speed > 0 else -val
+
+
+def pwm_to_speed(pwm):
+    """
+    Inverse of remap_speed(): the share of full wheel speed a PWM produces.
+    Below STALL_THRESHOLD the motor does not turn.
+    """
+    if abs(pwm) <= STALL_THRESHOLD:
+        return 0.0
+
+    val = (abs(pwm) - STALL_THRESHOLD) / (1 - STALL_THRESHOLD)
+    return val if pwm > 0 else -val
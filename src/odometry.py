@@ -0,0 +1,94 @@
+import math
+
+from src.motor_model import pwm_to_speed
+from src.constants import (
+    ODOM_WHEEL_SPEED_CM_S,
+    ODOM_TRACK_WIDTH_CM,
+    ODOM_LEFT_TRIM,
+    ODOM_RIGHT_TRIM,
+    ODOM_MAX_DT_S,
+)
+
+
+class Odometry:
+    """
+    Dead reckoning from the wheel PWM (MotorDriver.wheel_pwm).
+    Pose: x, y in cm and heading in rad (counter-clockwise, 0 = where the rover
+    pointed at start), the same frame as the occupancy grid.
+    Velocity: v (cm/s forward) and omega (rad/s counter-clockwise).
+
+    update() only does float math on preallocated slots, no containers are built.
+    Other threads read self.pose; it can mix two consecutive updates, which is
+    less than one control period of motion.
+    """
+
+    __slots__ = (
+        "wheel_speed",
+        "track_width",
+        "left_trim",
+        "right_trim",
+        "max_dt",
+        "x",
+        "y",
+        "heading",
+        "v",
+        "omega",
+        "distance",
+        "last_time",
+        "path",
+    )
+
+    def __init__(
+        self,
+        wheel_speed=ODOM_WHEEL_SPEED_CM_S,
+        track_width=ODOM_TRACK_WIDTH_CM,
+        left_trim=ODOM_LEFT_TRIM,
+        right_trim=ODOM_RIGHT_TRIM,
+        max_dt=ODOM_MAX_DT_S,
+        record_path=False,
+    ):
+        self.wheel_speed = wheel_speed
+        self.track_width = track_width
+        self.left_trim = left_trim
+        self.right_trim = right_trim
+        self.max_dt = max_dt
+        self.path = [] if record_path else None  # (t, x, y, heading) per update
+        self.reset()
+
+    def reset(self, x=0.0, y=0.0, heading=0.0):
+        self.x = x
+        self.y = y
+        self.heading = heading
+        self.v = 0.0
+        self.omega = 0.0
+        self.distance = 0.0  # Total path length (cm)
+        self.last_time = None
+
+    @property
+    def pose(self):
+        return (self.x, self.y, self.heading)
+
+    def update(self, now, left_pwm, right_pwm):
+        """
+        Integrates the motion since the last update, assuming the given PWM
+        was applied the whole time. Call once per control tick.
+        """
+        left = pwm_to_speed(left_pwm) * self.left_trim * self.wheel_speed
+        right = pwm_to_speed(right_pwm) * self.right_trim * self.wheel_speed
+        self.v = (left + right) * 0.5
+        self.omega = (right - left) / self.track_width
+
+        if self.last_time is not None:
+            dt = now - self.last_time
+            if 0.0 < dt <= self.max_dt:
+                # Midpoint heading: exact for straight lines, close for arcs
+                mid = self.heading + self.omega * dt * 0.5
+                step = self.v * dt
+                self.x += step * math.cos(mid)
+                self.y += step * math.sin(mid)
+                self.heading = (self.heading + self.omega * dt + math.pi) % (2 * math.pi) - math.pi
+                self.distance += abs(step)
+        self.last_time = now
+
+        if self.path is not None:
+            self.path.append((now, self.x, self.y, self.heading))
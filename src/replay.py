@@ -0,0 +1,369 @@
+import argparse
+import csv
+import os
+import time
+from collections import namedtuple
+
+import numpy as np
+
+from src.controller import RoverController
+from src.instrumentation import Profiler
+from src.odometry import Odometry
+from src.steering import SteeringSurface, steer
+from src.lidar_only.lidar_strategy import LidarStrategy
+from src.lidar_only.packet_decoder import encode_packets
+from src.lidar_only.sector_table import SectorTable, NO_SECTOR
+from src.motor_model import clamp_speed, remap_speed
+from src.constants import (
+    BAUD_RATE,
+    PACKET_SIZE,
+    POINTS_PER_PACKET,
+    LIDAR_OFFSET_DEG,
+    MAX_VALID_DIST_CM,
+    MM_TO_CM,
+    CONTROL_PERIOD_S,
+    EVENT_MIN_PERIOD_S,
+    SENSOR_WATCHDOG_S,
+    REPLAY_SCAN_RATE_HZ,
+    REPLAY_PACKETS_PER_REV,
+)
+
+
+class ReplayStream(namedtuple("ReplayStream", ["data", "times", "ends"])):
+    """
+    Recorded or synthesized LiDAR bytes with their arrival times.
+    data:  The raw byte stream
+    times: Arrival time (s, from 0) of every chunk
+    ends:  Byte offset just past every chunk
+    """
+
+    __slots__ = ()
+
+    @property
+    def duration(self):
+        return float(self.times[-1]) if len(self.times) else 0.0
+
+    def available(self, t):
+        """Number of bytes that have arrived by time t"""
+        i = np.searchsorted(self.times, t, side="right")
+        return int(self.ends[i - 1]) if i else 0
+
+    @classmethod
+    def from_raw(cls, data, baud=BAUD_RATE):
+        """A raw serial capture, paced at the line rate (10 bits per byte)"""
+        ends = np.minimum(np.arange(PACKET_SIZE, len(data) + PACKET_SIZE, PACKET_SIZE), len(data))
+        return cls(data, ends / (baud / 10.0), ends)
+
+    @classmethod
+    def from_csv(cls, filename, scan_rate=REPLAY_SCAN_RATE_HZ):
+        """
+        Synthesizes packets from the sector distances of a ThesisLogger CSV.
+        Every revolution takes the distances of the newest row logged before it,
+        points outside FRONT/LEFT/RIGHT return nothing.
+        """
+        times, dists = _read_csv_distances(filename)
+
+        sectors = SectorTable()
+        revs = int(times[-1] * scan_rate) + 1
+        rev_times = np.arange(revs) / scan_rate
+        rows = np.maximum(np.searchsorted(times, rev_times, side="right") - 1, 0)
+
+        # Per revolution distance of every sector (mm), 0 = no return
+        sector_mm = np.zeros((revs, len(sectors)))
+        for col, name in enumerate(("FRONT", "LEFT", "RIGHT")):
+            cm = dists[rows, col]
+            sector_mm[:, sectors.index[name]] = np.where(cm < MAX_VALID_DIST_CM, cm * MM_TO_CM, 0)
+
+        packets = REPLAY_PACKETS_PER_REV
+        span = 360.0 / packets
+        starts = np.arange(packets) * span
+        ends = starts + span * (POINTS_PER_PACKET - 1) / POINTS_PER_PACKET
+        point_angles = starts[:, None] + (ends - starts)[:, None] * (
+            np.arange(POINTS_PER_PACKET) / (POINTS_PER_PACKET - 1)
+        )
+        idx = sectors.lookup((point_angles + LIDAR_OFFSET_DEG) % 360)
+
+        # (revs, packets, points): gather every point's sector distance
+        padded = np.concatenate([sector_mm, np.zeros((revs, 1))], axis=1)
+        gather = np.where(idx == NO_SECTOR, len(sectors), idx)
+        dist_mm = padded[:, gather]
+
+        data = encode_packets(
+            np.tile(starts, revs),
+            np.tile(ends, revs),
+            dist_mm.reshape(-1, POINTS_PER_PACKET),
+        )
+        chunk_times = (rev_times[:, None] + (np.arange(1, packets + 1) / packets / scan_rate)).ravel()
+        chunk_ends = np.arange(1, revs * packets + 1) * PACKET_SIZE
+        return cls(data, chunk_times, chunk_ends)
+
+    @classmethod
+    def load(cls, filename):
+        """ThesisLogger CSVs are synthesized, anything else is a raw capture"""
+        if filename.endswith(".csv"):
+            return cls.from_csv(filename)
+        with open(filename, "rb") as f:
+            return cls.from_raw(f.read())
+
+
+def _read_csv_distances(filename):
+    """Returns (seconds since the first row, (N, 3) front/left/right cm)"""
+    times = []
+    dists = []
+    with open(filename, newline="") as f:
+        reader = csv.reader(f)
+        next(reader)  # Header
+        for row in reader:
+            h, m, s = row[0].split(":")
+            times.append(int(h) * 3600 + int(m) * 60 + float(s))
+            dists.append((float(row[2]), float(row[3]), float(row[4])))
+
+    times = np.array(times)
+    times[1:] += np.cumsum(np.diff(times) < -43200) * 86400  # Run past midnight
+    return times - times[0], np.array(dists)
+
+
+class ReplaySerial:
+    """
+    pyserial stand-in for LidarStrategy(ser=...).
+    Bytes become readable as their recorded arrival time passes,
+    scaled by speed (2.0 = twice as fast, 0 = everything at once).
+    """
+
+    def __init__(self, stream, speed=1.0, timeout=1.0):
+        self.stream = stream
+        self.speed = speed
+        self.timeout = timeout
+        self.pos = 0
+        self._start = None
+
+    def _arrived(self):
+        if self._start is None:
+            self._start = time.monotonic()
+        if self.speed <= 0:
+            return len(self.stream.data)
+        return self.stream.available((time.monotonic() - self._start) * self.speed)
+
+    @property
+    def exhausted(self):
+        return self.pos >= len(self.stream.data)
+
+    @property
+    def in_waiting(self):
+        return self._arrived() - self.pos
+
+    def read(self, size=1):
+        deadline = time.monotonic() + self.timeout
+        while self.in_waiting < size and not self.exhausted and time.monotonic() < deadline:
+            time.sleep(0.001)
+
+        end = min(self.pos + size, self._arrived())
+        chunk = self.stream.data[self.pos : end]
+        self.pos = end
+        return chunk
+
+    def reset_input_buffer(self):
+        self._start = time.monotonic()
+
+    def close(self):
+        pass
+
+
+class FakeMotorDriver:
+    """
+    MotorDriver without GPIO. Applies every target at once (no ramp)
+    and records (time, left, right) of every command in self.commands.
+    """
+
+    def __init__(self, clock=time.monotonic):
+        self.clock = clock
+        self.commands = []
+        self._pwm = (0.0, 0.0)
+
+    @property
+    def wheel_pwm(self):
+        return self._pwm
+
+    def drive(self, left_speed, right_speed, ramp=True):
+        left_speed = clamp_speed(left_speed)
+        right_speed = clamp_speed(right_speed)
+        self._pwm = (remap_speed(left_speed), remap_speed(right_speed))
+        self.commands.append((self.clock(), left_speed, right_speed))
+
+    def set_speed(self, target_speed, ramp=True):
+        self.drive(target_speed, target_speed, ramp)
+
+    def move(self, speed):
+        self.set_speed(speed)
+
+    def stop(self, force_stop=False):
+        self.drive(0.0, 0.0)
+
+    def wait_idle(self, timeout=None):
+        return True
+
+    def cleanup(self):
+        self.stop()
+        print("[FakeMotorDriver] Driver disabled.")
+
+
+class NullLogger:
+    """ThesisLogger stand-in that drops everything"""
+
+    def log(self, *args, **kwargs):
+        pass
+
+    def close(self):
+        pass
+
+
+class _Clock:
+    """Virtual time for stepped replays"""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def run_replay(
+    stream,
+    logger=None,
+    loop="poll",
+    period=CONTROL_PERIOD_S,
+    min_period=EVENT_MIN_PERIOD_S,
+    watchdog=SENSOR_WATCHDOG_S,
+    profiler=None,
+    mapper=None,
+    odometry=None,
+    steering=steer,
+):
+    """
+    Deterministic replay: steps virtual time, feeds the bytes that arrived in
+    each step to the real LidarStrategy decoder and ticks the real controller.
+    Nothing sleeps, so it runs as fast as the CPU allows.
+    mapper: optional Mapper(autostart=False), fed every revolution in step.
+    odometry: optional Odometry, integrated on every controller tick and used to deskew.
+    steering: the controller's steering law, e.g. a SteeringSurface.
+    Returns (controller, FakeMotorDriver).
+    """
+    clock = _Clock()
+    motion = None if odometry is None else (lambda: (odometry.v, odometry.omega))
+    brain = LidarStrategy(
+        ser=ReplaySerial(stream, speed=0), autostart=False, profiler=profiler, motion=motion
+    )
+    rover = FakeMotorDriver(clock)
+    controller = RoverController(
+        rover, logger or NullLogger(), "replay", watchdog, profiler, odometry, steering
+    )
+    if profiler is not None:
+        profiler.add_counters("packets", brain.stats)
+
+    # poll: fixed rate ticks. event: tick on every chunk that completes a scan
+    if loop == "poll":
+        step_times = np.arange(0.0, stream.duration + period, period)
+    else:
+        step_times = stream.times
+
+    pos = 0
+    last_tick = -np.inf
+    for t in step_times.tolist():
+        clock.now = t
+        end = stream.available(t)
+        if end > pos:
+            brain.feed(stream.data[pos:end], now=t)
+            pos = end
+            if mapper is not None and brain.get_scan() is not None:
+                mapper.update(brain.get_scan())
+
+        snapshot = brain.check_path()
+        if loop == "event":
+            due = snapshot.seq != controller.last_seq or controller.escape.active
+            if not due or t - last_tick < min_period:
+                continue
+            last_tick = t
+
+        controller.tick(snapshot, t)
+
+    return controller, rover
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Replay recorded LiDAR data")
+    parser.add_argument("source", help="ThesisLogger CSV or raw LiDAR capture")
+    parser.add_argument("--loop", choices=["poll", "event"], default="poll")
+    parser.add_argument("--log", action="store_true", help="write a ThesisLogger log")
+    parser.add_argument("--log-delta", action="store_true", help="log only rows that changed")
+    parser.add_argument("--commands", help="write the motor commands to this CSV")
+    parser.add_argument("--stats", action="store_true", help="print stage latencies")
+    parser.add_argument("--map", action="store_true", help="build the occupancy grid too")
+    parser.add_argument("--path", help="write the dead reckoned path to this CSV")
+    parser.add_argument("--steer-table", action="store_true", help="steer with the lookup table")
+    args = parser.parse_args()
+
+    stream = ReplayStream.load(args.source)
+
+    logger = None
+    if args.log:
+        from src.logger import ThesisLogger
+
+        logger = ThesisLogger("replay", delta=args.log_delta)
+
+    t0 = time.perf_counter()
+    profiler = Profiler(report_interval=0) if args.stats else None
+    odometry = Odometry(record_path=bool(args.path))
+    mapper = None
+    if args.map:
+        from src.mapping.mapper import Mapper
+
+        # No time budget: a replay must map every ray to be reproducible
+        mapper = Mapper(
+            pose=lambda: odometry.pose, budget_s=float("inf"), autostart=False, profiler=profiler
+        )
+
+    controller, rover = run_replay(
+        stream,
+        logger,
+        args.loop,
+        profiler=profiler,
+        mapper=mapper,
+        odometry=odometry,
+        steering=SteeringSurface() if args.steer_table else steer,
+    )
+    elapsed = time.perf_counter() - t0
+
+    if logger:
+        logger.close()
+
+    print(f"[Replay] {os.path.basename(args.source)}: {stream.duration:.1f}s of data")
+    print(f"[Replay] {len(rover.commands)} motor commands, {controller.escape.count} escapes")
+    print(
+        f"[Replay] Driven {odometry.distance / 100:.1f}m, end pose "
+        f"x={odometry.x:.0f}cm y={odometry.y:.0f}cm heading={np.degrees(odometry.heading):.0f}deg"
+    )
+    print(f"[Replay] {elapsed:.2f}s wall time ({stream.duration / elapsed:.0f}x real time)")
+
+    if mapper is not None:
+        front = mapper.nearest_obstacle()
+        print(f"[Replay] Map: {len(mapper.grid.obstacles)} occupied cells, nearest ahead {front:.1f}cm")
+        mapper.stop()
+
+    if profiler is not None:
+        print(f"[STATS]\n{profiler.format_summary()}")
+
+    if args.commands:
+        with open(args.commands, "w", newline="") as f:
+            writer = csv.writer(f)
+            writer.writerow(["Time_s", "Left", "Right"])
+            writer.writerows(rover.commands)
+
+    if args.path:
+        with open(args.path, "w", newline="") as f:
+            writer = csv.writer(f)
+            writer.writerow(["Time_s", "X_cm", "Y_cm", "Heading_rad"])
+            writer.writerows(odometry.path)
+
+
+if __name__ == "__main__":
+    main()
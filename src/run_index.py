@@ -0,0 +1,141 @@
+import json
+import math
+import os
+import sys
+from datetime import datetime, timedelta
+
+from src.log_analysis import list_logs, load_logs, run_name, run_summary
+from src.constants import LOG_DIR, LOG_CACHE_DIR, LOG_INDEX_FILE
+
+# Index entry field <- run_summary() column
+_FIELDS = {
+    "rows": "Rows",
+    "duration_s": "Duration_s",
+    "rate_hz": "Rate_Hz",
+    "interval_p50_ms": "Interval_p50_ms",
+    "interval_p99_ms": "Interval_p99_ms",
+    "escapes": "Escapes",
+    "min_front_cm": "Min_Front_cm",
+    "min_side_cm": "Min_Side_cm",
+    "mean_speed": "Mean_Speed",
+    "loop_hz_mean": "Loop_Hz_mean",
+}
+
+
+def _stamp(filename):
+    st = os.stat(filename)
+    return st.st_size, int(st.st_mtime)
+
+
+def _number(value):
+    """JSON friendly: plain int/float, NaN becomes None"""
+    value = float(value)
+    if math.isnan(value):
+        return None
+    return int(value) if value.is_integer() else round(value, 3)
+
+
+def _start_time(filename, first_time_s):
+    """Run start from the date in the file name and the time of day of the first row"""
+    created = datetime.strptime(run_name(filename)[-15:], "%Y%m%d_%H%M%S")
+    start = datetime(created.year, created.month, created.day) + timedelta(seconds=first_time_s)
+    if start < created - timedelta(hours=12):
+        start += timedelta(days=1)  # First row after midnight
+    return start
+
+
+def summarize_runs(files, cache_dir=LOG_CACHE_DIR):
+    """Index entries of the given log files, parsed in one pass"""
+    df = load_logs(files, cache_dir=cache_dir)
+    summary = run_summary(df)
+    first_times = df.groupby("Run", sort=False)["Time_s"].first()
+
+    entries = {}
+    for f in files:
+        name = run_name(f)
+        size, mtime = _stamp(f)
+        entry = {"file": os.path.basename(f), "size": size, "mtime": mtime}
+
+        if name in summary.index:
+            row = summary.loc[name]
+            start = _start_time(f, first_times[name])
+            end = start + timedelta(seconds=float(row["Duration_s"]))
+            entry["mode"] = row["Mode"]
+            entry["start"] = start.isoformat(timespec="milliseconds")
+            entry["end"] = end.isoformat(timespec="milliseconds")
+            entry.update({key: _number(row[col]) for key, col in _FIELDS.items()})
+        else:
+            entry["mode"] = name.split("_")[2]
+            entry["rows"] = 0  # Header only
+
+        entries[name] = entry
+    return entries
+
+
+def load_index(index_file=LOG_INDEX_FILE):
+    """{run name: entry}, empty if there is no index yet"""
+    try:
+        with open(index_file) as f:
+            return json.load(f)
+    except (FileNotFoundError, ValueError):
+        return {}
+
+
+def save_index(index, index_file=LOG_INDEX_FILE):
+    # Write to a temp file first so a crash never leaves half an index behind
+    tmp = index_file + ".tmp"
+    with open(tmp, "w") as f:
+        json.dump(index, f, indent=1, sort_keys=True)
+    os.replace(tmp, index_file)
+
+
+def update_index(files=None, log_dir=LOG_DIR, index_file=LOG_INDEX_FILE, cache_dir=LOG_CACHE_DIR):
+    """
+    Brings the index up to date and returns it.
+    files=None scans log_dir: new or changed logs are summarized, deleted ones dropped.
+    With a list of files only those are (re)summarized, e.g. from ThesisLogger.close().
+    """
+    index = load_index(index_file)
+
+    if files is None:
+        files = list_logs(log_dir)
+        present = {run_name(f) for f in files}
+        for name in [n for n in index if n not in present]:
+            del index[name]
+
+    stale = []
+    for f in files:
+        entry = index.get(run_name(f))
+        if entry is None or (entry["size"], entry["mtime"]) != _stamp(f):
+            stale.append(f)
+
+    if stale:
+        index.update(summarize_runs(stale, cache_dir))
+        save_index(index, index_file)
+    elif not os.path.exists(index_file):
+        save_index(index, index_file)
+    return index
+
+
+def latest_run(index, mode=None):
+    """Name of the newest run (optionally of one mode), None if there is none"""
+    names = [n for n, e in index.items() if e.get("rows") and (mode is None or e["mode"] == mode)]
+    return max(names, key=lambda n: n[-15:], default=None)
+
+
+def index_frame(index):
+    """The index as a DataFrame, one row per run, oldest first"""
+    import pandas as pd
+
+    df = pd.DataFrame.from_dict(index, orient="index")
+    return df.loc[sorted(df.index, key=lambda n: n[-15:])] if len(df) else df
+
+
+if __name__ == "__main__":
+    # python -m src.run_index [log files...]
+    import pandas as pd
+
+    index = update_index(sys.argv[1:] or None)
+    columns = ["mode", "start", "rows", "rate_hz", "escapes", "min_front_cm", "min_side_cm"]
+    with pd.option_context("display.width", 200, "display.max_columns", None):
+        print(index_frame(index).reindex(columns=columns))
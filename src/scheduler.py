@@ -0,0 +1,75 @@
+from src.constants import (
+    SLOWDOWN_DIST_CM,
+    CRITICAL_DIST_CM,
+    ADAPTIVE_MIN_RATE_HZ,
+    ADAPTIVE_MAX_RATE_HZ,
+    ADAPTIVE_STEP_CM,
+    ADAPTIVE_RELEASE_S,
+    ADAPTIVE_TICKS_PER_SNAPSHOT,
+)
+
+
+class AdaptiveRate:
+    """
+    Control loop rate that follows the situation instead of a fixed 60 Hz.
+
+    Target rate: the highest of
+    - min_rate (open space, standing still)
+    - proximity: min_rate at SLOWDOWN_DIST_CM rising linearly to max_rate at
+      CRITICAL_DIST_CM of front distance
+    - speed: enough ticks that the rover moves at most step_cm between two
+    - max_rate while an escape maneuver runs (it is timed)
+    clamped to [min_rate, max_rate]. Outside an escape it is also capped at
+    ticks_per_snapshot times the sensor's snapshot rate: the ticks between two
+    snapshots only shorten the delay until a new one is acted on, more would
+    just see the same snapshot again. min_rate stays a hard floor.
+    The rate follows a higher target at once and a lower one with the time
+    constant `release`, so it does not drop right after a close reading.
+    """
+
+    def __init__(
+        self,
+        min_rate=ADAPTIVE_MIN_RATE_HZ,
+        max_rate=ADAPTIVE_MAX_RATE_HZ,
+        step_cm=ADAPTIVE_STEP_CM,
+        release=ADAPTIVE_RELEASE_S,
+        slowdown_dist=SLOWDOWN_DIST_CM,
+        critical_dist=CRITICAL_DIST_CM,
+        ticks_per_snapshot=ADAPTIVE_TICKS_PER_SNAPSHOT,
+    ):
+        if not 0 < min_rate <= max_rate:
+            raise ValueError(f"Invalid rate limits: {min_rate} - {max_rate} Hz")
+        self.min_rate = min_rate
+        self.max_rate = max_rate
+        self.step_cm = step_cm
+        self.release = release
+        self.slowdown_dist = slowdown_dist
+        self.critical_dist = critical_dist
+        self.ticks_per_snapshot = ticks_per_snapshot
+        self.rate = min_rate
+
+    def target(self, front, speed_cm_s=0.0, escaping=False, sensor_rate=0.0):
+        """Rate (Hz) the situation asks for. sensor_rate: new snapshots per second, 0 = unknown"""
+        if escaping:
+            return self.max_rate  # The maneuver is timed, it needs the ticks
+
+        span = max(self.slowdown_dist - self.critical_dist, 1e-9)
+        closeness = min(max((self.slowdown_dist - front) / span, 0.0), 1.0)
+        proximity = self.min_rate + closeness * (self.max_rate - self.min_rate)
+        moving = abs(speed_cm_s) / self.step_cm
+
+        rate = min(max(proximity, moving), self.max_rate)
+        if sensor_rate > 0:
+            rate = min(rate, sensor_rate * self.ticks_per_snapshot)
+        return max(rate, self.min_rate)
+
+    def update(self, front, speed_cm_s=0.0, escaping=False, sensor_rate=0.0):
+        """Call once per tick. Returns the period (s) until the next tick."""
+        target = self.target(front, speed_cm_s, escaping, sensor_rate)
+        if target >= self.rate:
+            self.rate = target
+        else:
+            # One period of the current rate has passed since the last update
+            decay = min(1.0 / (self.rate * self.release), 1.0) if self.release > 0 else 1.0
+            self.rate += (target - self.rate) * decay
+        return 1.0 / self.rate
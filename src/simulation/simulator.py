@@ -0,0 +1,154 @@
+import contextlib
+import functools
+import io
+from collections import namedtuple
+
+import numpy as np
+
+from src.controller import RoverController
+from src.interfaces import SensorSnapshot
+from src.lidar_only.sector_table import SectorTable
+from src.motor_model import clamp_speed, remap_speed
+from src.odometry import Odometry
+from src.replay import NullLogger
+from src.steering import SteeringParams, steer
+from src.constants import (
+    DEFAULT_SPEED,
+    SLOWDOWN_DIST_CM,
+    CRITICAL_DIST_CM,
+    STEER_SENSITIVITY,
+    CONTROL_PERIOD_S,
+    RAMP_RATE_PER_S,
+    SIM_DURATION_S,
+    SIM_ROVER_RADIUS_CM,
+    SIM_SCAN_RATE_HZ,
+    SIM_SCAN_POINTS,
+    SIM_RANGE_NOISE_CM,
+    SIM_DROPOUT,
+    SIM_START_CLEARANCE_CM,
+)
+
+SimParams = namedtuple(
+    "SimParams",
+    ["default_speed", "slowdown_dist", "critical_dist", "sensitivity"],
+    defaults=(DEFAULT_SPEED, SLOWDOWN_DIST_CM, CRITICAL_DIST_CM, STEER_SENSITIVITY),
+)
+SimParams.__doc__ = "The constants a simulation sweep tunes, defaults from constants.py"
+
+EpisodeResult = namedtuple(
+    "EpisodeResult",
+    ["world", "seed", "collided", "time_s", "distance_cm", "escapes"],
+)
+
+
+class SimMotorDriver:
+    """
+    MotorDriver without GPIO, on simulated time: the same dead zone remap
+    and the same per wheel ramp, advanced by step() instead of a thread.
+    """
+
+    def __init__(self, ramp_rate=RAMP_RATE_PER_S):
+        self.ramp_rate = ramp_rate
+        self._current = [0.0, 0.0]
+        self._target = [0.0, 0.0]
+
+    @property
+    def wheel_pwm(self):
+        return tuple(self._current)
+
+    def step(self, dt):
+        """Moves every wheel towards its target by at most ramp_rate * dt"""
+        max_step = self.ramp_rate * dt
+        for wheel in (0, 1):
+            diff = self._target[wheel] - self._current[wheel]
+            if abs(diff) <= max_step:
+                self._current[wheel] = self._target[wheel]
+            else:
+                self._current[wheel] += max_step if diff > 0 else -max_step
+
+    def drive(self, left_speed, right_speed, ramp=True):
+        self._target = [remap_speed(clamp_speed(left_speed)), remap_speed(clamp_speed(right_speed))]
+        if not ramp:
+            self._current = list(self._target)
+
+    def set_speed(self, target_speed, ramp=True):
+        self.drive(target_speed, target_speed, ramp)
+
+    def move(self, speed):
+        self.set_speed(speed)
+
+    def stop(self, force_stop=False):
+        self.drive(0.0, 0.0, ramp=not force_stop)
+
+    def wait_idle(self, timeout=None):
+        return True
+
+    def cleanup(self):
+        self.stop(force_stop=True)
+
+
+def run_episode(params, world, seed=0, duration=SIM_DURATION_S, quiet=True):
+    """
+    Drives the real RoverController through `world` for `duration` simulated
+    seconds from a random start pose (seeded). Stops at the first collision.
+    The true motion is Odometry's kinematic model fed with the ramped PWM,
+    the LiDAR is a noisy raycast reduced to sectors like LidarStrategy.
+    Returns an EpisodeResult.
+    """
+    rng = np.random.default_rng(seed)
+    sectors = SectorTable()
+    angles = np.arange(SIM_SCAN_POINTS) * (360.0 / SIM_SCAN_POINTS)
+
+    truth = Odometry()
+    truth.reset(*world.random_pose(rng, SIM_START_CLEARANCE_CM))
+    rover = SimMotorDriver()
+    steering = functools.partial(
+        steer,
+        params=SteeringParams(
+            default_speed=params.default_speed,
+            slowdown_dist=params.slowdown_dist,
+            sensitivity=params.sensitivity,
+        ),
+    )
+    controller = RoverController(
+        rover,
+        NullLogger(),
+        "sim",
+        steering=steering,
+        critical_dist=params.critical_dist,
+    )
+
+    snapshot = SensorSnapshot.create(0, 0.0, {})
+    scan_period = 1.0 / SIM_SCAN_RATE_HZ
+    next_scan = 0.0
+    ticks = int(duration / CONTROL_PERIOD_S)
+    collided = False
+    t = 0.0
+
+    # The controller prints every escape, thousands of episodes would flood the terminal
+    output = contextlib.redirect_stdout(io.StringIO()) if quiet else contextlib.nullcontext()
+    with output:
+        for i in range(ticks + 1):
+            t = i * CONTROL_PERIOD_S
+            rover.step(CONTROL_PERIOD_S)
+            truth.update(t, *rover.wheel_pwm)
+            if world.clearance(truth.x, truth.y) < SIM_ROVER_RADIUS_CM:
+                collided = True
+                break
+
+            if t >= next_scan:
+                distances = world.scan(truth.pose, angles, rng, SIM_RANGE_NOISE_CM, SIM_DROPOUT)
+                closest, confidence, counts = sectors.reduce(angles, distances)
+                snapshot = SensorSnapshot.create(
+                    snapshot.seq + 1,
+                    t,
+                    zip(sectors.names, closest.tolist()),
+                    zip(sectors.names, confidence.tolist()),
+                    zip(sectors.names, counts.tolist()),
+                    source="sim",
+                )
+                next_scan += scan_period
+
+            controller.tick(snapshot, t)
+
+    return EpisodeResult(world.name, seed, collided, t, truth.distance, controller.escape.count)
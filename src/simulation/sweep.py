@@ -0,0 +1,126 @@
+import argparse
+import csv
+import itertools
+import multiprocessing
+import os
+import time
+from collections import namedtuple
+
+import numpy as np
+
+from src.simulation.simulator import SimParams, run_episode
+from src.simulation.world import WORLDS
+from src.constants import SIM_DURATION_S, SIM_EPISODES
+
+SweepResult = namedtuple(
+    "SweepResult",
+    ["params", "episodes", "collision_rate", "mean_speed_cm_s", "escapes", "escapes_per_min"],
+)
+
+
+def _run_job(job):
+    """Pool worker: one episode. Worlds are built here, only names and seeds are pickled."""
+    index, params, world_name, seed, duration = job
+    world = WORLDS[world_name](np.random.default_rng(seed))
+    return index, run_episode(params, world, seed, duration)
+
+
+def summarize(params, results):
+    """Aggregates the EpisodeResults of one parameter set"""
+    total_time = sum(r.time_s for r in results)
+    escapes = sum(r.escapes for r in results)
+    return SweepResult(
+        params,
+        len(results),
+        sum(r.collided for r in results) / len(results),
+        sum(r.distance_cm for r in results) / max(total_time, 1e-9),
+        escapes / len(results),
+        escapes / max(total_time / 60.0, 1e-9),
+    )
+
+
+def sweep(param_sets, worlds=tuple(WORLDS), episodes=SIM_EPISODES, duration=SIM_DURATION_S, processes=None):
+    """
+    Runs `episodes` seeds in every world for every parameter set on a process
+    pool (processes=None: all cores, 1: in this process).
+    Every parameter set sees the same worlds and start poses, so differences
+    come from the parameters and not from luck.
+    Returns one SweepResult per parameter set, in order.
+    """
+    param_sets = list(param_sets)
+    jobs = [
+        (i, params, world, seed, duration)
+        for i, params in enumerate(param_sets)
+        for world in worlds
+        for seed in range(episodes)
+    ]
+
+    per_set = [[] for _ in param_sets]
+    if processes == 1:
+        for job in jobs:
+            i, result = _run_job(job)
+            per_set[i].append(result)
+    else:
+        with multiprocessing.Pool(processes) as pool:
+            chunk = max(1, len(jobs) // (4 * (processes or os.cpu_count() or 1)))
+            for i, result in pool.imap_unordered(_run_job, jobs, chunksize=chunk):
+                per_set[i].append(result)
+
+    return [summarize(params, results) for params, results in zip(param_sets, per_set)]
+
+
+def grid(**ranges):
+    """Every combination of the given SimParams field ranges, e.g. grid(sensitivity=[...])"""
+    names = list(ranges)
+    return [SimParams()._replace(**dict(zip(names, values))) for values in itertools.product(*ranges.values())]
+
+
+def main():
+    defaults = SimParams()
+    parser = argparse.ArgumentParser(description="Tune the driving constants in simulation")
+    parser.add_argument("--speed", type=float, nargs="+", default=[0.4, defaults.default_speed, 0.7])
+    parser.add_argument("--slowdown", type=float, nargs="+", default=[40.0, defaults.slowdown_dist, 70.0])
+    parser.add_argument("--critical", type=float, nargs="+", default=[10.0, defaults.critical_dist, 20.0])
+    parser.add_argument("--sensitivity", type=float, nargs="+", default=[0.0025, defaults.sensitivity, 0.01])
+    parser.add_argument("--worlds", nargs="+", choices=sorted(WORLDS), default=sorted(WORLDS))
+    parser.add_argument("--episodes", type=int, default=SIM_EPISODES, help="seeds per world")
+    parser.add_argument("--duration", type=float, default=SIM_DURATION_S, help="simulated seconds")
+    parser.add_argument("--processes", type=int, help="worker processes (default: all cores)")
+    parser.add_argument("--csv", help="write all results to this CSV")
+    parser.add_argument("--top", type=int, default=10, help="parameter sets to print")
+    args = parser.parse_args()
+
+    param_sets = grid(
+        default_speed=args.speed,
+        slowdown_dist=args.slowdown,
+        critical_dist=args.critical,
+        sensitivity=args.sensitivity,
+    )
+    n = len(param_sets) * len(args.worlds) * args.episodes
+    print(f"[Sweep] {len(param_sets)} parameter sets, {n} episodes of {args.duration:.0f}s")
+
+    t0 = time.perf_counter()
+    results = sweep(param_sets, args.worlds, args.episodes, args.duration, args.processes)
+    elapsed = time.perf_counter() - t0
+    print(f"[Sweep] {elapsed:.1f}s wall time ({n * args.duration / elapsed:.0f}x real time)")
+
+    if args.csv:
+        with open(args.csv, "w", newline="") as f:
+            writer = csv.writer(f)
+            writer.writerow(list(SimParams._fields) + list(SweepResult._fields[1:]))
+            for r in results:
+                writer.writerow(list(r.params) + list(r[1:]))
+
+    # Safest first, then fastest
+    ranked = sorted(results, key=lambda r: (r.collision_rate, -r.mean_speed_cm_s))
+    print(f"{'speed':>6} {'slowdn':>6} {'crit':>5} {'sens':>7} | {'coll%':>6} {'cm/s':>6} {'esc':>5} {'esc/min':>7}")
+    for r in ranked[: args.top]:
+        p = r.params
+        print(
+            f"{p.default_speed:6.2f} {p.slowdown_dist:6.0f} {p.critical_dist:5.0f} {p.sensitivity:7.4f} | "
+            f"{r.collision_rate * 100:6.1f} {r.mean_speed_cm_s:6.1f} {r.escapes:5.1f} {r.escapes_per_min:7.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
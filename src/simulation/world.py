@@ -0,0 +1,126 @@
+import numpy as np
+
+from src.constants import MAX_VALID_DIST_CM
+
+
+class World:
+    """
+    Flat 2D world made of polygon walls, cm, the same frame as Odometry
+    (x, y, heading counter-clockwise).
+    polygons: lists of (x, y) vertices, each closed implicitly. The first one
+    is the outer wall, the others are obstacles inside it.
+    """
+
+    def __init__(self, polygons, name=""):
+        self.name = name
+        self.polygons = [np.asarray(p, dtype=float) for p in polygons]
+
+        # All edges as (M, 2) start points and (M, 2) edge vectors
+        starts = np.concatenate(self.polygons)
+        ends = np.concatenate([np.roll(p, -1, axis=0) for p in self.polygons])
+        self.starts = starts
+        self.edges = ends - starts
+        self._edge_len2 = np.maximum((self.edges**2).sum(axis=1), 1e-12)
+
+        outer = self.polygons[0]
+        self.bounds = (outer.min(axis=0), outer.max(axis=0))
+
+    def raycast(self, x, y, directions):
+        """
+        Distance (cm) along every direction (rad, world frame) to the nearest wall,
+        np.inf where a ray hits nothing.
+        """
+        return self._hits(x, y, directions).min(axis=1)
+
+    def _hits(self, x, y, directions):
+        """(rays, edges) distance along every ray to every edge it crosses, np.inf if none"""
+        dx = np.cos(directions)[:, None]
+        dy = np.sin(directions)[:, None]
+        ex = self.edges[:, 0]
+        ey = self.edges[:, 1]
+        ax = self.starts[:, 0] - x
+        ay = self.starts[:, 1] - y
+
+        # origin + t * d = start + u * e, for all (ray, edge) pairs at once
+        denom = dx * ey - dy * ex
+        with np.errstate(divide="ignore", invalid="ignore"):
+            t = (ax * ey - ay * ex) / denom
+            u = (ax * dy - ay * dx) / denom
+        return np.where((denom != 0) & (t > 0) & (u >= 0) & (u < 1), t, np.inf)
+
+    def scan(self, pose, angles, rng=None, noise_cm=0.0, dropout=0.0):
+        """
+        One emulated LiDAR revolution from pose (x, y, heading).
+        angles: rover frame degrees like the sectors (0 = front, clockwise).
+        Returns distances in cm, 0 = no return (out of range or dropped).
+        """
+        x, y, heading = pose
+        dist = self.raycast(x, y, heading - np.radians(angles))
+        if rng is not None:
+            if noise_cm:
+                dist = dist + rng.normal(0.0, noise_cm, dist.size)
+            if dropout:
+                dist[rng.random(dist.size) < dropout] = 0.0
+        return np.where((dist > 0) & (dist < MAX_VALID_DIST_CM), dist, 0.0)
+
+    def clearance(self, x, y):
+        """Distance (cm) from the point to the nearest wall"""
+        px = x - self.starts[:, 0]
+        py = y - self.starts[:, 1]
+        u = np.clip((px * self.edges[:, 0] + py * self.edges[:, 1]) / self._edge_len2, 0.0, 1.0)
+        cx = px - u * self.edges[:, 0]
+        cy = py - u * self.edges[:, 1]
+        return float(np.sqrt((cx**2 + cy**2).min()))
+
+    def is_free(self, x, y):
+        """Inside the outer wall and outside every obstacle (odd number of wall crossings)"""
+        # An odd angle, so the ray does not run through vertices of axis aligned walls
+        crossings = np.isfinite(self._hits(x, y, np.array([0.7317]))).sum()
+        return bool(crossings % 2)
+
+    def random_pose(self, rng, clearance):
+        """Random free pose at least `clearance` cm away from every wall"""
+        low, high = self.bounds
+        for _ in range(10000):
+            x, y = rng.uniform(low, high)
+            if self.is_free(x, y) and self.clearance(x, y) >= clearance:
+                return (float(x), float(y), float(rng.uniform(-np.pi, np.pi)))
+        raise ValueError(f"No free start pose in world {self.name!r}")
+
+
+def box(x, y, w, h):
+    """Axis aligned rectangle with its lower left corner at (x, y)"""
+    return [(x, y), (x + w, y), (x + w, y + h), (x, y + h)]
+
+
+def room(rng=None):
+    """4 x 3 m room with three boxes"""
+    return World(
+        [box(0, 0, 400, 300), box(120, 80, 40, 40), box(260, 180, 60, 30), box(60, 220, 30, 50)],
+        "room",
+    )
+
+
+def corridor(rng=None):
+    """L shaped corridor, 90 cm wide, with a pillar in the corner"""
+    return World(
+        [
+            [(0, 0), (500, 0), (500, 400), (410, 400), (410, 90), (0, 90)],
+            box(440, 30, 20, 20),
+        ],
+        "corridor",
+    )
+
+
+def clutter(rng):
+    """5 x 5 m room with 6-12 random boxes, a different layout per seed"""
+    polygons = [box(0, 0, 500, 500)]
+    for _ in range(int(rng.integers(6, 13))):
+        w, h = rng.uniform(15, 70, 2)
+        x, y = rng.uniform(20, 480 - w), rng.uniform(20, 480 - h)
+        polygons.append(box(x, y, w, h))
+    return World(polygons, "clutter")
+
+
+# name -> factory(rng) -> World
+WORLDS = {"room": room, "corridor": corridor, "clutter": clutter}
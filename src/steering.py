@@ -0,0 +1,193 @@
+import sys
+from collections import namedtuple
+
+import numpy as np
+
+from src.constants import (
+    DEFAULT_SPEED,
+    MIN_APPROACH_SPEED,
+    STEER_SENSITIVITY,
+    OBSTACLE_AVOIDANCE_BIAS,
+    STEER_MAX_TURN,
+    STEER_TABLE_RESOLUTION_CM,
+    SLOWDOWN_DIST_CM,
+    SIDE_CUSHION_DIST_CM,
+)
+
+SteeringParams = namedtuple(
+    "SteeringParams",
+    [
+        "default_speed",
+        "min_approach_speed",
+        "slowdown_dist",
+        "side_cushion",
+        "sensitivity",
+        "avoidance_bias",
+        "max_turn",
+    ],
+    defaults=(
+        DEFAULT_SPEED,
+        MIN_APPROACH_SPEED,
+        SLOWDOWN_DIST_CM,
+        SIDE_CUSHION_DIST_CM,
+        STEER_SENSITIVITY,
+        OBSTACLE_AVOIDANCE_BIAS,
+        STEER_MAX_TURN,
+    ),
+)
+SteeringParams.__doc__ = """
+Parameters of the proportional differential steering law.
+Any field may be a NumPy array for steer_batch(), e.g. shape (P, 1)
+to evaluate P parameter sets against N logged inputs at once.
+"""
+
+DEFAULT_PARAMS = SteeringParams()
+
+
+def steer(front, left, right, params=DEFAULT_PARAMS):
+    """One tick: (left_motor, right_motor) for the sector distances (cm)"""
+    if front > params.slowdown_dist:
+        base_speed = params.default_speed
+    else:
+        base_speed = params.min_approach_speed
+
+    # GENTLE STEERING
+    turn_val = 0.0
+
+    if left < params.side_cushion:
+        turn_val += (params.side_cushion - left) * params.sensitivity  # Nudge Right
+
+    if right < params.side_cushion:
+        turn_val -= (params.side_cushion - right) * params.sensitivity  # Nudge Left
+
+    # Start steering away slightly before we hit the slowdown zone
+    if front < params.slowdown_dist:
+        if left < right:
+            turn_val += params.avoidance_bias
+        else:
+            turn_val -= params.avoidance_bias
+
+    turn_val = max(-params.max_turn, min(turn_val, params.max_turn))
+
+    return base_speed + turn_val, base_speed - turn_val
+
+
+def steer_batch(front, left, right, params=DEFAULT_PARAMS):
+    """
+    steer() over whole arrays: inputs and parameter fields broadcast against
+    each other. Returns (left_motor, right_motor) arrays.
+    """
+    front = np.asarray(front, dtype=float)
+    left = np.asarray(left, dtype=float)
+    right = np.asarray(right, dtype=float)
+    p = params
+
+    base_speed = np.where(front > p.slowdown_dist, p.default_speed, p.min_approach_speed)
+
+    turn_val = np.maximum(p.side_cushion - left, 0.0) * p.sensitivity
+    turn_val = turn_val - np.maximum(p.side_cushion - right, 0.0) * p.sensitivity
+
+    bias = np.where(left < right, p.avoidance_bias, -np.asarray(p.avoidance_bias))
+    turn_val = turn_val + np.where(front < p.slowdown_dist, bias, 0.0)
+
+    turn_val = np.clip(turn_val, -np.asarray(p.max_turn), p.max_turn)
+
+    return base_speed + turn_val, base_speed - turn_val
+
+
+class SteeringSurface:
+    """
+    The steering law precomputed on a (front, left, right) grid, so a tick
+    costs one table lookup instead of the branches.
+    Cells hold the law's value at their centre, so the slowdown threshold
+    stays exact when it is a multiple of the resolution (bar front exactly
+    equal to it, which the law treats as a regime of its own), and the side nudge
+    is off by at most sensitivity * resolution / 2. Which side is closer is
+    decided on the raw inputs (a last table axis), not on the cells.
+    Inputs beyond the grid are clamped to its edge: past slowdown_dist (front)
+    and side_cushion (sides) only that comparison still matters.
+    """
+
+    def __init__(self, params=DEFAULT_PARAMS, resolution=STEER_TABLE_RESOLUTION_CM, law=steer_batch):
+        self.params = params
+        self.resolution = resolution
+        self._scale = 1.0 / resolution
+
+        front = np.arange(0.0, params.slowdown_dist + 2 * resolution, resolution) + resolution / 2
+        side = np.arange(0.0, params.side_cushion + 2 * resolution, resolution) + resolution / 2
+        f, l, r = np.meshgrid(front, side, side, indexing="ij")
+
+        # Last axis: [left >= right, left < right]. Both only differ where
+        # left and right fall into the same cell, a nudge breaks the tie.
+        tie_break = resolution * 1e-6
+        cells = [law(f, l, r, params), law(f, l, r + tie_break, params)]
+        self.table = np.stack(
+            [np.stack(motors, axis=-1) for motors in cells], axis=-2
+        ).astype(np.float32)
+        self.table.flags.writeable = False
+
+        # The lookup itself stays in plain Python, indexing a NumPy array per tick is slower
+        self._cells = [tuple(cell) for cell in self.table.reshape(-1, 2).tolist()]
+        self._max = (len(front) - 1, len(side) - 1)
+        self._strides = (len(side) * len(side) * 2, len(side) * 2, 2)
+
+    def __call__(self, front, left, right):
+        max_front, max_side = self._max
+        front_stride, left_stride, right_stride = self._strides
+        i = min(max(int(front * self._scale), 0), max_front)
+        j = min(max(int(left * self._scale), 0), max_side)
+        k = min(max(int(right * self._scale), 0), max_side)
+        return self._cells[i * front_stride + j * left_stride + k * right_stride + (left < right)]
+
+
+def sweep(front, left, right, **ranges):
+    """
+    Evaluates every combination of the given parameter ranges against the
+    logged inputs, e.g. sweep(f, l, r, sensitivity=[...], avoidance_bias=[...]).
+    Returns (list of SteeringParams, left_motor, right_motor) with arrays of
+    shape (combinations, samples).
+    """
+    names = list(ranges)
+    grids = np.meshgrid(*[np.asarray(ranges[n], dtype=float) for n in names], indexing="ij")
+    columns = {n: g.reshape(-1, 1) for n, g in zip(names, grids)}
+
+    params = DEFAULT_PARAMS._replace(**columns)
+    left_motor, right_motor = steer_batch(front, left, right, params)
+    combos = [
+        DEFAULT_PARAMS._replace(**{n: float(columns[n][i, 0]) for n in names})
+        for i in range(len(left_motor))
+    ]
+    return combos, left_motor, right_motor
+
+
+if __name__ == "__main__":
+    # python -m src.steering [log files...]: parameter sweep on recorded inputs (default: newest log)
+    import time
+
+    from src.log_analysis import list_logs, load_logs
+
+    df = load_logs(sys.argv[1:] or list_logs()[-1:])
+    df = df[df["Action"] == "DRIVE"]
+    inputs = (df["Front"].to_numpy(), df["Left"].to_numpy(), df["Right"].to_numpy())
+
+    results = []
+    t0 = time.perf_counter()
+    for slowdown in np.arange(30.0, 80.0, 5.0):  # One slice at a time keeps the arrays small
+        combos, left_motor, right_motor = sweep(
+            *inputs,
+            sensitivity=np.linspace(0.001, 0.02, 40),
+            avoidance_bias=np.linspace(0.0, 0.25, 26),
+            slowdown_dist=[slowdown],
+        )
+        turn = (np.abs(left_motor - right_motor) / 2).mean(axis=1)
+        speed = ((left_motor + right_motor) / 2).mean(axis=1)
+        results += zip(combos, turn.tolist(), speed.tolist())
+    elapsed = time.perf_counter() - t0
+
+    print(f"{len(results)} parameter sets x {len(df)} ticks in {elapsed:.2f}s")
+    print("Smoothest steering:")
+    for p, turn, speed in sorted(results, key=lambda x: x[1])[:5]:
+        print(
+            f"sensitivity={p.sensitivity:.4f} bias={p.avoidance_bias:.2f} slowdown={p.slowdown_dist:.0f}"
+            f"  mean |turn|={turn:.3f} mean speed={speed:.3f}"
+        )
@@ -0,0 +1,64 @@
+import sys
+import os
+import time
+import argparse
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from src.camera_only.camera_strategy import CameraStrategy
+from src.camera_only.frame_source import SyntheticSource, open_source
+from src.instrumentation import Profiler
+from src.constants import CAMERA_FPS
+
+# --- BENCHMARK SETTINGS ---
+FRAMES = 300  # Frames for the throughput run
+SECONDS = 5.0  # Length of the live (paced) run
+# ---------------------------
+
+
+def throughput(source):
+    """Processes every frame back to back on this thread: pure CPU cost"""
+    camera = CameraStrategy(source, autostart=False)
+    frames = 0
+    t0 = time.perf_counter()
+    while True:
+        item = source.read()
+        if item is None:
+            break
+        camera.process(*item)
+        frames += 1
+    elapsed = time.perf_counter() - t0
+    print(f"throughput  {frames} frames  {elapsed * 1000:8.1f} ms  {frames / elapsed:8.1f} frames/s")
+
+
+def live(source, seconds):
+    """Runs the capture and processing threads against a paced source"""
+    profiler = Profiler(report_interval=0)
+    camera = CameraStrategy(source, profiler=profiler)
+    time.sleep(seconds)
+    camera.stop()
+
+    stats = profiler.summary()
+    print(
+        f"live        {camera.processed / seconds:8.1f} frames/s processed of "
+        f"{camera.captured / seconds:.1f} captured ({camera.dropped} dropped, step {camera.step})"
+    )
+    for name in ("camera", "frame_age"):
+        s = stats[name]
+        print(f"{name:<11} p50 {s['p50_ms']:7.2f} ms  p99 {s['p99_ms']:7.2f} ms  max {s['max_ms']:7.2f} ms")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        "source", nargs="?", help="directory of frames or video file (default: synthetic)"
+    )
+    parser.add_argument("--fps", type=float, default=CAMERA_FPS, help="live run frame rate")
+    args = parser.parse_args()
+
+    if args.source:
+        throughput(open_source(args.source, fps=0))
+        live(open_source(args.source, fps=args.fps), SECONDS)
+    else:
+        throughput(SyntheticSource(fps=0, frames=FRAMES))
+        live(SyntheticSource(fps=args.fps), SECONDS)
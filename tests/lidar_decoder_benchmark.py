@@ -0,0 +1,161 @@
+import sys
+import os
+import time
+import struct
+import argparse
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import numpy as np
+
+from src.lidar_only.lidar_strategy import LidarStrategy
+from src.lidar_only.packet_decoder import encode_packets
+from src.replay import ReplayStream, ReplaySerial
+from src.constants import (
+    BAUD_RATE,
+    DEFAULT_PORT,
+    HEADER_BYTE_1,
+    HEADER_BYTE_2,
+    PACKET_SIZE,
+    PAYLOAD_SIZE,
+    POINTS_PER_PACKET,
+    ANGLE_DIVISOR,
+    MM_TO_CM,
+    LIDAR_OFFSET_DEG,
+    MAX_VALID_DIST_CM,
+    SECTORS,
+)
+
+# --- BENCHMARK SETTINGS ---
+REVOLUTIONS = 200  # Synthetic stream length (~10 Hz scan -> 20 s of data)
+CHUNK_SIZE = 512  # Roughly what in_waiting holds between two reads
+# ---------------------------
+
+
+def synthesize_stream(revolutions):
+    """A room-like scan: 38 packets per revolution, random distances"""
+    rng = np.random.default_rng(0)
+    packets_per_rev = 38
+    span = 360.0 / packets_per_rev
+
+    starts = np.tile(np.arange(packets_per_rev) * span, revolutions)
+    ends = starts + span * (POINTS_PER_PACKET - 1) / POINTS_PER_PACKET
+    dists = rng.uniform(100, 3000, size=(len(starts), POINTS_PER_PACKET))
+    return encode_packets(starts, ends, dists)
+
+
+def capture_stream(path, seconds):
+    """Records the raw serial stream of the real sensor for later replays"""
+    import serial
+
+    ser = serial.Serial(DEFAULT_PORT, BAUD_RATE, timeout=1)
+    ser.reset_input_buffer()
+    end = time.time() + seconds
+    with open(path, "wb") as f:
+        while time.time() < end:
+            f.write(ser.read(max(1, ser.in_waiting)))
+    ser.close()
+    print(f"Captured {os.path.getsize(path)} bytes to {path}")
+
+
+def legacy_scan(ser):
+    """
+    The original byte-by-byte _scan_loop, kept here as the baseline.
+    Returns the number of points processed.
+    """
+
+    front_start, front_end = SECTORS["FRONT"]
+    left_start, left_end = SECTORS["LEFT"]
+    right_start, right_end = SECTORS["RIGHT"]
+
+    def get_sector(angle):
+        if angle >= front_start or angle < front_end:
+            return "FRONT"
+        elif left_start <= angle < left_end:
+            return "LEFT"
+        elif right_start <= angle < right_end:
+            return "RIGHT"
+        return None
+
+    front_dist = left_dist = right_dist = 999.0
+    points = 0
+    while ser.in_waiting > PACKET_SIZE:
+        if ser.read() == HEADER_BYTE_1 and ser.read() == HEADER_BYTE_2:
+            data = ser.read(PAYLOAD_SIZE)
+            if len(data) != PAYLOAD_SIZE:
+                continue
+
+            start_angle = struct.unpack("<H", data[2:4])[0] / ANGLE_DIVISOR
+            end_angle = struct.unpack("<H", data[40:42])[0] / ANGLE_DIVISOR
+            if end_angle < start_angle:
+                end_angle += 360
+            step = (end_angle - start_angle) / (POINTS_PER_PACKET - 1)
+
+            for i in range(POINTS_PER_PACKET):
+                raw_dist_pos = 4 + (i * 3)
+                dist_mm = struct.unpack("<H", data[raw_dist_pos : raw_dist_pos + 2])[0]
+                dist_cm = dist_mm / MM_TO_CM
+
+                raw_angle = start_angle + (i * step)
+                corrected_angle = (raw_angle + LIDAR_OFFSET_DEG) % 360
+                sector = get_sector(corrected_angle)
+                points += 1
+
+                if 0 < dist_cm < MAX_VALID_DIST_CM:
+                    if sector == "FRONT":
+                        front_dist = dist_cm if dist_cm < front_dist else front_dist + 1
+                    elif sector == "LEFT":
+                        left_dist = dist_cm if dist_cm < left_dist else left_dist + 1
+                    elif sector == "RIGHT":
+                        right_dist = dist_cm if dist_cm < right_dist else right_dist + 1
+    return points
+
+
+def bulk_scan(ser):
+    """Feeds the stream through LidarStrategy.feed in CHUNK_SIZE reads"""
+    brain = LidarStrategy(ser=ser, autostart=False)
+    points = 0
+    while not ser.exhausted:
+        points += brain.feed(ser.read(min(CHUNK_SIZE, ser.in_waiting)))
+    return points
+
+
+def replay(data):
+    """Serves the whole stream at once, so both loops run flat out"""
+    return ReplaySerial(ReplayStream.from_raw(data), speed=0)
+
+
+def run(label, fn, arg):
+    t0 = time.perf_counter()
+    points = fn(arg)
+    elapsed = time.perf_counter() - t0
+    rate = points / elapsed
+    print(f"{label:<8} {points:>9} points  {elapsed * 1000:8.1f} ms  {rate:>12,.0f} points/s")
+    return rate
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("stream", nargs="?", help="raw LiDAR byte capture to replay")
+    parser.add_argument(
+        "--capture", type=float, metavar="SECONDS", help="record the sensor first"
+    )
+    args = parser.parse_args()
+
+    if args.capture:
+        if not args.stream:
+            parser.error("--capture needs a file name")
+        capture_stream(args.stream, args.capture)
+
+    if args.stream:
+        with open(args.stream, "rb") as f:
+            stream = f.read()
+        print(f"Replaying {args.stream} ({len(stream)} bytes)")
+    else:
+        stream = synthesize_stream(REVOLUTIONS)
+        print(f"Replaying synthetic stream ({len(stream)} bytes)")
+
+    sensor_rate = BAUD_RATE / 10 / PACKET_SIZE * POINTS_PER_PACKET
+    legacy = run("legacy", legacy_scan, replay(stream))
+    bulk = run("bulk", bulk_scan, replay(stream))
+    print(f"Speedup: {bulk / legacy:.1f}x  (sensor max ~{sensor_rate:,.0f} points/s)")
@@ -0,0 +1,32 @@
+import os
+import sys
+
+import numpy as np
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from src.camera_only.camera_strategy import CameraStrategy
+from src.camera_only.frame_source import SyntheticSource
+from src.constants import NO_READING_DIST_CM
+
+
+def _scene():
+    """Bright floor, dark box standing on it in the middle of the image"""
+    h, w = 480, 640
+    frame = np.full((h, w, 3), 200, dtype=np.uint8)
+    frame[h // 3 : int(h * 0.8), w // 3 : 2 * w // 3] = 30
+    return frame
+
+
+def test_dark_obstacle_gives_finite_front():
+    camera = CameraStrategy(SyntheticSource(frames=0), autostart=False)
+    camera.process(_scene(), 0.0)
+    front = camera.check_path().front
+    assert front < NO_READING_DIST_CM
+    assert 0 < front < 200
+
+
+def test_empty_floor_reads_nothing():
+    camera = CameraStrategy(SyntheticSource(frames=0), autostart=False)
+    camera.process(np.full((480, 640, 3), 200, dtype=np.uint8), 0.0)
+    assert camera.check_path().front == NO_READING_DIST_CM
@@ -0,0 +1,72 @@
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from src.logger import DeltaFilter
+from src.log_analysis import expand
+from src.constants import LOG_DELTA_DEADBAND_CM, LOG_DELTA_MOTOR, ACTION_DRIVE, ACTION_ESCAPE
+
+RATE_HZ = 60.0
+
+
+def _full_run(seconds=20.0):
+    """Every tick of a run: slowly changing distances, motors and a few escapes"""
+    t = np.arange(int(seconds * RATE_HZ)) * (1.0 / RATE_HZ)
+    front = 120.0 + 60.0 * np.sin(t * 0.3)
+    escaping = (t % 7.0) > 6.0
+    return pd.DataFrame(
+        {
+            "Run": "run",
+            "Action": np.where(escaping, ACTION_ESCAPE, ACTION_DRIVE),
+            "Time_s": 3600.0 + t,
+            "Front": front,
+            "Left": np.round(80.0 + 20.0 * np.cos(t * 0.1)),
+            "Right": np.full(t.size, 90.0),
+            "SpeedL": np.where(escaping, -0.5, np.round(0.6 - front / 1000.0, 2)),
+            "SpeedR": np.where(escaping, 0.5, 0.6),
+            "t": t,
+        }
+    )
+
+
+def _delta(full):
+    delta = DeltaFilter()
+    keep = [
+        delta.keep(r.t, r.Front, r.Left, r.Right, r.SpeedL, r.SpeedR, r.Action, "")
+        for r in full.itertuples()
+    ]
+    return full[keep].reset_index(drop=True)
+
+
+def test_delta_log_expands_back_to_the_full_run():
+    full = _full_run()
+    logged = _delta(full)
+    assert len(logged) < len(full) / 2
+
+    expanded = expand(logged, RATE_HZ)
+    # The grid ends at the last logged row, at most one keyframe before the run did
+    assert len(full) - RATE_HZ <= len(expanded) <= len(full)
+    original = full.iloc[: len(expanded)]
+
+    np.testing.assert_allclose(expanded["t"], original["t"])
+    np.testing.assert_allclose(expanded["Time_s"], original["Time_s"])
+    assert (expanded["Action"] == original["Action"]).all()
+    for col in ["Front", "Left", "Right"]:
+        assert np.abs(expanded[col] - original[col]).max() <= LOG_DELTA_DEADBAND_CM
+    for col in ["SpeedL", "SpeedR"]:
+        assert np.abs(expanded[col] - original[col]).max() <= LOG_DELTA_MOTOR
+
+
+def test_expand_leaves_out_gaps_longer_than_a_keyframe():
+    full = _full_run(5.0)
+    logged = _delta(full)
+    gap = (logged["t"] > 1.0) & (logged["t"] < 4.0)  # Logger stopped for 3 s
+
+    expanded = expand(logged[~gap], RATE_HZ)
+
+    assert not ((expanded["t"] > 2.6) & (expanded["t"] < 4.0)).any()
+    assert (expanded["t"] < 1.0).any() and (expanded["t"] > 4.0).any()
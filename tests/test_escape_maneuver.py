@@ -0,0 +1,119 @@
+import os
+import sys
+
+import pytest
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from src.escape_maneuver import EscapeManeuver, IDLE, BRAKE, REVERSE, PAUSE, PIVOT, SETTLE
+from src.interfaces import SensorSnapshot
+from src.constants import (
+    CRITICAL_DIST_CM,
+    STOPPING_DIST_CM,
+    SLOWDOWN_DIST_CM,
+    ESCAPE_BRAKE_S,
+    ESCAPE_REVERSE_S,
+    ESCAPE_PAUSE_S,
+    ESCAPE_PIVOT_S,
+    ESCAPE_PIVOT_MIN_S,
+    ESCAPE_PIVOT_MAX_S,
+    ESCAPE_SETTLE_S,
+)
+
+TICK_S = 0.01
+
+
+def _snapshot(front=10.0, left=100.0, right=50.0, rear=200.0):
+    return SensorSnapshot.create(
+        1, 0.0, {"FRONT": front, "LEFT": left, "RIGHT": right, "REAR": rear}
+    )
+
+
+def _run(escape, snapshot_at, limit_s=5.0):
+    """Ticks update() from t = 0 until the escape ends. Returns [(t, phase, command)]."""
+    escape.start(0.0)
+    ticks = []
+    for i in range(1, int(limit_s / TICK_S)):
+        t = i * TICK_S
+        command = escape.update(snapshot_at(t), t)
+        ticks.append((t, escape.phase, command))
+        if command is None:
+            break
+    return ticks
+
+
+def _durations(ticks):
+    """Time spent in every phase, from the first to the last tick that saw it plus one tick"""
+    spans = {}
+    for t, phase, _ in ticks:
+        first, _ = spans.get(phase, (t, t))
+        spans[phase] = (first, t)
+    return {phase: last - first + TICK_S for phase, (first, last) in spans.items()}
+
+
+def test_phases_run_in_order_with_their_commands():
+    escape = EscapeManeuver(speed=0.3)
+    ticks = _run(escape, lambda t: _snapshot())
+
+    order = [phase for i, (_, phase, _) in enumerate(ticks) if i == 0 or ticks[i - 1][1] != phase]
+    assert order == [BRAKE, REVERSE, PAUSE, PIVOT, SETTLE, IDLE]
+    assert ticks[-1][2] is None
+    assert not escape.active
+    assert escape.count == 1
+
+    commands = {phase: command for _, phase, command in ticks}
+    assert commands[REVERSE] == (-0.3, -0.3)
+    assert commands[PIVOT] == (-0.3, 0.3)  # LEFT is the more open side
+    assert commands[BRAKE] == commands[PAUSE] == commands[SETTLE] == (0.0, 0.0)
+
+    durations = _durations(ticks)
+    assert durations[BRAKE] == pytest.approx(ESCAPE_BRAKE_S, abs=2 * TICK_S)
+    assert durations[REVERSE] == pytest.approx(ESCAPE_REVERSE_S, abs=2 * TICK_S)
+    assert durations[PAUSE] == pytest.approx(ESCAPE_PAUSE_S, abs=2 * TICK_S)
+    assert durations[SETTLE] == pytest.approx(ESCAPE_SETTLE_S, abs=2 * TICK_S)
+
+
+def test_pivot_turns_towards_the_side_open_after_the_pause():
+    escape = EscapeManeuver(speed=0.3)
+    ticks = _run(escape, lambda t: _snapshot(left=30.0, right=120.0))
+
+    assert {command for _, phase, command in ticks if phase == PIVOT} == {(0.3, -0.3)}
+
+
+def test_reverse_is_cut_short_when_the_rear_gets_critical():
+    blocked_at = ESCAPE_BRAKE_S + 0.2
+    escape = EscapeManeuver()
+    ticks = _run(escape, lambda t: _snapshot(rear=CRITICAL_DIST_CM - 1 if t >= blocked_at else 200.0))
+
+    reverse_end = max(t for t, phase, _ in ticks if phase == REVERSE)
+    assert reverse_end < blocked_at
+    assert _durations(ticks)[REVERSE] < ESCAPE_REVERSE_S / 2
+
+
+@pytest.mark.parametrize(
+    "front, pivot_s",
+    [
+        (CRITICAL_DIST_CM - 5, ESCAPE_PIVOT_MAX_S),  # Still blocked: extended, but not forever
+        ((STOPPING_DIST_CM + SLOWDOWN_DIST_CM) / 2, ESCAPE_PIVOT_S),  # Clear enough: as planned
+        (SLOWDOWN_DIST_CM + 50, ESCAPE_PIVOT_MIN_S),  # Wide open: ends early
+    ],
+)
+def test_pivot_length_follows_the_front(front, pivot_s):
+    escape = EscapeManeuver()
+    # Blocked until the pivot starts, then the front the pivot turned to
+    pivot_start = ESCAPE_BRAKE_S + ESCAPE_REVERSE_S + ESCAPE_PAUSE_S
+    ticks = _run(escape, lambda t: _snapshot(front=front if t > pivot_start else 10.0))
+
+    assert _durations(ticks)[PIVOT] == pytest.approx(pivot_s, abs=2 * TICK_S)
+
+
+def test_cancel_ends_the_escape_at_once():
+    escape = EscapeManeuver()
+    escape.start(0.0)
+    escape.update(_snapshot(), ESCAPE_BRAKE_S + TICK_S)
+    assert escape.phase == REVERSE
+
+    escape.cancel()
+
+    assert not escape.active
+    assert escape.update(_snapshot(), 1.0) is None
@@ -0,0 +1,104 @@
+import os
+import sys
+
+import pytest
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from src.fusion.fusion_strategy import FusionStrategy
+from src.interfaces import ObstacleStrategy, SensorSnapshot
+from src.constants import NO_READING_DIST_CM, FUSION_MAX_SKEW_S
+
+
+class FakeSource(ObstacleStrategy):
+    """Publishes the snapshots a test hands it, polled by the default wait_for_update()"""
+
+    def __init__(self):
+        self.snapshot = SensorSnapshot.create(0, 0.0, {})
+        self.stopped = False
+
+    def publish(self, timestamp, front, confidence, count=10):
+        self.snapshot = SensorSnapshot.create(
+            self.snapshot.seq + 1,
+            timestamp,
+            {"FRONT": front},
+            {"FRONT": confidence},
+            {"FRONT": count},
+        )
+
+    def check_path(self):
+        return self.snapshot
+
+    def stop(self):
+        self.stopped = True
+
+
+@pytest.fixture
+def sources():
+    a, b = FakeSource(), FakeSource()
+    fusion = FusionStrategy([a, b])
+    yield fusion, a, b
+    fusion.stop()
+
+
+def _publish(fusion, source, *args):
+    """Publishes on one source and waits for the fused snapshot it causes"""
+    last_seq = fusion.check_path().seq
+    source.publish(*args)
+    snapshot = fusion.wait_for_update(last_seq, 2.0)
+    assert snapshot.seq == last_seq + 1
+    return snapshot
+
+
+def test_unsure_sources_are_averaged_by_confidence(sources):
+    fusion, a, b = sources
+    _publish(fusion, a, 1.0, 100.0, 0.2)
+    fused = _publish(fusion, b, 1.0, 200.0, 0.4)
+
+    assert fused.front == pytest.approx((0.2 * 100.0 + 0.4 * 200.0) / 0.6)
+    assert fused.confidence["FRONT"] == pytest.approx(1.0 - 0.8 * 0.6)
+    assert fused.counts["FRONT"] == 20
+    assert fused.source == "fusion"
+
+
+def test_a_confident_close_reading_is_not_averaged_away(sources):
+    fusion, a, b = sources
+    _publish(fusion, a, 1.0, 50.0, 0.9)
+    fused = _publish(fusion, b, 1.0, 200.0, 0.9)
+
+    assert fused.front == pytest.approx(50.0)
+
+
+def test_a_source_without_a_reading_does_not_count(sources):
+    fusion, a, b = sources
+    _publish(fusion, a, 1.0, 80.0, 0.3)
+    fused = _publish(fusion, b, 1.0, NO_READING_DIST_CM, 0.9)
+
+    assert fused.front == pytest.approx(80.0)
+    assert fused.left == NO_READING_DIST_CM
+
+
+def test_a_lagging_source_is_left_out(sources):
+    fusion, a, b = sources
+    _publish(fusion, a, 1.0, 30.0, 0.9)
+    fused = _publish(fusion, b, 1.0 + 2 * FUSION_MAX_SKEW_S, 120.0, 0.9)
+
+    assert fused.front == pytest.approx(120.0)
+    assert fused.timestamp == 1.0 + 2 * FUSION_MAX_SKEW_S
+
+
+def test_timestamp_is_the_oldest_data_used(sources):
+    fusion, a, b = sources
+    _publish(fusion, a, 1.0, 30.0, 0.9)
+    fused = _publish(fusion, b, 1.0 + FUSION_MAX_SKEW_S / 2, 120.0, 0.9)
+
+    assert fused.timestamp == 1.0
+
+
+def test_stop_stops_every_source():
+    a, b = FakeSource(), FakeSource()
+    fusion = FusionStrategy([a, b])
+
+    fusion.stop()
+
+    assert a.stopped and b.stopped
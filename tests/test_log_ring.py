@@ -0,0 +1,64 @@
+import os
+import sys
+from types import SimpleNamespace
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from src.log_ring import LogRing
+
+
+def _push(ring, t):
+    return ring.push(t, 100.0, 50.0, 50.0, 0.5, 0.5, 0.01, 0, 0)
+
+
+def test_pop_drops_the_slot_being_overwritten_during_the_copy():
+    ring = LogRing(capacity=4)
+    for t in range(4):
+        _push(ring, t)
+
+    take = ring.records.take
+
+    def take_while_producer_writes(indices):
+        # Producer started record 4 in the slot of record 0, head not published yet
+        ring._t[0] = 4
+        return take(indices)
+
+    ring.records = SimpleNamespace(take=take_while_producer_writes)
+    batch = ring.pop()
+
+    assert batch["t"].tolist() == [1, 2, 3]
+    assert ring.overwritten == 1
+
+
+def test_drop_newest_keeps_the_oldest_records():
+    ring = LogRing(capacity=4, overflow="drop_newest")
+    accepted = [_push(ring, t) for t in range(6)]
+
+    assert accepted == [True] * 4 + [False] * 2
+    assert ring.pop()["t"].tolist() == [0, 1, 2, 3]
+    assert ring.rejected == 2
+    assert ring.dropped == 2
+
+
+def test_drop_oldest_keeps_the_newest_records():
+    ring = LogRing(capacity=4, overflow="drop_oldest")
+    for t in range(6):
+        assert _push(ring, t)
+
+    batch = ring.pop()
+
+    # The oldest slot left may be mid-write by the producer, it is dropped too
+    assert batch["t"].tolist() == [3, 4, 5]
+    assert ring.overwritten == 3
+    assert len(batch) + ring.dropped == 6
+
+
+def test_pop_below_capacity_loses_nothing():
+    for overflow in ("drop_oldest", "drop_newest"):
+        ring = LogRing(capacity=4, overflow=overflow)
+        for t in range(3):
+            _push(ring, t)
+        assert ring.pop()["t"].tolist() == [0, 1, 2]
+        _push(ring, 3)
+        assert ring.pop()["t"].tolist() == [3]
+        assert ring.dropped == 0
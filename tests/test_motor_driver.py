@@ -0,0 +1,69 @@
+import os
+import sys
+import time
+
+import pytest
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+gpiozero = pytest.importorskip("gpiozero")
+from gpiozero.pins.mock import MockFactory, MockPWMPin
+
+from src.motor_driver import MotorDriver
+from src.constants import RAMP_RATE_PER_S
+
+
+@pytest.fixture
+def driver():
+    """MotorDriver on gpiozero's mock pins, no Pi needed"""
+    factory = MockFactory(pin_class=MockPWMPin)
+    gpiozero.Device.pin_factory = factory
+    driver = MotorDriver()
+    yield driver
+    driver.cleanup()
+    factory.reset()
+
+
+def test_drive_returns_at_once_and_ramps_at_the_ramp_rate(driver):
+    t0 = time.monotonic()
+    driver.drive(1.0, 1.0)
+    assert time.monotonic() - t0 < 0.01
+    assert driver.wheel_pwm[0] < 0.5
+
+    assert driver.wait_idle(timeout=2.0)
+    elapsed = time.monotonic() - t0
+
+    assert driver.wheel_pwm == (1.0, 1.0)
+    assert driver.PWMA.value == driver.PWMB.value == 1.0
+    assert elapsed >= 0.9 / RAMP_RATE_PER_S
+
+
+def test_wheels_ramp_to_their_own_targets(driver):
+    driver.drive(1.0, -1.0)
+    assert driver.wait_idle(timeout=2.0)
+
+    assert driver.wheel_pwm == (1.0, -1.0)
+    assert driver.AIN1.value and not driver.AIN2.value  # Left forward
+    assert driver.BIN2.value and not driver.BIN1.value  # Right backward
+
+
+def test_newer_target_replaces_a_running_ramp(driver):
+    driver.drive(1.0, 1.0)
+    time.sleep(0.1)
+    reached = driver.wheel_pwm[0]
+    assert 0.0 < reached < 1.0
+
+    driver.stop()
+    assert driver.wait_idle(timeout=2.0)
+
+    assert driver.wheel_pwm == (0.0, 0.0)
+
+
+def test_force_stop_is_immediate(driver):
+    driver.drive(1.0, 1.0)
+    assert driver.wait_idle(timeout=2.0)
+
+    driver.stop(force_stop=True)
+
+    assert driver.wheel_pwm == (0.0, 0.0)
+    assert driver.PWMA.value == driver.PWMB.value == 0.0
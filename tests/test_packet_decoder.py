@@ -0,0 +1,95 @@
+import os
+import sys
+
+import numpy as np
+import pytest
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from src.lidar_only.packet_decoder import PacketDecoder, encode_packets
+from src.constants import PACKET_SIZE, POINTS_PER_PACKET, MM_TO_CM
+
+PACKETS = 20
+
+
+def _stream(distances_mm=None):
+    """PACKETS packets sweeping 10 deg each, distinct distances per point"""
+    starts = np.arange(PACKETS) * 10.0
+    if distances_mm is None:
+        distances_mm = 500 + np.arange(PACKETS * POINTS_PER_PACKET).reshape(PACKETS, POINTS_PER_PACKET)
+    return encode_packets(starts, starts + 9.0, distances_mm), distances_mm
+
+
+def _feed(decoder, data, chunk):
+    batches = [decoder.feed(data[pos : pos + chunk]) for pos in range(0, len(data), chunk)]
+    return np.concatenate([b.distances for b in batches])
+
+
+@pytest.mark.parametrize("chunk", [1, 13, PACKET_SIZE, 100, 4096])
+def test_split_stream_decodes_every_packet(chunk):
+    data, distances_mm = _stream()
+    decoder = PacketDecoder()
+
+    distances = _feed(decoder, data, chunk)
+
+    np.testing.assert_allclose(distances, distances_mm.ravel() / MM_TO_CM)
+    assert decoder.stats() == {"good": PACKETS, "bad": 0, "dropped": 0, "skipped_bytes": 0}
+
+
+@pytest.mark.parametrize("chunk", [1, 100, 4096])
+def test_corrupted_packet_fails_crc_and_resyncs(chunk):
+    data, distances_mm = _stream()
+    data = bytearray(data)
+    data[5 * PACKET_SIZE + 10] ^= 0xFF  # A distance byte of packet 5
+
+    decoder = PacketDecoder()
+    distances = _feed(decoder, bytes(data), chunk)
+
+    expected = np.delete(distances_mm, 5, axis=0).ravel() / MM_TO_CM
+    np.testing.assert_allclose(distances, expected)
+    assert decoder.good == PACKETS - 1
+    assert decoder.bad == 1
+    assert decoder.dropped == 0
+    assert decoder.skipped == PACKET_SIZE
+
+
+# Telling cut short from corrupted needs the next packet in the same buffer,
+# byte by byte the truncated packet counts as bad
+@pytest.mark.parametrize("chunk", [100, 4096])
+def test_truncated_packet_counts_as_dropped(chunk):
+    data, distances_mm = _stream()
+    cut = 8 * PACKET_SIZE
+    data = data[: cut + 20] + data[cut + PACKET_SIZE :]  # Packet 8 loses its last 27 bytes
+
+    decoder = PacketDecoder()
+    distances = _feed(decoder, data, chunk)
+
+    expected = np.delete(distances_mm, 8, axis=0).ravel() / MM_TO_CM
+    np.testing.assert_allclose(distances, expected)
+    assert decoder.good == PACKETS - 1
+    assert decoder.dropped == 1
+    assert decoder.bad == 0
+    assert decoder.skipped == 20
+
+
+def test_garbage_before_the_first_header_is_skipped():
+    data, distances_mm = _stream()
+    decoder = PacketDecoder()
+
+    distances = _feed(decoder, b"\x00\x54\x13\x2c" * 5 + data, 64)
+
+    np.testing.assert_allclose(distances, distances_mm.ravel() / MM_TO_CM)
+    assert decoder.good == PACKETS
+    assert decoder.skipped == 20
+
+
+def test_header_pattern_in_the_payload_is_not_a_packet():
+    # 0x2C54 mm is stored as the bytes 0x54 0x2C, the frame header
+    distances_mm = np.full((PACKETS, POINTS_PER_PACKET), 0x2C54)
+    data, _ = _stream(distances_mm)
+    decoder = PacketDecoder()
+
+    distances = _feed(decoder, data, 100)
+
+    np.testing.assert_allclose(distances, distances_mm.ravel() / MM_TO_CM)
+    assert decoder.stats() == {"good": PACKETS, "bad": 0, "dropped": 0, "skipped_bytes": 0}
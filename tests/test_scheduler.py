@@ -0,0 +1,39 @@
+import os
+import sys
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from src.scheduler import AdaptiveRate
+from src.constants import SLOWDOWN_DIST_CM, CRITICAL_DIST_CM
+
+LIDAR_HZ = 10.0  # One snapshot per revolution
+
+
+def _rates(scheduler, fronts, sensor_rate):
+    return [1.0 / scheduler.update(front, sensor_rate=sensor_rate) for front in fronts]
+
+
+def test_rate_rises_towards_an_obstacle_with_a_lidar_rate_sensor():
+    scheduler = AdaptiveRate(15.0, 100.0)
+    fronts = [200.0, SLOWDOWN_DIST_CM, 40.0, 30.0, 20.0, CRITICAL_DIST_CM]
+
+    rates = _rates(scheduler, fronts, LIDAR_HZ)
+
+    assert rates[0] == scheduler.min_rate
+    assert rates == sorted(rates)
+    assert rates[-1] > 4 * rates[0]
+    assert rates[-1] <= LIDAR_HZ * scheduler.ticks_per_snapshot
+
+
+def test_min_rate_is_a_floor_below_a_slow_sensor():
+    scheduler = AdaptiveRate(15.0, 100.0)
+
+    rates = _rates(scheduler, [200.0, CRITICAL_DIST_CM], 1.0)
+
+    assert rates == [15.0, 15.0]
+
+
+def test_escape_runs_at_max_rate_whatever_the_sensor():
+    scheduler = AdaptiveRate(15.0, 100.0)
+
+    assert 1.0 / scheduler.update(200.0, escaping=True, sensor_rate=LIDAR_HZ) == 100.0